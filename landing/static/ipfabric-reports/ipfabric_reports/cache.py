@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - Cache Module.
+
+This module provides a small on-disk store used by the reports to keep the
+results of a previous run, so the next run can reuse them instead of
+recomputing everything.
+
+Main Components:
+    - SnapshotCache: Pickle store keyed by a name and a scope (e.g. site filter)
+    - resolve_cache_dir: Directory of the cache shared by the generator and the frontend
+
+Every entry records the snapshot it was computed from and a version number.
+An entry written with another version is ignored, which allows the format of
+the stored data to change without having to clear the cache by hand. A cache
+without a directory is disabled: it never finds an entry and writes nothing.
+"""
+
+# Standard library imports
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# Third-party imports
+from loguru import logger
+
+
+def resolve_cache_dir(
+    cache_dir: Optional[Union[str, Path]] = None,
+    export_dir: Optional[Union[str, Path]] = None,
+) -> Path:
+    """
+    Return the directory of the report cache.
+
+    Args:
+        cache_dir: Cache directory, defaults to the REPORT_CACHE_DIR environment variable
+        export_dir: Export directory, defaults to the EXPORT_DIR environment variable
+            or 'export'
+
+    Returns:
+        The cache directory, or the `.cache` directory of the export directory.
+    """
+    cache_dir = cache_dir or os.getenv("REPORT_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return Path(export_dir or os.getenv("EXPORT_DIR") or "export") / ".cache"
+
+
+class SnapshotCache:
+    """
+    On-disk store of report state between runs.
+
+    Args:
+        cache_dir: Directory holding the cache files, created on first write. None
+            disables the cache.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]]):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache reads and writes files."""
+        return self.cache_dir is not None
+
+    def _path(self, name: str, scope: Optional[str] = None) -> Path:
+        """Return the file used for the entry `name` in `scope`."""
+        scope_key = hashlib.sha256((scope or "").encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{name}-{scope_key}.pkl"
+
+    def load(
+        self, name: str, scope: Optional[str] = None, version: int = 1
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load an entry from the cache.
+
+        Args:
+            name: Name of the entry, usually the report type
+            scope: Scope of the entry, usually the site filter
+            version: Expected version of the entry
+
+        Returns:
+            Dictionary with the `snapshot_id` and the stored `data`, or None if there is
+            no usable entry.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(name, scope)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {str(e)}")
+            return None
+
+        if entry.get("version") != version or entry.get("scope") != scope:
+            logger.info(f"Ignoring outdated cache file {path}")
+            return None
+        return entry
+
+    def save(
+        self,
+        name: str,
+        snapshot_id: str,
+        data: Any,
+        scope: Optional[str] = None,
+        version: int = 1,
+    ) -> Optional[Path]:
+        """
+        Save an entry to the cache, replacing the previous one.
+
+        The file is written next to its final location and then renamed, so an
+        interrupted run never leaves a truncated entry behind.
+
+        Args:
+            name: Name of the entry, usually the report type
+            snapshot_id: Snapshot the data was computed from
+            data: Any picklable object
+            scope: Scope of the entry, usually the site filter
+            version: Version of the entry
+
+        Returns:
+            Path of the cache file, None when the cache is disabled.
+        """
+        if not self.enabled:
+            return None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name, scope)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        entry = {
+            "version": version,
+            "scope": scope,
+            "snapshot_id": snapshot_id,
+            "data": data,
+        }
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - Charts Module.
+
+This module draws the charts embedded in the reports as SVG images. The SVG is
+generated as text, so drawing a chart costs a few string operations instead of a
+plotting library figure, and stays sharp at any zoom level of the PDF.
+
+The charts don't share any state, so they can be drawn from several threads at
+the same time. The pie charts are memoised by the data they show, the same
+distribution is only drawn once.
+
+Functions:
+    sparkline: Draw a series of values as a compact line chart
+    pie_chart: Draw a distribution as a pie chart with a legend
+    chart_colors: Return the colors of the charts, loaded once
+    svg_data_uri: Encode an SVG document as a data URI usable in an <img> tag
+"""
+
+# Standard library imports
+import base64
+import json
+import math
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CHART_COLORS_PATH = (
+    Path(__file__).resolve().parent / "styles" / "themes" / "chart_colors.json"
+)
+FONT_FAMILY = "Open Sans, sans-serif"
+# Average width of a character of the legend, relative to the font size
+CHAR_WIDTH = 0.6
+
+
+def svg_data_uri(svg: str) -> str:
+    """
+    Encode an SVG document as a base64 data URI.
+
+    Args:
+        svg: SVG document
+
+    Returns:
+        Data URI of the image, to be used as the `src` of an <img> tag.
+    """
+    svg_base64 = base64.b64encode(svg.encode("utf-8")).decode("utf-8")
+    return f"data:image/svg+xml;base64,{svg_base64}"
+
+
+def sparkline(
+    values: Iterable[Optional[float]],
+    width: int = 120,
+    height: int = 24,
+    color: str = "#264183",
+    stroke_width: float = 1.5,
+) -> str:
+    """
+    Draw a series of values as a sparkline.
+
+    The values are scaled between their minimum and maximum, a constant series is
+    drawn as a flat line in the middle. Missing values (None or NaN) leave a gap in
+    the line, and the last value is marked with a dot.
+
+    Args:
+        values: Values in chronological order
+        width: Width of the image in pixels
+        height: Height of the image in pixels
+        color: Color of the line
+        stroke_width: Width of the line in pixels
+
+    Returns:
+        Data URI of the SVG image.
+    """
+    points = [
+        None if value is None or math.isnan(value) else float(value) for value in values
+    ]
+    known = [value for value in points if value is not None]
+
+    # Keep the line and the dot inside the image
+    margin = stroke_width + 1
+    low, high = (min(known), max(known)) if known else (0.0, 0.0)
+    x_step = (width - 2 * margin) / max(len(points) - 1, 1)
+
+    def _y(value: float) -> float:
+        if high == low:
+            return height / 2
+        return height - margin - (value - low) / (high - low) * (height - 2 * margin)
+
+    segments: List[List[Tuple[float, float]]] = [[]]
+    for index, value in enumerate(points):
+        if value is None:
+            segments.append([])
+            continue
+        segments[-1].append((margin + index * x_step, _y(value)))
+
+    elements = []
+    for segment in segments:
+        if len(segment) > 1:
+            coordinates = " ".join(f"{x:.1f},{y:.1f}" for x, y in segment)
+            elements.append(
+                f'<polyline points="{coordinates}" fill="none" stroke="{color}" '
+                f'stroke-width="{stroke_width}" stroke-linejoin="round" stroke-linecap="round"/>'
+            )
+    # Isolated values and the last value are drawn as dots
+    dots = [segment[0] for segment in segments if len(segment) == 1]
+    if points and points[-1] is not None and len(segments[-1]) > 1:
+        dots.append(segments[-1][-1])
+    for x, y in dots:
+        elements.append(
+            f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{stroke_width + 0.5}" fill="{color}"/>'
+        )
+
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">{"".join(elements)}</svg>'
+    )
+    return svg_data_uri(svg)
+
+
+@lru_cache(maxsize=None)
+def chart_colors() -> Tuple[str, ...]:
+    """
+    Return the colors of the charts, read once from `styles/themes/chart_colors.json`.
+
+    Returns:
+        Colors of the chart series, in order.
+    """
+    if not CHART_COLORS_PATH.exists():
+        raise FileNotFoundError(f"Chart color file not found at {CHART_COLORS_PATH}")
+    with open(CHART_COLORS_PATH, "r") as file:
+        return tuple(json.load(file).get("chart_colors", [])) or ("#264183",)
+
+
+def _text_color(background: str) -> str:
+    """Return a text color readable on a background color."""
+    red, green, blue = (int(background.lstrip("#")[i : i + 2], 16) for i in (0, 2, 4))
+    luminance = 0.299 * red + 0.587 * green + 0.114 * blue
+    return "#263238" if luminance > 140 else "#ffffff"
+
+
+def _distribution_items(data: Dict[str, float]) -> Tuple[Tuple[str, float], ...]:
+    """Return the positive values of a distribution as a hashable tuple."""
+    return tuple(
+        (str(label), float(value))
+        for label, value in data.items()
+        if value is not None and not math.isnan(value) and value > 0
+    )
+
+
+def pie_chart(data: Dict[str, float], size: int = 200, font_size: int = 9) -> str:
+    """
+    Draw a distribution as a pie chart, with a legend giving the share of each item.
+
+    Args:
+        data: Values keyed by label, e.g. the percentage of each server
+        size: Diameter of the pie in pixels
+        font_size: Font size of the labels in pixels
+
+    Returns:
+        Data URI of the SVG image.
+    """
+    return _pie_chart(_distribution_items(data), size, font_size)
+
+
+@lru_cache(maxsize=256)
+def _pie_chart(items: Tuple[Tuple[str, float], ...], size: int, font_size: int) -> str:
+    colors = chart_colors()
+    total = sum(value for _, value in items)
+    radius = size / 2 - 2
+    center = size / 2
+    row_height = font_size + 7
+    legend_width = max(
+        (len(f"{label} (100.0%)") * font_size * CHAR_WIDTH for label, _ in items),
+        default=0,
+    )
+    width = int(size + 16 + font_size + 6 + legend_width)
+    height = int(max(size, row_height * len(items) + 4))
+
+    elements = []
+    angle = -math.pi / 2  # the first wedge starts at the top, going clockwise
+    for index, (label, value) in enumerate(items):
+        color = colors[index % len(colors)]
+        share = value / total
+        if share >= 0.9999:
+            elements.append(
+                f'<circle cx="{center:.1f}" cy="{center:.1f}" r="{radius:.1f}" fill="{color}"/>'
+            )
+        else:
+            end = angle + share * 2 * math.pi
+            x0, y0 = center + radius * math.cos(angle), center + radius * math.sin(
+                angle
+            )
+            x1, y1 = center + radius * math.cos(end), center + radius * math.sin(end)
+            large_arc = 1 if share > 0.5 else 0
+            elements.append(
+                f'<path d="M{center:.1f},{center:.1f} L{x0:.1f},{y0:.1f} '
+                f'A{radius:.1f},{radius:.1f} 0 {large_arc} 1 {x1:.1f},{y1:.1f} Z" '
+                f'fill="{color}" stroke="#ffffff" stroke-width="1"/>'
+            )
+        # The percentage is written in the wedges large enough to hold it
+        if share >= 0.05:
+            middle = angle + share * math.pi
+            x = center + radius * 0.65 * math.cos(middle)
+            y = center + radius * 0.65 * math.sin(middle)
+            elements.append(
+                f'<text x="{x:.1f}" y="{y:.1f}" font-size="{font_size}" font-weight="bold" '
+                f'text-anchor="middle" dominant-baseline="central" '
+                f'fill="{_text_color(color)}">{share * 100:.1f}%</text>'
+            )
+        angle += share * 2 * math.pi
+
+        # Legend
+        y = 2 + index * row_height
+        elements.append(
+            f'<rect x="{size + 16}" y="{y + 2}" width="{font_size}" height="{font_size}" '
+            f'fill="{color}"/>'
+        )
+        elements.append(
+            f'<text x="{size + 16 + font_size + 6}" y="{y + 2 + font_size / 2:.1f}" '
+            f'font-size="{font_size}" dominant-baseline="central" fill="#263238">'
+            f"{escape(label)} ({share * 100:.1f}%)</text>"
+        )
+
+    return svg_data_uri(_svg_document(elements, width, height))
+
+
+def _svg_document(elements: List[str], width: int, height: int) -> str:
+    """Wrap SVG elements in a document of the given size."""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="{FONT_FAMILY}">{"".join(elements)}</svg>'
+    )
@@ -8,7 +8,6 @@ import sys
 
 # Third-party imports
 from loguru import logger
-import invoke
 
 # Local imports
 from .main import IPFabricReportGenerator
@@ -20,9 +19,76 @@ def main():
         description="Generate reports from IP Fabric data."
     )
     parser.add_argument("--env", help="Path to .env file", default=None)
-    parser.add_argument("--type", help="Type of report to generate", default=None)
+    parser.add_argument(
+        "--type",
+        action="append",
+        help="Type of report to generate, repeat to generate several types",
+        default=None,
+    )
     parser.add_argument("--style", help="CSS style to use for the report", default=None)
-    parser.add_argument("--site", help="Filter report by site name", default=None)
+    parser.add_argument(
+        "--site",
+        action="append",
+        help="Filter report by site name, repeat to generate a report per site",
+        default=None,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes for parallel analysis",
+        default=None,
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["site", "component"],
+        help="Shard the trunk mismatch analysis by site or L2 connected component",
+        default=None,
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the results of the previous run and only analyse what changed",
+        default=None,
+    )
+    parser.add_argument(
+        "--render-budget",
+        action="store_true",
+        help="Only render the top rows of the large tables in the PDF, the full data stays in the exports",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory holding the results kept between runs",
+        default=None,
+    )
+    parser.add_argument(
+        "--tabular-format",
+        choices=["xlsx", "csv", "parquet"],
+        help="Format of the tabular exports (default: xlsx)",
+        default=None,
+    )
+    parser.add_argument(
+        "--trend-snapshots",
+        help="Comma-separated snapshot IDs, or number of most recent snapshots, of the trend report",
+        default=None,
+    )
+    parser.add_argument(
+        "--trend-days",
+        type=int,
+        help="Report on the snapshots of the last N days in the trend report",
+        default=None,
+    )
+    parser.add_argument(
+        "--history-db",
+        help="SQLite database keeping the key metrics of every report run",
+        default=None,
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        help="Number of processes rendering the PDF of a batch of reports",
+        default=None,
+    )
     parser.add_argument(
         "--list", action="store_true", help="List available report types"
     )
@@ -50,6 +116,8 @@ def main():
         return
 
     if args.streamlit:
+        import invoke
+
         print("Starting streamlit web interface...")
         command_args = [
             "streamlit",
@@ -69,12 +137,32 @@ def main():
         return
 
     try:
-        if args.type:
-            os.environ["REPORT_TYPE"] = args.type
-        generator = IPFabricReportGenerator(env_file=args.env)
-        if args.site:
-            generator.site_filter = args.site
-        generator.generate_report()
+        report_types = args.type or []
+        sites = args.site or []
+        if report_types:
+            os.environ["REPORT_TYPE"] = report_types[0]
+        batch = len(report_types) > 1 or len(sites) > 1
+        generator = IPFabricReportGenerator(
+            env_file=args.env,
+            # The sites of a batch are validated together by generate_reports
+            site_filter=None if batch else next(iter(sites), None),
+            workers=args.workers,
+            shard_by=args.shard_by,
+            incremental=args.incremental,
+            render_budget=args.render_budget,
+            cache_dir=args.cache_dir,
+            tabular_format=args.tabular_format,
+            trend_snapshots=args.trend_snapshots,
+            trend_days=args.trend_days,
+            history_db=args.history_db,
+            render_workers=args.render_workers,
+        )
+        if batch:
+            generator.generate_reports(
+                report_types=report_types or None, sites=sites or None
+            )
+        else:
+            generator.generate_report()
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
 
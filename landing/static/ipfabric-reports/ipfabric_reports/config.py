@@ -12,8 +12,10 @@ Configuration Classes:
     NetworkSummaryConfig: Network summary report settings
     ManagementProtocolConfig: Management protocol report configuration
     PortCapacityReportConfig: Port capacity analysis settings
+    PortCapacityCompareReportConfig: Port capacity comparison settings
     OverviewReportConfig: Network overview report configuration
     OverviewCompareReportConfig: Snapshot comparison settings
+    OverviewTrendReportConfig: Multi-snapshot trend settings
     DiscoveryReportConfig: Discovery report parameters
     CVEReportConfig: Vulnerability report configuration
 
@@ -34,6 +36,9 @@ Usage:
 # Standard library imports
 from typing import Any, Dict, List
 
+# Formats of the tabular exports of the reports
+TABULAR_FORMATS = ["xlsx", "csv", "parquet"]
+
 
 class ConfigBase:
     REPORT_TYPE: str = ""
@@ -46,6 +51,16 @@ class ConfigBase:
     def get_items(cls) -> List[Dict[str, Any]]:
         return cls.ITEMS
 
+    @classmethod
+    def get_report_details(cls) -> Dict[str, Any]:
+        """Return the name, type, description and introduction of the report."""
+        return {
+            "name": cls.REPORT_NAME,
+            "type": cls.REPORT_TYPE,
+            "description": cls.REPORT_DESCRIPTION,
+            "introduction": cls.REPORT_INTRO,
+        }
+
     @classmethod
     def get_attribute(cls, attr: str) -> List[Any]:
         return [item[attr] for item in cls.ITEMS if attr in item]
@@ -205,6 +220,63 @@ class PortCapacityReportConfig(ConfigBase):
         "hasTransceiver",
         "transceiverType",
     ]
+    # The interfaces are fetched PAGE_SIZE rows at a time and counted in batches of
+    # BATCH_ROWS, then discarded. The raw rows are only kept, and exported to CSV, when
+    # EXPORT_RAW_INTERFACES is set.
+    PAGE_SIZE = 10_000
+    BATCH_ROWS = 50_000
+    # Every page is fetched with the same sort, so that the pages don't overlap or skip rows
+    PAGE_SORT = {"order": "asc", "column": "id"}
+    EXPORT_RAW_INTERFACES = False
+    # The interfaces are counted per cell of a cube over CUBE_DIMENSIONS, and the per host
+    # and per site reports are roll-ups of the cube. When CACHE_CUBE is set, the cube of the
+    # whole network is kept per snapshot in the report cache, so that any site can be sliced
+    # from it without fetching the interfaces again. A site filtered run reuses a cached
+    # cube, but only fetches the interfaces of the whole network to build one when
+    # CACHE_NETWORK_CUBE is set, e.g. before reporting on many sites of the same snapshot.
+    CUBE_DIMENSIONS = ["siteName", "hostname", "speedValue", "media", "hasTransceiver"]
+    CUBE_VERSION = 2
+    CACHE_CUBE = True
+    CACHE_NETWORK_CUBE = False
+    # Interface columns the cube is computed from, and states counted in every cell. The
+    # serial number of the devices is taken from the device inventory.
+    STATE_SOURCE_COLUMNS = CUBE_DIMENSIONS + ["l1", "l2", "reason"]
+    PORT_STATE_COLUMNS = [
+        "l1&l2 up",
+        "l1&l2 down",
+        "l1 up & l2 down",
+        "L1 and l2 unknown",
+        "admin-down",
+        "err-disabled",
+    ]
+    COUNT_COLUMNS = ["total"] + PORT_STATE_COLUMNS
+
+
+class PortCapacityCompareReportConfig(ConfigBase):
+    REPORT_NAME = "Port Capacity Comparison"
+    REPORT_TYPE = "port-capacity-compare"
+    REPORT_DESCRIPTION = "Report comparing the port capacity of two IP Fabric snapshots per site and device."
+    REPORT_INTRO = [
+        "The Port Capacity Comparison Report shows how the port capacity of your network evolved between two"
+        " snapshots. The devices are matched on their hostname and serial number, and the sites on their name.",
+        "The report includes the growth of the number of ports and of the port utilisation per site, the devices"
+        " whose utilisation crossed one of the thresholds, and the devices added or removed between the snapshots.",
+        "This report can be used for capacity planning, to follow the growth rate of the network and to anticipate"
+        " the sites and devices running out of free ports.",
+    ]
+    DEVICE_KEYS = ["hostname", "sn"]
+    SITE_KEYS = ["siteName"]
+    # Columns compared between the snapshots, each gets a "<column> prev" and a "<column> delta"
+    COMPARE_COLUMNS = [
+        "total",
+        "l1&l2 up",
+        "l1&l2 down",
+        "port utilisation (%)",
+        "port availability (%)",
+    ]
+    # A device crosses a threshold when its port utilisation (%) goes from below to at or above it,
+    # or the other way around
+    UTILISATION_THRESHOLDS = [50, 75, 90]
 
 
 class OverviewSummaryConfig(ConfigBase):
@@ -328,6 +400,9 @@ class TrunkMismatchConfig(ConfigBase):
         "3-4 affected ports, NORMAL: 1-2 affected ports) and provides actionable insights by showing exact "
         "VLAN mismatches between connected interfaces, enabling network administrators to quickly identify "
         "and resolve configuration discrepancies.",
+        "Beyond each individual link, the report checks for every VLAN that the devices where it is allowed "
+        "on a trunk are connected by trunk links carrying it, and lists the VLANs split into islands together "
+        "with the devices isolated from the main part of the VLAN.",
     ]
     ITEMS: List[Dict[str, str]] = [
         {
@@ -384,6 +459,78 @@ class TrunkMismatchConfig(ConfigBase):
         "missingStpVlansRemote",
     ]
 
+    MERGE_KEYS = ["localHost", "localInt", "remoteHost", "remoteInt"]
+
+    # Columns of the Connectivity Matrix the analysis reads, an incremental run only
+    # analyses a link again when one of them changed (the query returns every column,
+    # including the per-snapshot id)
+    FINGERPRINT_COLUMNS = MERGE_KEYS + [
+        "siteName",
+        "localSn",
+        "remoteSn",
+        "protocol",
+        "localMedia",
+        "remoteMedia",
+    ]
+
+    # Parallel analysis: the deduplicated connectivity matrix can be split per
+    # site or per L2 connected component and analysed in a process pool
+    SHARD_BY_OPTIONS = ["site", "component"]
+    # Number of shards handed to each worker, more shards balance the load better
+    SHARDS_PER_WORKER = 2
+
+    # Render budget mode: rows of the mismatched trunk links and changes tables of the
+    # PDF, the full tables are in the tabular export
+    MAX_DETAIL_ROWS = 500
+    MAX_CHANGES_ROWS = 500
+
+    # The mismatched trunk links table of the PDF is rendered in chunks of this many
+    # rows, in parallel, and the chunks are merged into one PDF
+    PDF_CHUNK_ROWS = 2000
+
+    # Columns of the device summary and mismatched trunk links tables of the PDF
+    SUMMARY_PDF_COLUMNS = ["siteName", "localHost", "affected_ports", "severity"]
+    DETAILS_PDF_COLUMNS = [
+        "srcHostname",
+        "srcIntName",
+        "srcVlanCount",
+        "dstVlanCount",
+        "dstIntName",
+        "dstHostname",
+    ]
+
+    # Incremental analysis: the per-link results of the previous run are kept in the
+    # cache and only the added/changed links are analysed again.
+    # Bump the version when the stored state changes, older entries are then ignored.
+    INCREMENTAL_STATE_VERSION = 1
+    CHANGES_REPORT_COLUMNS = [
+        "change",
+        "siteName",
+        "localHost",
+        "localInt",
+        "remoteInt",
+        "remoteHost",
+        "mismatchBefore",
+        "mismatchNow",
+    ]
+
+    # VLAN reachability: VLANs split into islands across the trunk links
+    VLAN_ISLANDS_COLUMNS = [
+        "vlanId",
+        "hosts",
+        "components",
+        "mainComponentHosts",
+        "isolatedHosts",
+        "isolatedSites",
+    ]
+    VLAN_ISOLATED_HOSTS_COLUMNS = [
+        "vlanId",
+        "siteName",
+        "hostname",
+        "componentSize",
+        "mainComponentSize",
+    ]
+
 
 class RoutingConfig(ConfigBase):
     ITEMS = [
@@ -478,6 +625,32 @@ class OverviewCompareReportConfig(ConfigBase):
     ]
 
 
+class OverviewTrendReportConfig(ConfigBase):
+    REPORT_NAME = "Overview Data Trend"
+    REPORT_TYPE = "overview-trend"
+    REPORT_DESCRIPTION = "Report showing the trend of the Overview Report metrics over several snapshots."
+    REPORT_INTRO = [
+        "The Network Overview Trend Report shows how the Overview Report metrics evolved over several snapshots,"
+        " to highlight the trends that a comparison of two snapshots doesn't show.",
+        "For every metric, the report includes its value in each snapshot, from the oldest to the most recent,"
+        " its change over the period and a sparkline of its evolution.",
+        "This report can be used to follow the growth of the network, to spot unexpected drops or spikes, and to"
+        " track the long term impact of network modifications.",
+    ]
+    # Number of loaded snapshots in the report when neither snapshot IDs nor a number of days are given
+    DEFAULT_SNAPSHOTS = 5
+    # Number of snapshots collected at the same time
+    MAX_WORKERS = 4
+    # Version of the per-snapshot metrics kept in the cache
+    CACHE_VERSION = 1
+    # Number of most recent snapshots shown as columns in the PDF, the sparklines and the
+    # tabular export cover all the snapshots
+    MAX_TABLE_SNAPSHOTS = 6
+    SPARKLINE_WIDTH = 120
+    SPARKLINE_HEIGHT = 24
+    SPARKLINE_COLOR = "#264183"
+
+
 class DiscoveryReportConfig(ConfigBase):
     REPORT_NAME = "Undiscovered Network Elements"
     REPORT_TYPE = "discovery"
@@ -501,6 +674,11 @@ class DiscoveryReportConfig(ConfigBase):
         "<strong>Routing Protocols Context:</strong> Utilizes data from routing protocols (such as BGP, OSPF,"
         " and EIGRP) to highlight undiscovered IP addresses that are part of the routing tables but not"
         " directly discoverable.",
+        "<strong>Managed Networks Context:</strong> Attributes each undiscovered IP address to the most specific"
+        " managed network containing it, with its site and VLAN, to show where the blind spots are located.",
+        "<strong>Changes since previous snapshot:</strong> In incremental mode, the report only lists the"
+        " undiscovered IP addresses which are new or resolved since the previous snapshot, and counts the"
+        " persisting ones.",
         "This report is designed to help network administrators and engineers:</br>"
         "<ul>"
         "<li>Identify and investigate IP addresses that could not be discovered during the network scanning"
@@ -538,8 +716,31 @@ class DiscoveryReportConfig(ConfigBase):
             "columns": ["neiIp", "protocol"],
             "filters": {"and": [{"protocol": ["reg", "bgp|ospf|eigrp"]}]},
         },
+        {
+            "name": "Managed Networks",
+            "method": "technology.managed_networks.networks.all",
+            "columns": ["siteName", "net", "vlanId", "vrf"],
+        },
     ]
     PROTOCOLS = ["ospf", "bgp", "eigrp"]
+    # Label of the IPs outside of any managed network, and number of networks in the PDF breakdown
+    NO_NETWORK_LABEL = "Not in a managed network"
+    TOP_NETWORKS = 20
+    # Delta mode (incremental): the undiscovered IPs are compared with the previous snapshot
+    # on IP + source. The results of every snapshot are cached, so the previous snapshot is
+    # only collected once. The full CSV is only saved when DELTA_FULL_CSV is set.
+    DELTA_KEYS = ["IP Address", "Discovery Source"]
+    DELTA_STATE_VERSION = 1
+    DELTA_FULL_CSV = False
+    DELTA_DETAIL_COLUMNS = [
+        "IP Address",
+        "Discovery Source",
+        "Discovery Status",
+        "Error Type",
+        "MAC Vendor",
+        "Managed Network",
+        "Network Site",
+    ]
     COLUMN_TRANSLATIONS = {
         "attemptCount": "Attempts",
         "errorReasons": "Error Reasons",
@@ -565,6 +766,10 @@ class DiscoveryReportConfig(ConfigBase):
         "ospf": "Matrix OSPF",
         "bgp": "Matrix BGP",
         "eigrp": "Matrix EIGRP",
+        "network": "Managed Network",
+        "networkSite": "Network Site",
+        "networkVlan": "Network VLAN",
+        "networkVrf": "Network VRF",
     }
 
 
@@ -653,3 +858,8 @@ class CVEReportConfig(ConfigBase):
 
     # Severity levels for classification
     SEVERITY_LEVELS = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+    # Render budget mode: CVEs detailed per OS version in the PDF, the CSV has them all
+    MAX_CVES_PER_OS = 20
+    # The detailed analysis of the PDF is rendered in chunks of about this many CVEs,
+    # in parallel, so a large site doesn't lay out thousands of CVEs in one document
+    PDF_CHUNK_ROWS = 500
@@ -33,17 +33,19 @@ Dependencies:
 from collections import defaultdict
 from dataclasses import dataclass, field
 import json
-from typing import Any, ClassVar, Dict, List, Optional, Tuple, Type
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple, Type
 from time import sleep
 import requests.exceptions
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 from ipfabric import IPFClient
 from ipfabric.tools import Vulnerabilities
 from loguru import logger
 
 # Local imports
+from .cache import SnapshotCache
 from .config import (
     CVEReportConfig,
     DiscoveryReportConfig,
@@ -52,10 +54,19 @@ from .config import (
     ManagementProtocolConfig,
     OverviewReportConfig,
     OverviewCompareReportConfig,
+    OverviewTrendReportConfig,
+    PortCapacityCompareReportConfig,
     PortCapacityReportConfig,
     TrunkMismatchConfig,
 )
-from .modules import count_unique_occurrences, get_distribution_ratio
+from .modules import (
+    GroupTotals,
+    count_unique_occurrences,
+    get_distribution_ratio,
+    resolve_snapshot_id,
+)
+from .inventory import INVENTORY_COLUMNS, DeviceInventoryIndex
+from .network_index import NetworkIntervalIndex
 
 
 def transform_name(name: str) -> str:
@@ -100,7 +111,7 @@ class BaseDataCollector:
 
             # The `key`, `filters`, `export` fields are optional
             key = item.get("key", None)
-            filters = item.get("filters", {})
+            filters = dict(item.get("filters", {}))
             export = item.get("export", None)
 
             if self.site_filter:
@@ -141,6 +152,11 @@ class BaseDataCollector:
         columns: List[str] = None,
         export: str = None,
     ) -> Any:
+        if not export:
+            inventory_data = self._inventory_data(method, filters, columns)
+            if inventory_data is not None:
+                return inventory_data
+
         api_method = self.ipf
         for part in method.split("."):
             api_method = getattr(api_method, part)
@@ -160,6 +176,54 @@ class BaseDataCollector:
         else:
             return api_method
 
+    def _device_inventory(self) -> DeviceInventoryIndex:
+        """Return the device inventory index of the snapshot, shared by every collector."""
+        return DeviceInventoryIndex.load(self.ipf, self.snapshot_id)
+
+    def _inventory_data(
+        self,
+        method: str,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Optional[Any]:
+        """
+        Answer a device inventory call from the inventory index.
+
+        Args:
+            method: IPFClient method, e.g. 'inventory.devices.count'
+            filters: Filters of the call
+            columns: Columns of the call
+
+        Returns:
+            The number of devices or the list of devices, or None when the call must be
+            sent to the API: other table, columns not given or not in the index, or a
+            filter other than a single 'siteName eq' filter.
+        """
+        if method == "inventory.devices.all":
+            if not columns or not set(columns) <= set(INVENTORY_COLUMNS):
+                return None
+        elif method != "inventory.devices.count":
+            return None
+
+        # Other filters are left to the API, to keep its eq/like/reg semantics
+        site = None
+        if filters:
+            site_condition = filters.get("siteName")
+            if (
+                len(filters) != 1
+                or not isinstance(site_condition, (list, tuple))
+                or len(site_condition) != 2
+                or site_condition[0] != "eq"
+            ):
+                return None
+            site = site_condition[1]
+
+        inventory = self._device_inventory()
+        positions = inventory.select(site=site)
+        if method == "inventory.devices.count":
+            return len(positions)
+        return inventory.records(positions, columns=columns)
+
     def __getattr__(self, name):
         if name in self.data:
             return self.data[name]
@@ -179,14 +243,9 @@ class BaseDataCollector:
         """
         Return the report details
         """
-        return {
-            "name": cls.config_class.REPORT_NAME if cls.config_class else "",
-            "type": cls.config_class.REPORT_TYPE if cls.config_class else "",
-            "description": (
-                cls.config_class.REPORT_DESCRIPTION if cls.config_class else ""
-            ),
-            "introduction": cls.config_class.REPORT_INTRO if cls.config_class else "",
-        }
+        if cls.config_class is None:
+            return {"name": "", "type": "", "description": "", "introduction": ""}
+        return cls.config_class.get_report_details()
 
 
 class SnapshotSummaryCollector(BaseDataCollector):
@@ -208,157 +267,343 @@ class TrunkMismatchCollector(BaseDataCollector):
 @dataclass
 class PortCapacityCollector(BaseDataCollector):
     config_class: ClassVar[Type] = PortCapacityReportConfig
+    # Keep the raw interface rows, only needed to export them to CSV
+    keep_raw: bool = False
+    # Cache holding the port capacity cube of every snapshot
+    cube_cache: Optional[SnapshotCache] = None
 
     def get_data(self) -> Dict[str, Any]:
-        filter_exclude_interfaces = {
-            "intName": ["nireg", PortCapacityReportConfig.EXCLUDE_INTF_NAME]
-        }
-        if self.site_filter:
-            filter_exclude_interfaces["siteName"] = ["eq", self.site_filter]
+        """
+        Count the interfaces of every state per host and per site.
 
-        interfaces_json = self.ipf.inventory.interfaces.all(
-            columns=PortCapacityReportConfig.INTERFACE_COLUMNS,
-            filters=filter_exclude_interfaces,
-        )
+        The counts are roll-ups of the port capacity cube, which is read from the cache
+        when it was already built for the snapshot, and built otherwise.
 
-        interfaces_dict = self._process_interfaces(interfaces_json)
-        interfaces_report = self._generate_report(interfaces_dict)
-        site_report = self._generate_site_report(interfaces_report)
+        Returns:
+            Dictionary with the per host `interfaces_report`, the per site `site_report`
+            and the `cube` of the snapshot, plus the `interfaces_raw` rows when
+            `keep_raw` is set.
+        """
+        cube, interfaces_raw = self._get_cube()
 
-        return {
-            "interfaces_raw": interfaces_json,
-            "interfaces_report": interfaces_report,
-            "site_report": site_report,
+        site_filters = {"siteName": self.site_filter} if self.site_filter else None
+        host_counts = self.rollup_cube(
+            cube, ["hostname"], site_filters, first_columns=["siteName"]
+        )
+        # The serial numbers come from the device inventory, not from every interface
+        host_counts.insert(
+            1,
+            "sn",
+            pd.Series(
+                self._device_inventory().map_hostnames(host_counts["hostname"], "sn"),
+                index=host_counts.index,
+                dtype=object,
+            ),
+        )
+        site_counts = self.rollup_cube(host_counts, ["siteName"])
+
+        data = {
+            "interfaces_report": self._capacity_records(host_counts),
+            "site_report": self._capacity_records(site_counts),
+            "cube": cube,
         }
+        if self.keep_raw:
+            data["interfaces_raw"] = interfaces_raw
+        return data
 
-    @staticmethod
-    def _process_interfaces(
-        interfaces_json: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
-        interfaces_dict = {}
-        for intf in interfaces_json:
-            if intf["hostname"] in interfaces_dict:
-                interfaces_dict[intf["hostname"]]["interfaces"].append(intf)
-            else:
-                interfaces_dict[intf["hostname"]] = {"interfaces": [intf]}
-        return interfaces_dict
+    @classmethod
+    def load_cube(
+        cls, cache: SnapshotCache, snapshot_id: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load the port capacity cube of a snapshot from the cache.
+
+        Args:
+            cache: Cache of the reports
+            snapshot_id: ID of the snapshot
+
+        Returns:
+            The cube, or None if it wasn't built for this snapshot.
+        """
+        entry = cache.load(
+            f"{PortCapacityReportConfig.REPORT_TYPE}-cube",
+            scope=cls._cube_scope(snapshot_id),
+            version=PortCapacityReportConfig.CUBE_VERSION,
+        )
+        return entry["data"] if entry else None
 
     @staticmethod
-    def _generate_report(
-        interfaces_dict: Dict[str, Any],
-    ) -> List[Dict[str, Any]]:
-        interfaces_report = []
-        for hostname, data in interfaces_dict.items():
-            interfaces_total = len(data["interfaces"])
-            interfaces_l1up_l2up = len(
-                [i for i in data["interfaces"] if i["l1"] == "up" and i["l2"] == "up"]
-            )
-            interfaces_l1down_l2down = len(
-                [
-                    i
-                    for i in data["interfaces"]
-                    if i["l1"] == "down" and i["l2"] == "down"
-                ]
-            )
-            interfaces_l1up_l2down = len(
-                [i for i in data["interfaces"] if i["l1"] == "up" and i["l2"] == "down"]
+    def rollup_cube(
+        cube: pd.DataFrame,
+        by: List[str],
+        filters: Optional[Dict[str, Any]] = None,
+        first_columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Slice the port capacity cube and sum its counts over the other dimensions.
+
+        For example, the free 10G ports with a transceiver per site are the
+        "l1&l2 down" column of
+        `rollup_cube(cube, ["siteName"], {"speedValue": 10e9, "hasTransceiver": True})`.
+
+        Args:
+            cube: Cube as returned by `get_data` or `load_cube`, or one of its roll-ups
+            by: Dimensions to group by, groups keep the order in which they first appear
+            filters: Dimension -> value, or list of values, of the cells to keep
+            first_columns: Columns whose value is taken from the first cell of the group
+
+        Returns:
+            DataFrame with the `by` and `first_columns` columns, the total and the
+            state counts.
+        """
+        count_columns = PortCapacityReportConfig.COUNT_COLUMNS
+        first_columns = first_columns or []
+
+        mask = np.ones(len(cube), dtype=bool)
+        for column, values in (filters or {}).items():
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            mask &= cube[column].isin(values).to_numpy()
+        cells = cube[mask]
+
+        counts = cells.groupby(by, sort=False, dropna=False)[count_columns].sum()
+        first_cells = cells.drop_duplicates(by)
+        for column in reversed(first_columns):
+            counts.insert(
+                0,
+                column,
+                pd.Series(
+                    first_cells[column].to_numpy(), index=counts.index, dtype=object
+                ),
             )
-            interfaces_l1l2unknown = len(
-                [
-                    i
-                    for i in data["interfaces"]
-                    if i["l1"] not in ["up", "down"] or i["l2"] not in ["up", "down"]
-                ]
+        return counts.reset_index()
+
+    def _device_inventory(self) -> DeviceInventoryIndex:
+        return DeviceInventoryIndex.load(
+            self.ipf, self.snapshot_id, cache=self.cube_cache
+        )
+
+    @staticmethod
+    def _cube_scope(snapshot_id: str) -> str:
+        """The cube depends on the snapshot and on the interfaces excluded."""
+        return f"{snapshot_id}|{PortCapacityReportConfig.EXCLUDE_INTF_NAME}"
+
+    def _get_cube(self) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Return the port capacity cube, from the cache when possible.
+
+        A cached cube covers the whole network, so it is reused for any site. Otherwise
+        only the interfaces of the filtered site are fetched, unless
+        `CACHE_NETWORK_CUBE` is set: the cube of the whole network is then built and
+        cached for the next sites. A run without site filter always caches its cube.
+
+        Returns:
+            Tuple of the cube and of the raw interfaces when `keep_raw` is set.
+        """
+        snapshot_id = None
+        if (
+            self.cube_cache is not None
+            and self.cube_cache.enabled
+            and PortCapacityReportConfig.CACHE_CUBE
+        ):
+            snapshot_id = resolve_snapshot_id(self.ipf, self.snapshot_id)
+            if not snapshot_id or snapshot_id.startswith("$"):
+                snapshot_id = None
+
+        if snapshot_id and not self.keep_raw:
+            cube = self.load_cube(self.cube_cache, snapshot_id)
+            if cube is not None:
+                logger.info(f" -- Using the cached port capacity cube of {snapshot_id}")
+                return cube, []
+
+        # Fetching the whole network for a single site is opt-in
+        if self.site_filter and not PortCapacityReportConfig.CACHE_NETWORK_CUBE:
+            snapshot_id = None
+        cube, interfaces_raw = self._build_cube(
+            site_filter=None if snapshot_id else self.site_filter
+        )
+        if snapshot_id:
+            self.cube_cache.save(
+                f"{PortCapacityReportConfig.REPORT_TYPE}-cube",
+                snapshot_id=snapshot_id,
+                data=cube,
+                scope=self._cube_scope(snapshot_id),
+                version=PortCapacityReportConfig.CUBE_VERSION,
             )
-            interfaces_admin_down = len(
-                [
-                    i
-                    for i in data["interfaces"]
-                    if i["reason"]
-                    in PortCapacityReportConfig.INTERFACE_ADMIN_DOWN_REASON
-                ]
+        return cube, interfaces_raw
+
+    def _build_cube(
+        self, site_filter: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Count the interfaces of every state per cell of the cube.
+
+        The interfaces are fetched page by page and every batch of pages is discarded
+        once its states are counted, so the memory used depends on the number of cells,
+        not on the number of interfaces.
+
+        Args:
+            site_filter: Only fetch the interfaces of this site
+
+        Returns:
+            Tuple of the cube, one row per combination of CUBE_DIMENSIONS with the total
+            and the state counts, and of the raw interfaces of the filtered site when
+            `keep_raw` is set.
+        """
+        filter_exclude_interfaces = {
+            "intName": ["nireg", PortCapacityReportConfig.EXCLUDE_INTF_NAME]
+        }
+        if site_filter:
+            filter_exclude_interfaces["siteName"] = ["eq", site_filter]
+
+        cube_totals = GroupTotals(
+            PortCapacityReportConfig.CUBE_DIMENSIONS,
+            PortCapacityReportConfig.COUNT_COLUMNS,
+        )
+        interfaces_raw = []
+        for batch in self._iter_interface_batches(filter_exclude_interfaces):
+            if self.keep_raw:
+                interfaces_raw.extend(
+                    intf
+                    for intf in batch
+                    if not self.site_filter or intf.get("siteName") == self.site_filter
+                )
+            port_states = self._classify_interfaces(
+                pd.DataFrame(
+                    batch,
+                    columns=PortCapacityReportConfig.STATE_SOURCE_COLUMNS,
+                    dtype=object,
+                )
             )
-            interfaces_err_disabled = len(
-                [
-                    i
-                    for i in data["interfaces"]
-                    if i.get("reason") is not None and "err" in i.get("reason", "")
-                ]
+            cube_totals.add(
+                self.rollup_cube(port_states, PortCapacityReportConfig.CUBE_DIMENSIONS)
             )
+        return cube_totals.to_frame(), interfaces_raw
 
-            sum_interfaces_used = (
-                interfaces_l1up_l2up + interfaces_l1l2unknown + interfaces_l1up_l2down
-            )
-            sum_interfaces_unused = interfaces_l1down_l2down  # admin_down and err_disabled are already l1&l2 down
+    def _iter_interface_batches(
+        self, filters: Dict[str, Any]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Fetch the interfaces inventory one page at a time.
 
-            interfaces_report.append(
-                {
-                    "hostname": hostname,
-                    "sn": data["interfaces"][0]["sn"],
-                    "siteName": data["interfaces"][0]["siteName"],
-                    "total": interfaces_total,
-                    "l1&l2 up": interfaces_l1up_l2up,
-                    "l1&l2 down": interfaces_l1down_l2down,
-                    "l1 up & l2 down": interfaces_l1up_l2down,
-                    "L1 and l2 unknown": interfaces_l1l2unknown,
-                    "admin-down": interfaces_admin_down,
-                    "err-disabled": interfaces_err_disabled,
-                    "port utilisation (%)": (
-                        round((sum_interfaces_used / interfaces_total) * 100, 2)
-                        if interfaces_total > 0
-                        else 0
-                    ),
-                    "port availability (%)": (
-                        round((sum_interfaces_unused / interfaces_total) * 100, 2)
-                        if interfaces_total > 0
-                        else 0
-                    ),
-                }
+        The pages are grouped in batches of about BATCH_ROWS interfaces, which are
+        counted together to limit the overhead per page. Only the columns the states are
+        computed from are fetched, unless the raw interfaces are kept. The pages are
+        sorted on PAGE_SORT, as the order of an unsorted table can change between pages.
+
+        Args:
+            filters: Filters of the interfaces table
+
+        Yields:
+            Lists of interfaces.
+        """
+        page_size = PortCapacityReportConfig.PAGE_SIZE
+        columns = (
+            PortCapacityReportConfig.INTERFACE_COLUMNS
+            if self.keep_raw
+            else PortCapacityReportConfig.STATE_SOURCE_COLUMNS
+        )
+        batch, start = [], 0
+        while True:
+            page = self.ipf.inventory.interfaces.fetch(
+                columns=columns,
+                filters=filters,
+                sort=PortCapacityReportConfig.PAGE_SORT,
+                snapshot_id=self.snapshot_id,
+                limit=page_size,
+                start=start,
             )
-        return interfaces_report
+            batch.extend(page)
+            if len(page) < page_size:
+                break
+            if len(batch) >= PortCapacityReportConfig.BATCH_ROWS:
+                yield batch
+                batch = []
+            start += page_size
+        if batch:
+            yield batch
 
     @staticmethod
-    def _generate_site_report(
-        interfaces_report: List[Dict[str, Any]],
-    ) -> List[Dict[str, Any]]:
-        site_data = defaultdict(lambda: defaultdict(int))
-
-        for device in interfaces_report:
-            site_name = device["siteName"]
-            site_data[site_name]["total"] += device["total"]
-            site_data[site_name]["l1&l2 up"] += device["l1&l2 up"]
-            site_data[site_name]["l1&l2 down"] += device["l1&l2 down"]
-            site_data[site_name]["l1 up & l2 down"] += device["l1 up & l2 down"]
-            site_data[site_name]["L1 and l2 unknown"] += device["L1 and l2 unknown"]
-            site_data[site_name]["admin-down"] += device["admin-down"]
-            site_data[site_name]["err-disabled"] += device["err-disabled"]
-
-        site_report = []
-        for site_name, data in site_data.items():
-            total = data["total"]
-            used = (
-                data["l1&l2 up"] + data["l1 up & l2 down"] + data["L1 and l2 unknown"]
-            )
-            site_report.append(
-                {
-                    "siteName": site_name,
-                    "total": total,
-                    "l1&l2 up": data["l1&l2 up"],
-                    "l1&l2 down": data["l1&l2 down"],
-                    "l1 up & l2 down": data["l1 up & l2 down"],
-                    "L1 and l2 unknown": data["L1 and l2 unknown"],
-                    "admin-down": data["admin-down"],
-                    "err-disabled": data["err-disabled"],
-                    "port utilisation (%)": (
-                        round((used / total) * 100, 2) if total > 0 else 0
-                    ),
-                    "port availability (%)": (
-                        round((data["l1&l2 down"] / total) * 100, 2) if total > 0 else 0
-                    ),
-                }
-            )
+    def _classify_interfaces(interfaces_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Classify the state of every interface.
+
+        The l1, l2 and reason columns only hold a handful of distinct values, so the
+        conditions are evaluated once per distinct value and mapped back to the rows.
+
+        Args:
+            interfaces_df: Interfaces inventory, one row per interface
+
+        Returns:
+            DataFrame with the cube dimensions of every interface, a total column of
+            ones and one boolean column per state of PORT_STATE_COLUMNS.
+        """
+        df = interfaces_df.reindex(
+            columns=PortCapacityReportConfig.STATE_SOURCE_COLUMNS
+        )
 
-        return site_report
+        def _flags(column: str, *predicates) -> List[np.ndarray]:
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+            return [
+                np.fromiter(
+                    (bool(predicate(value)) for value in uniques),
+                    dtype=bool,
+                    count=len(uniques),
+                )[codes]
+                for predicate in predicates
+            ]
+
+        l1_up, l1_down = _flags("l1", lambda v: v == "up", lambda v: v == "down")
+        l2_up, l2_down = _flags("l2", lambda v: v == "up", lambda v: v == "down")
+        admin_down, err_disabled = _flags(
+            "reason",
+            lambda v: v in PortCapacityReportConfig.INTERFACE_ADMIN_DOWN_REASON,
+            lambda v: isinstance(v, str) and "err" in v,
+        )
+
+        states = {
+            "l1&l2 up": l1_up & l2_up,
+            "l1&l2 down": l1_down & l2_down,
+            "l1 up & l2 down": l1_up & l2_down,
+            "L1 and l2 unknown": ~((l1_up | l1_down) & (l2_up | l2_down)),
+            "admin-down": admin_down,
+            "err-disabled": err_disabled,
+        }
+        return df[PortCapacityReportConfig.CUBE_DIMENSIONS].assign(
+            total=np.ones(len(df), dtype=np.int64),
+            **{
+                column: states[column]
+                for column in PortCapacityReportConfig.PORT_STATE_COLUMNS
+            },
+        )
+
+    @staticmethod
+    def _capacity_records(counts: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Add the utilisation and availability ratios to the counts.
+
+        Args:
+            counts: Per host or per site counts
+
+        Returns:
+            List of dictionaries, one per host or site.
+        """
+        total = counts["total"]
+        used = (
+            counts["l1&l2 up"] + counts["L1 and l2 unknown"] + counts["l1 up & l2 down"]
+        )
+        # admin_down and err_disabled are already l1&l2 down
+        unused = counts["l1&l2 down"]
+        return counts.assign(
+            **{
+                "port utilisation (%)": ((used / total) * 100)
+                .round(2)
+                .where(total > 0, 0),
+                "port availability (%)": ((unused / total) * 100)
+                .round(2)
+                .where(total > 0, 0),
+            }
+        ).to_dict("records")
 
 
 @dataclass
@@ -384,7 +629,8 @@ class OverviewCollector(BaseDataCollector):
             name = item["name"]
             method = item.get("method")
             key = item.get("key")
-            filters = item.get("filters", {})
+            # Copy the filters, the config is shared by every collector
+            filters = dict(item.get("filters", {}))
             if self.site_filter:
                 filters["siteName"] = ["eq", self.site_filter]
 
@@ -455,6 +701,10 @@ class OverviewCollector(BaseDataCollector):
         columns: List[str] = [],
         **kwargs,
     ) -> Any:
+        inventory_data = self._inventory_data(method, filters, columns)
+        if inventory_data is not None:
+            return inventory_data
+
         api_method = self.ipf
         for part in method.split("."):
             api_method = getattr(api_method, part)
@@ -476,6 +726,16 @@ class OverviewCompareCollector(BaseDataCollector):
     config_class: ClassVar[Type] = OverviewCompareReportConfig
 
 
+@dataclass
+class OverviewTrendCollector(BaseDataCollector):
+    config_class: ClassVar[Type] = OverviewTrendReportConfig
+
+
+@dataclass
+class PortCapacityCompareCollector(BaseDataCollector):
+    config_class: ClassVar[Type] = PortCapacityCompareReportConfig
+
+
 @dataclass
 class DiscoveryReportCollector(BaseDataCollector):
     config_class: ClassVar[Type] = DiscoveryReportConfig
@@ -502,6 +762,7 @@ class DiscoveryReportCollector(BaseDataCollector):
                             {"status": ["neq", "found"]},
                         ]
                     },
+                    snapshot_id=self.snapshot_id,
                 )
             else:
                 data = self._fetch_data(method, columns=columns, filters=filters)
@@ -530,38 +791,11 @@ class DiscoveryReportCollector(BaseDataCollector):
                 if col not in connectivity_report.columns:
                     connectivity_report[col] = None
 
-        # Initialize merged_df with connectivity_report
-        merged_df = connectivity_report
-
-        if not cdp_unmanaged_neighbors.empty:
-            # Create a dictionary mapping 'remoteHost' to the rest of the CDP data
-            cdp_dict = (
-                cdp_unmanaged_neighbors.groupby("remoteIp").first().to_dict("index")
-            )
-
-            # Update merged_df with CDP data
-            for idx, row in merged_df.iterrows():
-                ip_address = row["ip"]
-                if ip_address in cdp_dict:
-                    for col, value in cdp_dict[ip_address].items():
-                        if col not in merged_df.columns:
-                            merged_df[col] = None
-                        merged_df.at[idx, col] = value
-
-        # Process Matrix unmanaged data
-        for protocol in self.config_class.PROTOCOLS:
-            merged_df[protocol] = "N"
-
-        if not matrix_unmanaged.empty:
-            # Create a dictionary for quick lookup
-            matrix_dict = (
-                matrix_unmanaged.groupby("neiIp")["protocol"].apply(list).to_dict()
-            )
-            for idx, row in merged_df.iterrows():
-                if row["ip"] in matrix_dict:
-                    for protocol in matrix_dict[row["ip"]]:
-                        if protocol.lower() in self.config_class.PROTOCOLS:
-                            merged_df.at[idx, protocol.lower()] = "Y"
+        merged_df = self._merge_cdp_neighbors(
+            connectivity_report, cdp_unmanaged_neighbors
+        )
+        merged_df = self._merge_matrix_protocols(merged_df, matrix_unmanaged)
+        merged_df = self._attribute_networks(merged_df, data_frames["Managed Networks"])
 
         # Translate column names and remove 'id' column
         merged_df = merged_df.rename(columns=self.config_class.COLUMN_TRANSLATIONS)
@@ -573,6 +807,113 @@ class DiscoveryReportCollector(BaseDataCollector):
 
         return merged_df.to_dict("records")
 
+    @staticmethod
+    def _merge_cdp_neighbors(
+        connectivity_report: pd.DataFrame, cdp_unmanaged_neighbors: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Left-join the CDP/LLDP unmanaged neighbors on `ip` = `remoteIp`.
+
+        Only the matched rows take the neighbor data (the first non-null value of each
+        column per `remoteIp`), the other rows keep their values.
+        """
+        if cdp_unmanaged_neighbors.empty:
+            return connectivity_report
+
+        cdp_first = cdp_unmanaged_neighbors.groupby("remoteIp").first()
+        positions = cdp_first.index.get_indexer(connectivity_report["ip"])
+        matched = positions >= 0
+        if not matched.any():
+            return connectivity_report
+
+        merged_df = connectivity_report.copy()
+        for col in cdp_first.columns:
+            if col in merged_df.columns:
+                values = merged_df[col].to_numpy(dtype=object, copy=True)
+            else:
+                values = np.full(len(merged_df), None, dtype=object)
+            values[matched] = cdp_first[col].to_numpy(dtype=object)[positions[matched]]
+            # Keep an object column, like a cell by cell update: None stays None
+            merged_df[col] = pd.Series(values, index=merged_df.index, dtype=object)
+        return merged_df
+
+    def _merge_matrix_protocols(
+        self, merged_df: pd.DataFrame, matrix_unmanaged: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Flag the routing protocols (Y/N) seen for each IP in the matrix unmanaged neighbors.
+
+        The flags come from a `neiIp` x protocol crosstab, looked up on `ip`.
+        """
+        merged_df = merged_df.copy()
+        for protocol in self.config_class.PROTOCOLS:
+            merged_df[protocol] = "N"
+
+        if matrix_unmanaged.empty:
+            return merged_df
+
+        protocols_seen = pd.crosstab(
+            matrix_unmanaged["neiIp"], matrix_unmanaged["protocol"].str.lower()
+        )
+        positions = protocols_seen.index.get_indexer(merged_df["ip"])
+        matched = positions >= 0
+        for protocol in self.config_class.PROTOCOLS:
+            if protocol not in protocols_seen.columns:
+                continue
+            seen = np.zeros(len(merged_df), dtype=bool)
+            seen[matched] = protocols_seen[protocol].to_numpy()[positions[matched]] > 0
+            merged_df.loc[seen, protocol] = "Y"
+        return merged_df
+
+    @staticmethod
+    def _attribute_networks(
+        merged_df: pd.DataFrame, managed_networks: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Attribute every IP to the most specific managed network containing it, with its site,
+        VLAN and VRF.
+
+        The managed networks are loaded in a sorted interval index, so each IP is a
+        binary search instead of a scan of all the networks.
+        """
+        merged_df = merged_df.copy()
+        columns = ["network", "networkSite", "networkVlan", "networkVrf"]
+        if managed_networks.empty:
+            for col in columns:
+                merged_df[col] = None
+            return merged_df
+
+        # The same network can be managed in several sites
+        networks = managed_networks.groupby("net", sort=False).agg(
+            siteName=("siteName", lambda sites: ", ".join(sorted(set(sites.dropna())))),
+            vlanId=("vlanId", "first"),
+            vrf=("vrf", "first"),
+        )
+        index = NetworkIntervalIndex(zip(networks.index, networks.to_dict("records")))
+
+        def vlan_id(value):
+            # The VLAN column is a float column when some networks have no VLAN
+            if pd.isna(value):
+                return None
+            return int(value) if isinstance(value, float) else value
+
+        attributions = [
+            (
+                (
+                    match[0],
+                    match[1]["siteName"],
+                    vlan_id(match[1]["vlanId"]),
+                    match[1]["vrf"],
+                )
+                if match
+                else (None, None, None, None)
+            )
+            for match in index.lookup_many(merged_df["ip"].tolist())
+        ]
+        for col, values in zip(columns, zip(*attributions)):
+            merged_df[col] = pd.Series(values, index=merged_df.index, dtype=object)
+        return merged_df
+
 
 @dataclass
 class CVECollector(BaseDataCollector):
@@ -6,6 +6,10 @@ from os.path import isfile, join
 
 from ipfabric_reports.report_registry import ReportRegistry
 from ipfabric_reports import IPFabricReportGenerator
+from ipfabric_reports.cache import SnapshotCache, resolve_cache_dir
+from ipfabric_reports.config import PortCapacityReportConfig
+from ipfabric_reports.data_collectors import PortCapacityCollector
+from ipfabric_reports.inventory import SiteIndex
 
 
 from ipfabric import IPFClient
@@ -29,6 +33,7 @@ class ReportFrontend:
 
         self.show_connection_form()
         self.show_report_form()
+        self.show_port_capacity_explorer()
         self.display_reports()
 
     def show_connection_form(self):
@@ -71,8 +76,11 @@ class ReportFrontend:
             col1, col2 = st.columns(2)
             with col1:
                 site_filter_applied = st.checkbox("Apply Site Filter", value=False)
-                all_sites = ipf_client.inventory.sites.all()
-                site_names = [site["id"] for site in all_sites]
+                site_names = SiteIndex.load(
+                    ipf_client,
+                    ipf_client.snapshot_id,
+                    cache=SnapshotCache(resolve_cache_dir()),
+                ).names()
                 site_filter = st.selectbox(
                         "Site Filter",
                         options=site_names,
@@ -107,13 +115,51 @@ class ReportFrontend:
                 ipf_client=st.session_state["ipf_client"],
                 site_filter=site_filter,
                 report_type=report_type,
-                report_style=report_style,
+                report_style=report_style.getvalue() if report_style else None,
                 snapshot_id=snapshot_id,
                 nvd_api_key=nvd_api_key,
             )
             report_generator.generate_report()
             st.success(f"Report '{report_type}' generated successfully!")
 
+    def show_port_capacity_explorer(self):
+        if "ipf_client" not in st.session_state:
+            return
+        st.header("Port Capacity Explorer")
+
+        cube = PortCapacityCollector.load_cube(
+            SnapshotCache(resolve_cache_dir()),
+            st.session_state["ipf_client"].snapshot_id,
+        )
+        if cube is None:
+            st.info(
+                "Generate a port-capacity report of the whole network to explore the "
+                "ports of this snapshot."
+            )
+            return
+
+        col1, col2 = st.columns(2)
+        with col1:
+            group_by = st.multiselect(
+                "Group by",
+                options=PortCapacityReportConfig.CUBE_DIMENSIONS,
+                default=["siteName"],
+            )
+        filters = {}
+        with col2:
+            for dimension in PortCapacityReportConfig.CUBE_DIMENSIONS:
+                if dimension == "hostname":
+                    continue
+                values = st.multiselect(
+                    f"Filter {dimension}",
+                    options=cube[dimension].dropna().unique().tolist(),
+                )
+                if values:
+                    filters[dimension] = values
+
+        if group_by:
+            st.dataframe(PortCapacityCollector.rollup_cube(cube, group_by, filters))
+
     def display_reports(self):
         st.header("Available Reports")
 
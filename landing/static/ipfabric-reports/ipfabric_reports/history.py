@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - Metrics History Module.
+
+This module provides a local store of the key metrics computed by the reports
+(port utilisation, CVE counts, trunk mismatches, undiscovered IPs, ...), so
+their history can be queried and charted without calling the IP Fabric API.
+
+Main Components:
+    - MetricsHistory: SQLite store of the report metrics
+
+Every metric is stored with the report type, the site filter ('' for the whole
+network), the snapshot ID and the time of the snapshot. Recording the metrics of
+a snapshot again replaces the previous values, so running a report twice on the
+same snapshot doesn't duplicate its history.
+
+Usage:
+    >>> history = MetricsHistory("export/history.db")
+    >>> history.query(report_type="port-capacity", metrics="Overall Util (%)")
+"""
+
+# Standard library imports
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Third-party imports
+import pandas as pd
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    report_type TEXT NOT NULL,
+    site TEXT NOT NULL,
+    snapshot_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    timestamp TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (report_type, site, metric, snapshot_id)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_time
+    ON metrics (report_type, site, metric, timestamp);
+CREATE INDEX IF NOT EXISTS metrics_by_timestamp ON metrics (timestamp);
+"""
+
+
+def _isoformat(value: Union[str, datetime]) -> str:
+    """Convert a datetime to an ISO 8601 string in UTC, which sorts chronologically."""
+    if isinstance(value, str):
+        # pandas parses the 'Z' suffix, datetime.fromisoformat only does from Python 3.11
+        value = pd.Timestamp(value).to_pydatetime()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+class MetricsHistory:
+    """
+    SQLite store of the report metrics.
+
+    Args:
+        db_path: Path of the SQLite database, created with its directory on first use
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        # Readers don't block the report appending its metrics
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def record(
+        self,
+        report_type: str,
+        snapshot_id: str,
+        metrics: Dict[str, float],
+        site: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> int:
+        """
+        Append the metrics of a report run, replacing the ones of the same snapshot.
+
+        Args:
+            report_type: Type of the report, e.g. 'port-capacity'
+            snapshot_id: Snapshot the metrics were computed from
+            metrics: Metric values keyed by metric name, non numeric values are ignored
+            site: Site filter of the report, None for the whole network
+            timestamp: Time of the snapshot, defaults to now
+
+        Returns:
+            Number of metrics recorded.
+        """
+        recorded_at = _isoformat(datetime.now(timezone.utc))
+        timestamp = _isoformat(timestamp) if timestamp else recorded_at
+        rows = [
+            (
+                report_type,
+                site or "",
+                snapshot_id,
+                metric,
+                float(value),
+                timestamp,
+                recorded_at,
+            )
+            for metric, value in metrics.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        logger.info(f" -- Recorded {len(rows)} metrics in {self.db_path}")
+        return len(rows)
+
+    def query(
+        self,
+        report_type: Optional[str] = None,
+        metrics: Optional[Union[str, List[str]]] = None,
+        site: Optional[str] = None,
+        snapshot_id: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+    ) -> pd.DataFrame:
+        """
+        Query the recorded metrics.
+
+        Args:
+            report_type: Only return the metrics of this report type
+            metrics: Only return this metric, or these metrics
+            site: Only return the metrics of this site filter, '' for the whole network
+                (None returns every site)
+            snapshot_id: Only return the metrics of this snapshot
+            since: Only return the metrics of the snapshots taken at or after this time
+            until: Only return the metrics of the snapshots taken before this time
+
+        Returns:
+            DataFrame with the report_type, site, snapshot_id, metric, value, timestamp
+            and recorded_at columns, ordered by timestamp.
+        """
+        conditions, parameters = [], []
+        if report_type is not None:
+            conditions.append("report_type = ?")
+            parameters.append(report_type)
+        if metrics is not None:
+            metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+            conditions.append(f"metric IN ({', '.join('?' * len(metrics))})")
+            parameters.extend(metrics)
+        if site is not None:
+            conditions.append("site = ?")
+            parameters.append(site)
+        if snapshot_id is not None:
+            conditions.append("snapshot_id = ?")
+            parameters.append(snapshot_id)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            parameters.append(_isoformat(since))
+        if until is not None:
+            conditions.append("timestamp < ?")
+            parameters.append(_isoformat(until))
+
+        query = "SELECT * FROM metrics"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp, report_type, site, metric"
+
+        with closing(self._connect()) as connection:
+            df = pd.read_sql_query(query, connection, params=parameters)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        df["recorded_at"] = pd.to_datetime(df["recorded_at"], utc=True)
+        return df
+
+    def trend(
+        self,
+        report_type: str,
+        metrics: Optional[Union[str, List[str]]] = None,
+        site: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+    ) -> pd.DataFrame:
+        """
+        Return the metrics of a report as a snapshots x metrics table.
+
+        Args:
+            report_type: Type of the report
+            metrics: Only return this metric, or these metrics
+            site: Site filter of the report, None for the whole network
+            since: Only return the snapshots taken at or after this time
+            until: Only return the snapshots taken before this time
+
+        Returns:
+            DataFrame indexed by (timestamp, snapshot_id), one column per metric.
+        """
+        df = self.query(report_type, metrics, site or "", since=since, until=until)
+        return df.pivot_table(
+            index=["timestamp", "snapshot_id"],
+            columns="metric",
+            values="value",
+            aggfunc="last",
+            sort=False,
+        )
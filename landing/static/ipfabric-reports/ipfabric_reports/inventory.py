@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - Device Inventory Module.
+
+This module provides an index of the device inventory of a snapshot, loaded once
+and shared by every collector, instead of fetching the devices again to validate
+a site, count the devices, group them by OS version or find the serial number of
+a hostname.
+
+Main Components:
+    - DeviceInventoryIndex: Columnar device inventory with hash lookups
+    - SiteIndex: Site names and device counts, to validate site filters
+
+The indexes of the last few snapshots used are kept in the process, and optionally
+in the report cache between runs.
+
+The inventory is kept as one array per column. The hostnames and serial numbers
+are indexed in dictionaries, and the devices of every site are kept as arrays of
+positions, so a lookup or a site selection doesn't scan the inventory.
+"""
+
+# Standard library imports
+import difflib
+from abc import ABC, abstractmethod
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Local imports
+from .cache import SnapshotCache
+from .modules import resolve_snapshot_id
+
+INVENTORY_COLUMNS = [
+    "hostname",
+    "sn",
+    "siteName",
+    "vendor",
+    "family",
+    "version",
+    "devType",
+]
+INVENTORY_CACHE_VERSION = 1
+
+
+class _SnapshotIndex(ABC):
+    """
+    Base class of the indexes built once per snapshot from an IP Fabric table.
+
+    Subclasses set CACHE_NAME and implement `_fetch` and `__init__(rows, snapshot_id)`.
+    """
+
+    CACHE_NAME = ""
+    CACHE_VERSION = 1
+    # Number of snapshots whose index is kept in the process, per index type
+    MAX_SNAPSHOTS = 4
+
+    _loaded: "OrderedDict[Tuple[str, str, str], _SnapshotIndex]" = OrderedDict()
+    _locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @abstractmethod
+    def __init__(self, rows: Iterable[Dict[str, Any]], snapshot_id: Optional[str]):
+        """Build the index from the rows of its table."""
+
+    @staticmethod
+    @abstractmethod
+    def _fetch(ipf, snapshot_id: str) -> List[Dict[str, Any]]:
+        """Fetch the rows of the index from the API."""
+
+    @classmethod
+    def load(
+        cls,
+        ipf,
+        snapshot_id: Optional[str] = "$last",
+        cache: Optional[SnapshotCache] = None,
+    ):
+        """
+        Return the index of a snapshot, fetching its rows only once.
+
+        The indexes of the last MAX_SNAPSHOTS snapshots used are kept in the process,
+        and in the cache when one is given, so the rows of a snapshot are fetched once
+        whatever the number of collectors and threads using it.
+
+        Args:
+            ipf: IPFClient instance
+            snapshot_id: Snapshot reference ('$last', '$prev', ...) or ID
+            cache: Cache of the reports, to keep the index between runs
+
+        Returns:
+            The index of the snapshot.
+        """
+        snapshot_id = resolve_snapshot_id(ipf, snapshot_id)
+        key = (cls.CACHE_NAME, str(getattr(ipf, "base_url", "")), snapshot_id)
+        with cls._lock:
+            # One lock per snapshot, different snapshots are loaded at the same time
+            snapshot_lock = cls._locks.setdefault(key, threading.Lock())
+        with snapshot_lock:
+            with cls._lock:
+                index = cls._loaded.get(key)
+                if index is not None:
+                    cls._loaded.move_to_end(key)
+                    return index
+
+            # Only resolved snapshots can be kept between runs
+            cacheable = (
+                cache is not None and snapshot_id and not snapshot_id.startswith("$")
+            )
+            entry = (
+                cache.load(cls.CACHE_NAME, scope=snapshot_id, version=cls.CACHE_VERSION)
+                if cacheable
+                else None
+            )
+            if entry is not None:
+                rows = entry["data"]
+            else:
+                rows = cls._fetch(ipf, snapshot_id)
+                if cacheable:
+                    cache.save(
+                        cls.CACHE_NAME,
+                        snapshot_id,
+                        rows,
+                        scope=snapshot_id,
+                        version=cls.CACHE_VERSION,
+                    )
+            index = cls(rows, snapshot_id=snapshot_id)
+            with cls._lock:
+                cls._loaded[key] = index
+                cls._evict()
+            return index
+
+    @classmethod
+    def _evict(cls) -> None:
+        """Forget the least recently used snapshots beyond MAX_SNAPSHOTS."""
+        keys = [key for key in cls._loaded if key[0] == cls.CACHE_NAME]
+        for key in keys[: max(len(keys) - cls.MAX_SNAPSHOTS, 0)]:
+            del cls._loaded[key]
+            cls._locks.pop(key, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget the indexes loaded by this process."""
+        with cls._lock:
+            cls._loaded.clear()
+            cls._locks.clear()
+
+
+class DeviceInventoryIndex(_SnapshotIndex):
+    """
+    Device inventory of a snapshot, indexed by hostname, serial number and site.
+
+    Args:
+        devices: Devices of the inventory, as returned by `inventory.devices.all`
+        snapshot_id: Snapshot of the inventory
+    """
+
+    CACHE_NAME = "device-inventory"
+    CACHE_VERSION = INVENTORY_CACHE_VERSION
+
+    def __init__(
+        self, devices: Iterable[Dict[str, Any]], snapshot_id: Optional[str] = None
+    ):
+        self.snapshot_id = snapshot_id
+        devices = list(devices)
+        self._columns: Dict[str, np.ndarray] = {}
+        for column in INVENTORY_COLUMNS:
+            values = np.empty(len(devices), dtype=object)
+            values[:] = [device.get(column) for device in devices]
+            self._columns[column] = values
+
+        # The first device wins when a hostname or a serial number is duplicated
+        self._by_hostname: Dict[str, int] = {}
+        self._by_sn: Dict[str, int] = {}
+        site_positions: Dict[str, List[int]] = {}
+        for position, (hostname, sn, site) in enumerate(
+            zip(
+                self._columns["hostname"],
+                self._columns["sn"],
+                self._columns["siteName"],
+            )
+        ):
+            self._by_hostname.setdefault(hostname, position)
+            self._by_sn.setdefault(sn, position)
+            site_positions.setdefault(site, []).append(position)
+        self._by_site = {
+            site: np.array(positions, dtype=np.int64)
+            for site, positions in site_positions.items()
+        }
+        # Vectorised hostname lookups, on the first device of every hostname
+        self._hostname_index = pd.Index(list(self._by_hostname), dtype=object)
+        self._hostname_positions = np.fromiter(
+            self._by_hostname.values(), dtype=np.int64, count=len(self._by_hostname)
+        )
+
+    @staticmethod
+    def _fetch(ipf, snapshot_id: str) -> List[Dict[str, Any]]:
+        logger.info(f" -- Loading the device inventory of snapshot {snapshot_id}")
+        return ipf.inventory.devices.all(
+            columns=INVENTORY_COLUMNS, snapshot_id=snapshot_id
+        )
+
+    def __len__(self) -> int:
+        return len(self._columns["hostname"])
+
+    def __contains__(self, hostname: str) -> bool:
+        return hostname in self._by_hostname
+
+    def sites(self) -> Dict[str, int]:
+        """Return the number of devices of every site."""
+        return {site: len(positions) for site, positions in self._by_site.items()}
+
+    def site_device_count(self, site: str) -> int:
+        """Return the number of devices of a site, 0 for an unknown site."""
+        return len(self._by_site.get(site, ()))
+
+    def lookup(self, hostname: str) -> Optional[Dict[str, Any]]:
+        """Return the device with this hostname, or None."""
+        position = self._by_hostname.get(hostname)
+        return None if position is None else self._record(position)
+
+    def lookup_sn(self, sn: str) -> Optional[Dict[str, Any]]:
+        """Return the device with this serial number, or None."""
+        position = self._by_sn.get(sn)
+        return None if position is None else self._record(position)
+
+    def map_hostnames(self, hostnames: Iterable[str], column: str) -> np.ndarray:
+        """
+        Return a column of the devices with these hostnames, None for unknown hostnames.
+
+        Args:
+            hostnames: Hostnames, e.g. a column of a DataFrame
+            column: One of INVENTORY_COLUMNS
+
+        Returns:
+            Array of the values, aligned with the hostnames.
+        """
+        found = self._hostname_index.get_indexer(
+            pd.Index(list(hostnames), dtype=object)
+        )
+        values = np.append(self._columns[column][self._hostname_positions], None)
+        # Unknown hostnames are found at -1, i.e. the None appended above
+        return values[found]
+
+    def select(self, site: Optional[str] = None) -> np.ndarray:
+        """
+        Return the positions of the devices of a site.
+
+        Args:
+            site: Only select the devices of this site (default: every device)
+
+        Returns:
+            Array of positions.
+        """
+        if site is not None:
+            return self._by_site.get(site, np.empty(0, dtype=np.int64))
+        return np.arange(len(self), dtype=np.int64)
+
+    def records(
+        self,
+        positions: Optional[np.ndarray] = None,
+        columns: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the devices at these positions as dictionaries.
+
+        Args:
+            positions: Positions of the devices (default: every device)
+            columns: Columns of the dictionaries (default: INVENTORY_COLUMNS)
+
+        Returns:
+            List of devices.
+        """
+        if positions is None:
+            positions = np.arange(len(self), dtype=np.int64)
+        columns = list(columns or INVENTORY_COLUMNS)
+        values = [self._columns[column][positions] for column in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def _record(self, position: int) -> Dict[str, Any]:
+        return {column: self._columns[column][position] for column in INVENTORY_COLUMNS}
+
+
+class SiteIndex(_SnapshotIndex):
+    """
+    Sites of a snapshot and their number of devices.
+
+    Args:
+        sites: Rows of the sites table, with the siteName and devicesCount columns
+        snapshot_id: Snapshot of the sites
+    """
+
+    CACHE_NAME = "site-index"
+    CACHE_VERSION = 1
+
+    def __init__(
+        self, sites: Iterable[Dict[str, Any]], snapshot_id: Optional[str] = None
+    ):
+        self.snapshot_id = snapshot_id
+        self._device_counts: Dict[str, int] = {
+            site["siteName"]: int(site.get("devicesCount") or 0) for site in sites
+        }
+        # Case insensitive names, to suggest the right spelling of a site
+        self._by_folded_name: Dict[str, str] = {}
+        for name in self._device_counts:
+            self._by_folded_name.setdefault(str(name).casefold(), name)
+
+    @staticmethod
+    def _fetch(ipf, snapshot_id: str) -> List[Dict[str, Any]]:
+        logger.info(f" -- Loading the sites of snapshot {snapshot_id}")
+        return ipf.fetch_all(
+            "tables/inventory/sites",
+            columns=["siteName", "devicesCount"],
+            snapshot_id=snapshot_id,
+        )
+
+    def __len__(self) -> int:
+        return len(self._device_counts)
+
+    def __contains__(self, site: str) -> bool:
+        return site in self._device_counts
+
+    def names(self) -> List[str]:
+        """Return the names of the sites."""
+        return list(self._device_counts)
+
+    def device_count(self, site: str) -> int:
+        """Return the number of devices of a site, 0 for an unknown site."""
+        return self._device_counts.get(site, 0)
+
+    def suggest(self, site: str, limit: int = 3) -> List[str]:
+        """
+        Return the site names closest to a misspelled site name.
+
+        Args:
+            site: Site name not found in the snapshot
+            limit: Maximum number of suggestions
+
+        Returns:
+            Site names, the closest first.
+        """
+        folded = str(site).casefold()
+        suggestions = []
+        if folded in self._by_folded_name:
+            suggestions.append(self._by_folded_name[folded])
+        for match in difflib.get_close_matches(
+            folded, self._by_folded_name, n=limit, cutoff=0.6
+        ):
+            if self._by_folded_name[match] not in suggestions:
+                suggestions.append(self._by_folded_name[match])
+        return suggestions[:limit]
+
+    def validate(self, sites: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Check that sites exist in the snapshot and have devices.
+
+        Args:
+            sites: Site name, or site names
+
+        Returns:
+            The site names, without duplicates.
+
+        Raises:
+            ValueError: If a site doesn't exist or has no devices, listing every such
+                site with the closest site names.
+        """
+        sites = [sites] if isinstance(sites, str) else list(dict.fromkeys(sites))
+        errors = []
+        for site in sites:
+            if site not in self._device_counts:
+                suggestions = self.suggest(site)
+                hint = (
+                    f" (did you mean: {', '.join(suggestions)}?)" if suggestions else ""
+                )
+                errors.append(f"Site not found: {site}{hint}")
+            elif not self._device_counts[site]:
+                errors.append(f"No devices found in site: {site}")
+        if errors:
+            raise ValueError("; ".join(errors))
+        return sites
@@ -16,6 +16,7 @@ Usage:
     The module can be used directly or imported as part of the larger package:
     >>> generator = IPFabricReportGenerator()
     >>> generator.generate_report()
+    >>> artifacts = generator.generate_artifacts(["pdf", "csv"])  # in memory
 
 Environment Variables:
     - IPF_URL: IP Fabric instance URL
@@ -25,23 +26,39 @@ Environment Variables:
     - REPORT_SITE: Site filter for the report (optional)
     - INVENTORY_FILTER: Device inventory filter for the report (optional)
     - REPORT_STYLE: CSS style file to use (optional)
+    - REPORT_WORKERS: Number of worker processes for parallel analysis (optional)
+    - TRUNK_SHARD_BY: Shard the trunk analysis by 'site' or 'component' (optional)
+    - REPORT_INCREMENTAL: Reuse the results of the previous run when supported (optional)
+    - REPORT_CACHE_DIR: Directory holding the results kept between runs (optional)
+    - TABULAR_FORMAT: Format of the tabular exports, 'xlsx', 'csv' or 'parquet' (optional)
+    - REPORT_TREND_SNAPSHOTS: Comma-separated snapshot IDs, or number of most recent snapshots, of the trend report (optional)
+    - REPORT_TREND_DAYS: Report on the snapshots of the last N days in the trend report (optional)
+    - REPORT_HISTORY_DB: SQLite database keeping the key metrics of every report run (optional)
 """
 
 from __future__ import annotations
 
 # Standard library imports
+import io
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Union
 
 # Third-party imports
 from dotenv import load_dotenv, find_dotenv
-from ipfabric import IPFClient
 from loguru import logger
 
 # Local imports
+from .cache import SnapshotCache
+from .config import TABULAR_FORMATS
 from .report_registry import ReportRegistry
-from .report_renderer import ReportRenderer
+
+# The IP Fabric SDK, pandas and WeasyPrint are imported when a report is generated,
+# so listing the reports or showing the help doesn't wait for them
+if TYPE_CHECKING:
+    from ipfabric import IPFClient
+
+    from .report_renderer import ReportRenderer
 
 
 class IPFabricReportGenerator:
@@ -62,13 +79,24 @@ class IPFabricReportGenerator:
         report_type: Type of report to generate
         site_filter: Site filter for the report
         inventory_filter: Device inventory filter
-        report_style: CSS style file to use
+        report_style: CSS style file to use, or the content of an uploaded stylesheet
         nvd_api_key: API key for NVD data
+        workers: Number of worker processes for parallel analysis
+        shard_by: Shard the trunk mismatch analysis by 'site' or 'component'
+        incremental: Reuse the results of the previous run when the report supports it
+        cache_dir: Directory holding the results kept between runs (defaults to <export_dir>/.cache,
+            see `cache.resolve_cache_dir`)
+        tabular_format: Format of the tabular exports, 'xlsx' (default), 'csv' or 'parquet'
+        trend_snapshots: Snapshot IDs, or number of most recent snapshots, of the trend report
+        trend_days: Report on the snapshots of the last N days in the trend report
+        history_db: SQLite database keeping the key metrics of every report run
+        render_workers: Number of processes rendering the PDF of a batch of reports
+        render_budget: Cut the large tables of the PDF, the full data stays in the exports
     """
 
     def __init__(
             self,
-            ipf_client: Optional[IPFClient] = None,
+            ipf_client: Optional["IPFClient"] = None,
             ipf_url: Optional[str] = None,
             token: Optional[str] = None,
             snapshot_id: str = None,
@@ -80,8 +108,18 @@ class IPFabricReportGenerator:
             report_type: Optional[str] = None,
             site_filter: Optional[str] = None,
             inventory_filter: Optional[str] = None,
-            report_style: str = "default_style.css",
-            nvd_api_key: Optional[str] = None
+            report_style: Union[str, bytes] = "default_style.css",
+            nvd_api_key: Optional[str] = None,
+            workers: Optional[int] = None,
+            shard_by: Optional[str] = None,
+            incremental: Optional[bool] = None,
+            cache_dir: Optional[str] = None,
+            tabular_format: Optional[str] = None,
+            trend_snapshots: Optional[Union[int, str, List[str]]] = None,
+            trend_days: Optional[int] = None,
+            history_db: Optional[str] = None,
+            render_workers: Optional[int] = None,
+            render_budget: Optional[bool] = None,
     ):
         # Load environment variables if specified
         self._load_env(env_file)
@@ -94,6 +132,8 @@ class IPFabricReportGenerator:
             except Exception as e:
                 raise ValueError(f"Error initializing IP Fabric client: {str(e)}")
         else:
+            from ipfabric import IPFClient
+
             # Try parameters first, then environment variables
             final_url = ipf_url or os.getenv("IPF_URL")
             final_token = token or os.getenv("IPF_TOKEN")
@@ -124,10 +164,47 @@ class IPFabricReportGenerator:
         self.export_dir = export_dir or os.getenv("EXPORT_DIR", "export")
         self.snapshot_id_prev = snapshot_id_prev or os.getenv("IPF_SNAPSHOT_ID_PREV", "$prev")
         self.logo_path = os.getenv("LOGO_PATH") or None
+        self.workers = int(workers or os.getenv("REPORT_WORKERS") or 1)
+        self.shard_by = shard_by or os.getenv("TRUNK_SHARD_BY") or None
+        if incremental is None:
+            incremental = os.getenv("REPORT_INCREMENTAL", "false").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.incremental = incremental
+        if render_budget is None:
+            render_budget = os.getenv("REPORT_RENDER_BUDGET", "false").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.render_budget = render_budget
+        self.cache_dir = cache_dir or os.getenv("REPORT_CACHE_DIR") or None
+        self.tabular_format = tabular_format or os.getenv("TABULAR_FORMAT") or "xlsx"
+        trend_snapshots = trend_snapshots or os.getenv("REPORT_TREND_SNAPSHOTS") or None
+        if isinstance(trend_snapshots, str):
+            trend_snapshots = (
+                int(trend_snapshots)
+                if trend_snapshots.strip().isdigit()
+                else [sid.strip() for sid in trend_snapshots.split(",") if sid.strip()]
+            )
+        self.trend_snapshots = trend_snapshots
+        self.trend_days = int(trend_days or os.getenv("REPORT_TREND_DAYS") or 0) or None
+        self.history_db = history_db or os.getenv("REPORT_HISTORY_DB") or None
+        self.render_workers = (
+            int(render_workers or os.getenv("REPORT_RENDER_WORKERS") or 0) or None
+        )
 
         # Validate report type
         self._validate_report_type()
 
+        if self.tabular_format not in TABULAR_FORMATS:
+            raise ValueError(
+                f"Invalid tabular format: {self.tabular_format}. "
+                f"Available formats: {', '.join(TABULAR_FORMATS)}"
+            )
+
         # Validate site filter if provided
         if self.site_filter:
             self._validate_site_filter()
@@ -158,66 +235,270 @@ class IPFabricReportGenerator:
 
     def _validate_site_filter(self) -> None:
         """Validate the site filter if provided."""
-        site_list = self.ipf.fetch_all("tables/inventory/sites")
-        site_names = [site["siteName"] for site in site_list]
+        self.validate_sites(self.site_filter)
 
-        if self.site_filter not in site_names:
-            raise ValueError(f"Site not found: {self.site_filter}")
+    def validate_sites(self, sites: Union[str, List[str]]) -> List[str]:
+        """
+        Check that sites exist in the snapshot and have devices.
 
-        site_devices = self.ipf.inventory.devices.all(
-            filters={"siteName": ["eq", self.site_filter]}
-        )
-        if not site_devices:
-            raise ValueError(f"No devices found in site: {self.site_filter}")
+        The sites of the snapshot are loaded once per process, so validating the sites
+        of several reports doesn't call the API again. They are kept between runs when
+        `cache_dir` is set; validation never writes to the export directory.
+
+        Args:
+            sites: Site name, or site names
+
+        Returns:
+            The site names, without duplicates.
+
+        Raises:
+            ValueError: If a site doesn't exist or has no devices.
+        """
+        from .inventory import SiteIndex
+
+        cache = SnapshotCache(self.cache_dir)
+        site_index = SiteIndex.load(self.ipf, self.ipf.snapshot_id, cache=cache)
+        return site_index.validate(sites)
 
     def _initialize_renderer(self) -> None:
         """Initialize the report renderer."""
         package_dir = Path(__file__).resolve().parent
-        self.css_path = package_dir / "styles" / self.report_style
+        # An uploaded stylesheet is passed to the renderer as is, cached by its hash
+        if isinstance(self.report_style, bytes):
+            self.css_path = self.report_style
+        else:
+            self.css_path = package_dir / "styles" / self.report_style
+        self._renderer: Optional["ReportRenderer"] = None
+
+    @property
+    def renderer(self) -> "ReportRenderer":
+        """Report renderer, created on first use so WeasyPrint is only loaded to render."""
+        if self._renderer is None:
+            from .report_renderer import ReportRenderer
+
+            package_dir = Path(__file__).resolve().parent
+            self._renderer = ReportRenderer(
+                template_dir=package_dir / "templates",
+                output_dir=self.export_dir,
+                generate_html=False,
+                logo_path=self.logo_path
+                or "styles/img/IP_Fabric_VerticalLogo_Color.svg",
+            )
+        return self._renderer
 
-        self.renderer = ReportRenderer(
-            template_dir=package_dir / "templates",
-            output_dir=self.export_dir,
-            generate_html=False,
-            logo_path=self.logo_path or "styles/img/IP_Fabric_VerticalLogo_Color.svg",
-        )
+    @renderer.setter
+    def renderer(self, renderer: "ReportRenderer") -> None:
+        self._renderer = renderer
 
-    def generate_report(self) -> None:
-        """Generate the report based on configured settings."""
-        report_class = ReportRegistry.get_report(self.report_type)
+    def _create_report(
+        self, report_type: str, site_filter: Optional[str], save_files: bool = True
+    ):
+        """Create the report instance of a report type and site filter."""
+        report_class = ReportRegistry.get_report(report_type)
 
         # Handle CVE report special case
-        if self.report_type == "cve" and not self.nvd_api_key:
-            raise ValueError("NVD_API_KEY environment variable is required for CVE reports")
-        
-        # Create report instance
-        report = report_class(
+        if report_type == "cve" and not self.nvd_api_key:
+            raise ValueError(
+                "NVD_API_KEY environment variable is required for CVE reports"
+            )
+
+        return report_class(
             self.ipf,
             snapshot_id=self.ipf.snapshot_id,
             snapshot_id_prev=self.snapshot_id_prev,
-            site_filter=self.site_filter,
+            site_filter=site_filter,
             inventory_filter=self.inventory_filter,
             nvd_api_key=self.nvd_api_key,
             export_dir=self.export_dir,
+            workers=self.workers,
+            shard_by=self.shard_by,
+            incremental=self.incremental,
+            cache_dir=self.cache_dir,
+            trend_snapshots=self.trend_snapshots,
+            trend_days=self.trend_days,
+            history_db=self.history_db,
+            render_budget=self.render_budget,
+            save_files=save_files,
+        )
+
+    @staticmethod
+    def _collect_data(report) -> Dict[str, Any]:
+        """Collect the data of a report and record its metrics, without writing any export."""
+        logger.info(
+            f"Collecting data for {report.get_report_details().get('name')} report..."
         )
+        report_data = report.collect_data()
+        report.record_metrics(report_data)
+        return report_data
+
+    def _collect_report(self, report) -> Dict[str, Any]:
+        """Collect the data of a report, record its metrics and write its tabular exports."""
+        report_data = self._collect_data(report)
+
+        # Write the large tables of the report (e.g. trunk mismatch) to XLSX/CSV/Parquet
+        if report_data.get("tabular_exports"):
+            self.renderer.render_tabular_report(
+                report_data=report_data, tabular_format=self.tabular_format
+            )
+        return report_data
+
+    def generate_report(self) -> None:
+        """Generate the report based on configured settings."""
+        report = self._create_report(self.report_type, self.site_filter)
 
         # Collect data and render reports
         try:
-            logger.info(
-                f"Collecting data for {report_class.get_report_details().get('name')} report..."
-            )
-            report_data = report.collect_data()
+            report_data = self._collect_report(report)
             template_name = f"{self.report_type}_template.html"
-
-            # Handle special case for trunk mismatch reports
-            if self.report_type == "trunk-mismatch":
-                self.renderer.render_xlsx_report(report_data=report_data)
             self.renderer.render_pdf_report(template_name, report_data, self.css_path)
 
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
             raise
 
+    def generate_artifacts(
+        self,
+        formats: Optional[List[str]] = None,
+        as_stream: bool = False,
+    ) -> Dict[str, Union[bytes, BinaryIO]]:
+        """
+        Generate the report in memory, without writing to the export directory.
+
+        The artifacts can be returned by a web service as they are. The metrics
+        history is still written to `history_db`, and the caches of the report are
+        only used when `cache_dir` is set.
+
+        Args:
+            formats: Artifacts to generate, among 'pdf', 'html' and the tabular formats
+                ('xlsx', 'csv', 'parquet'), defaults to the PDF and the configured
+                tabular format. The CSV files of the report (e.g. the CVE details) are
+                always included.
+            as_stream: Return binary file objects, positioned at their start, instead
+                of bytes
+
+        Returns:
+            Content of the artifacts, keyed by file name.
+        """
+        formats = list(formats or ["pdf", self.tabular_format])
+        available_formats = ["pdf", "html", *TABULAR_FORMATS]
+        unknown_formats = [fmt for fmt in formats if fmt not in available_formats]
+        if unknown_formats:
+            raise ValueError(
+                f"Invalid artifact format(s): {', '.join(unknown_formats)}. "
+                f"Available formats: {', '.join(available_formats)}"
+            )
+
+        report = self._create_report(
+            self.report_type, self.site_filter, save_files=False
+        )
+        report_data = self._collect_data(report)
+
+        artifacts: Dict[str, bytes] = {}
+        template_name = f"{self.report_type}_template.html"
+        base_filename = self.renderer.base_filename(report_data)
+        if "pdf" in formats:
+            artifacts[f"{base_filename}.pdf"] = self.renderer.render_pdf_bytes(
+                template_name, report_data, self.css_path
+            )
+        if "html" in formats:
+            artifacts[f"{base_filename}.html"] = "".join(
+                self.renderer.stream_html(template_name, report_data)
+            ).encode("utf-8")
+        if report_data.get("tabular_exports"):
+            for tabular_format in TABULAR_FORMATS:
+                if tabular_format in formats:
+                    artifacts.update(
+                        self.renderer.render_tabular_bytes(report_data, tabular_format)
+                    )
+        for filename, df in report.csv_exports.items():
+            artifacts[filename] = df.to_csv(index=False).encode("utf-8")
+
+        if as_stream:
+            return {filename: io.BytesIO(data) for filename, data in artifacts.items()}
+        return artifacts
+
+    def generate_reports(
+        self,
+        report_types: Optional[List[str]] = None,
+        sites: Optional[List[Optional[str]]] = None,
+        render_workers: Optional[int] = None,
+    ) -> List[Path]:
+        """
+        Generate a batch of reports, one per report type and site.
+
+        The data of the reports is collected one report at a time, while the PDF of
+        the reports already collected are rendered in parallel by a pool of processes.
+
+        Args:
+            report_types: Report types to generate, defaults to the configured type
+            sites: Site filters, None for the whole network, defaults to the configured
+                site filter
+            render_workers: Number of rendering processes, defaults to the configured
+                number or the number of CPUs
+
+        Returns:
+            Paths of the PDF files generated.
+
+        Raises:
+            RuntimeError: If some reports failed, after the other ones are generated.
+        """
+        report_types = list(dict.fromkeys(report_types or [self.report_type]))
+        sites = list(dict.fromkeys(sites or [self.site_filter]))
+        available_reports = ReportRegistry.list_reports()
+        unknown_types = [
+            report_type
+            for report_type in report_types
+            if report_type not in available_reports
+        ]
+        if unknown_types:
+            raise ValueError(
+                f"Invalid report type(s): {', '.join(unknown_types)}. "
+                f"Available types: {', '.join(available_reports.keys())}"
+            )
+        named_sites = [site for site in sites if site]
+        if named_sites:
+            self.validate_sites(named_sites)
+
+        jobs = [(report_type, site) for report_type in report_types for site in sites]
+        workers = min(
+            render_workers or self.render_workers or os.cpu_count() or 1, len(jobs)
+        )
+        failures, futures = [], {}
+        from .report_renderer import RenderPool
+
+        with RenderPool(self.renderer, workers=workers) as pool:
+            for report_type, site in jobs:
+                try:
+                    report = self._create_report(report_type, site)
+                    report_data = self._collect_report(report)
+                    futures[(report_type, site)] = pool.submit(
+                        f"{report_type}_template.html", report_data, self.css_path
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error generating {report_type} report for site {site or 'all'}: {str(e)}"
+                    )
+                    failures.append((report_type, site))
+
+            pdf_paths = []
+            for (report_type, site), future in futures.items():
+                try:
+                    pdf_paths.append(future.result())
+                except Exception as e:
+                    logger.error(
+                        f"Error rendering {report_type} report for site {site or 'all'}: {str(e)}"
+                    )
+                    failures.append((report_type, site))
+
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} of {len(jobs)} report(s) failed: "
+                + ", ".join(
+                    f"{report_type} ({site or 'all'})" for report_type, site in failures
+                )
+            )
+        return pdf_paths
+
 
 def main():
     generator = IPFabricReportGenerator()
@@ -9,13 +9,13 @@ are used across different report types.
 Functions:
     count_unique_occurrences: Count unique items in a dataset
     get_distribution_ratio: Calculate distribution percentages
-    plot_pie_chart: Generate pie charts for data visualization
-
-Visualization Features:
-    - Pie chart generation with customizable colors
-    - Base64 encoding for embedded images
-    - Matplotlib figure configuration
-    - Custom color schemes from ReportStyleConfig
+    connected_components: Group nodes of an undirected graph with union-find
+    component_labels: Vectorised connected components of an integer-indexed graph
+    vlan_mask: Convert a VLAN string into a bitmask
+    pack_shards: Balance weighted shards into a fixed number of bins
+    resolve_snapshot_id: Resolve a snapshot reference such as '$last' to its ID
+    row_fingerprints: Hash every row of a DataFrame to detect changes between runs
+    GroupTotals: Running per-group sums of count columns, fed one chunk at a time
 
 Data Processing Features:
     - Distribution calculations
@@ -26,21 +26,18 @@ Data Processing Features:
 Usage:
     These utilities are used internally by report types for:
     - Data analysis and transformation
-    - Chart generation
     - Distribution calculations
-    - Visual report enhancement
 """
 
 # Standard library imports
-import base64
-import io
+import heapq
+import itertools
 import json
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
 # Third-party imports
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from loguru import logger
 
 MAX_VLANS = 4094
@@ -105,50 +102,6 @@ def load_chart_colors(json_file_path):
         )
 
 
-def plot_pie_chart(data: dict) -> str:
-    """
-    Create a pie chart from the data and return the image as a base64 encoded string.
-
-    :param data: A dictionary containing the data to plot
-    :return: A base64 encoded string representing the image of the pie chart
-    """
-    json_file_path = os.path.join('ipfabric_reports', 'styles', 'themes', 'chart_colors.json')
-
-    if not os.path.exists(json_file_path):
-        raise FileNotFoundError(f"Chart color file not found at {json_file_path}")
-
-    colors = load_chart_colors(json_file_path)
-
-    # Create a new figure with a smaller size
-    plt.figure(figsize=(6, 4))
-
-    # Create the pie chart
-    wedges, texts, autotexts = plt.pie(
-        data.values(),
-        labels=data.keys(),
-        autopct="%1.1f%%",
-        colors=colors,
-        textprops={"fontsize": 8},
-    )
-
-    # Enhance the appearance
-    plt.setp(autotexts, fontsize=8, weight="bold")
-    plt.setp(texts, fontsize=8)
-
-    # Save the plot to a bytes buffer
-    buf = io.BytesIO()
-    plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-    plt.close()
-
-    # Encode the bytes buffer to base64
-    img_base64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-
-    # Create the data URI for the image
-    img_data = f"data:image/png;base64,{img_base64}"
-
-    return img_data
-
-
 def cleanup_connectivity_matrix(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove duplicate rows from a DataFrame, taking into account the symmetry condition.
@@ -164,33 +117,24 @@ def cleanup_connectivity_matrix(df: pd.DataFrame) -> pd.DataFrame:
     """
 
     # Create frozensets for local and remote connections
-    df["local_set"] = df.apply(
-        lambda row: frozenset([row["localSn"], row["localHost"], row["localInt"], row["protocol"]]),
-        axis=1,
-    )
-    df["remote_set"] = df.apply(
-        lambda row: frozenset(
-            [
-                row["remoteSn"],
-                row["remoteHost"],
-                row["remoteInt"],
-                row["protocol"],
-            ]
-        ),
-        axis=1,
-    )
+    local_sets = [
+        frozenset(end)
+        for end in zip(df["localSn"], df["localHost"], df["localInt"], df["protocol"])
+    ]
+    remote_sets = [
+        frozenset(end)
+        for end in zip(
+            df["remoteSn"], df["remoteHost"], df["remoteInt"], df["protocol"]
+        )
+    ]
 
     # Create a combined set for symmetry check
-    df["combined_set"] = df.apply(
-        lambda row: frozenset([row["local_set"], row["remote_set"]]),
-        axis=1,
+    combined_sets = pd.Series(
+        [frozenset(ends) for ends in zip(local_sets, remote_sets)], index=df.index
     )
 
-    # Identify duplicates for removal, but keep the first occurrence!!!!!
-    df["is_duplicate"] = df.duplicated(subset="combined_set", keep="first")
-
     # Keep only the first occurrence of each unique connection
-    return df[~df["is_duplicate"]].drop(["local_set", "remote_set", "combined_set", "is_duplicate"], axis=1)
+    return df[~combined_sets.duplicated(keep="first")]
 
 
 def format_vlans(vlan_list: list) -> str:
@@ -320,3 +264,252 @@ def parse_vlans(vlan_string: str) -> list:
                 raise ValueError(f"VLAN out of valid range: {vlan}")
             vlans.append(vlan)
     return vlans
+
+
+def connected_components(
+    edges: Iterable[Tuple[Hashable, Hashable]]
+) -> Dict[Hashable, Hashable]:
+    """
+    Find the connected components of an undirected graph using union-find.
+
+    Args:
+        edges: Iterable of (node, node) pairs. Nodes only need to be hashable.
+
+    Returns:
+        Dictionary mapping every node seen in `edges` to the representative
+        node of its component. Two nodes are connected if and only if they
+        map to the same representative.
+
+    Example:
+        >>> components = connected_components([("a", "b"), ("b", "c"), ("x", "y")])
+        >>> components["a"] == components["c"], components["a"] == components["x"]
+        (True, False)
+    """
+    parent: Dict[Hashable, Hashable] = {}
+
+    def find(node):
+        # Path halving keeps the trees flat without recursion
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for node_a, node_b in edges:
+        parent.setdefault(node_a, node_a)
+        parent.setdefault(node_b, node_b)
+        root_a, root_b = find(node_a), find(node_b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    return {node: find(node) for node in parent}
+
+
+def component_labels(
+    node_count: int, sources: np.ndarray, targets: np.ndarray
+) -> np.ndarray:
+    """
+    Label the connected components of an undirected graph whose nodes are 0..node_count-1.
+
+    Vectorised equivalent of `connected_components` for large graphs: every round hooks
+    the root of each edge end onto the smaller of the two roots, then flattens the trees
+    by pointer jumping. It needs a handful of rounds even on graphs with 100k edges.
+
+    Args:
+        node_count: Number of nodes
+        sources: Array of the first node of every edge
+        targets: Array of the second node of every edge
+
+    Returns:
+        Array of length node_count, the label of a node is the smallest node of its component.
+    """
+    labels = np.arange(node_count)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    while True:
+        source_roots, target_roots = labels[sources], labels[targets]
+        lowest = np.minimum(source_roots, target_roots)
+        hooked = labels.copy()
+        np.minimum.at(hooked, source_roots, lowest)
+        np.minimum.at(hooked, target_roots, lowest)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, labels):
+            return labels
+        labels = hooked
+
+
+def vlan_mask(vlan_string: str) -> int:
+    """
+    Convert a VLAN string (e.g. "1,10-20") into a bitmask, bit N is set when VLAN N is present.
+
+    Args:
+        vlan_string: The VLAN string, as accepted by `parse_vlans`
+
+    Returns:
+        The bitmask as an integer.
+    """
+    mask = 0
+    for vlan in parse_vlans(vlan_string):
+        mask |= 1 << vlan
+    return mask
+
+
+def pack_shards(shard_sizes: Dict[Hashable, int], bins: int) -> List[List[Hashable]]:
+    """
+    Distribute weighted shards over a fixed number of bins, largest first.
+
+    The greedy "longest processing time" assignment keeps the bins within a
+    small factor of each other, so a pool of `bins` workers finishes at
+    roughly the same time. Ties are broken on the shard key, which keeps the
+    result deterministic between runs.
+
+    Args:
+        shard_sizes: Mapping of shard key to its weight (e.g. number of rows)
+        bins: Number of bins to fill
+
+    Returns:
+        List of non-empty bins, each a list of shard keys.
+    """
+    bins = max(1, min(bins, len(shard_sizes)))
+    heap = [(0, index) for index in range(bins)]
+    packed: List[List[Hashable]] = [[] for _ in range(bins)]
+
+    ordered = sorted(shard_sizes.items(), key=lambda item: (-item[1], str(item[0])))
+    for key, size in ordered:
+        load, index = heapq.heappop(heap)
+        packed[index].append(key)
+        heapq.heappush(heap, (load + size, index))
+
+    return [shard for shard in packed if shard]
+
+
+def resolve_snapshot_id(ipf, snapshot_id: Optional[str]) -> Optional[str]:
+    """
+    Resolve a snapshot reference ('$last', '$prev', '$lastLocked' or an ID) to the snapshot ID.
+
+    Args:
+        ipf: IPFClient instance
+        snapshot_id: Snapshot reference, None means '$last'
+
+    Returns:
+        The snapshot ID, or the reference unchanged if it can't be resolved.
+    """
+    try:
+        return ipf.get_snapshot_id(snapshot_id or "$last")
+    except Exception as e:
+        logger.warning(f"Unable to resolve snapshot '{snapshot_id}': {str(e)}")
+        return snapshot_id
+
+
+def row_fingerprints(df: pd.DataFrame, columns: List[str] = None) -> pd.Series:
+    """
+    Hash every row of a DataFrame.
+
+    The hash only depends on the values of the row, not on the index nor on the order
+    of the columns, and is the same from one process to another, so it can be stored
+    and compared with the hash of the same row in a later run.
+
+    Args:
+        df: DataFrame to hash
+        columns: Columns to include in the hash, defaults to all the columns
+
+    Returns:
+        Series of uint64 aligned with the DataFrame.
+    """
+    subset = df[sorted(columns or df.columns)]
+    try:
+        return pd.util.hash_pandas_object(subset, index=False)
+    except TypeError:
+        # Unhashable values (lists, dicts) are hashed on their text representation
+        return pd.util.hash_pandas_object(subset.astype(str), index=False)
+
+
+class GroupTotals:
+    """
+    Running totals of count columns per group, fed one chunk at a time.
+
+    Only one row per group is kept, so the memory used depends on the number of
+    groups, not on the number of rows added. Groups keep the order in which they
+    are first added.
+
+    Args:
+        key_columns: Columns identifying a group
+        count_columns: Columns summed per group
+        first_columns: Columns whose value is taken from the first row of the group
+    """
+
+    def __init__(
+        self,
+        key_columns: List[str],
+        count_columns: List[str],
+        first_columns: Optional[List[str]] = None,
+    ):
+        self.key_columns = list(key_columns)
+        self.count_columns = list(count_columns)
+        self.first_columns = list(first_columns or [])
+        self._positions: Dict[Tuple, int] = {}
+        self._keys: List[Tuple] = []
+        self._firsts: List[Tuple] = []
+        self._totals = np.zeros((1024, len(self.count_columns)), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        """
+        Add the counts of a chunk to the totals.
+
+        Args:
+            chunk: DataFrame with the key, count and first columns. A group may appear
+                on several rows, pre-aggregating the chunk makes this faster.
+        """
+        positions = np.empty(len(chunk), dtype=np.int64)
+        # Missing values are all stored as None, NaN never matches itself as a key
+        keys = zip(
+            *(
+                chunk[column].astype(object).where(chunk[column].notna(), None).tolist()
+                for column in self.key_columns
+            )
+        )
+        firsts = zip(*(chunk[column].tolist() for column in self.first_columns))
+        for row, (key, first) in enumerate(itertools.zip_longest(keys, firsts)):
+            position = self._positions.get(key)
+            if position is None:
+                position = self._positions[key] = len(self._keys)
+                self._keys.append(key)
+                self._firsts.append(first or ())
+            positions[row] = position
+
+        if len(self._keys) > len(self._totals):
+            grown = np.zeros(
+                (max(len(self._keys), 2 * len(self._totals)), len(self.count_columns)),
+                dtype=np.int64,
+            )
+            grown[: len(self._totals)] = self._totals
+            self._totals = grown
+        np.add.at(
+            self._totals, positions, chunk[self.count_columns].to_numpy(dtype=np.int64)
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the totals.
+
+        Returns:
+            DataFrame with the key, first and count columns, one row per group.
+        """
+        frame = pd.DataFrame(
+            self._totals[: len(self._keys)], columns=self.count_columns
+        )
+        labels = self.key_columns + self.first_columns
+        values = [key + first for key, first in zip(self._keys, self._firsts)]
+        for position, column in enumerate(labels):
+            frame.insert(
+                position,
+                column,
+                pd.Series([value[position] for value in values], dtype=object),
+            )
+        return frame
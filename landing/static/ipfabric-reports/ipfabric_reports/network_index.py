@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - Network Index Module.
+
+This module provides a longest-prefix match index over a list of networks, used
+to attribute IP addresses to the managed network (and its site and VLAN) they
+belong to.
+
+Main Components:
+    - NetworkIntervalIndex: Sorted interval index over IPv4/IPv6 networks
+
+Each network is stored as the integer interval [first address, last address].
+The intervals are sorted by start address, widest first, and every network keeps
+a pointer to the closest network containing it. A lookup is a binary search for
+the last interval starting at or before the address, followed by a walk up the
+containing networks until one contains the address: O(log m) plus the nesting
+depth, instead of testing the m networks one by one.
+"""
+
+# Standard library imports
+from bisect import bisect_right
+import ipaddress
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class NetworkIntervalIndex:
+    """
+    Longest-prefix match index over IPv4 and IPv6 networks.
+
+    Args:
+        networks: Iterable of (network, payload) pairs. The network is a string such as
+            '10.0.0.0/24', invalid networks are ignored. When the same network is given
+            more than once, the first payload is kept.
+    """
+
+    def __init__(self, networks: Iterable[Tuple[str, Any]]):
+        by_version: Dict[int, Dict[Tuple[int, int], Any]] = {4: {}, 6: {}}
+        for network, payload in networks:
+            try:
+                parsed = ipaddress.ip_network(str(network).strip(), strict=False)
+            except ValueError:
+                continue
+            interval = (int(parsed.network_address), int(parsed.broadcast_address))
+            by_version[parsed.version].setdefault(interval, (parsed, payload))
+
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        self._parents: Dict[int, List[int]] = {}
+        self._entries: Dict[int, List[Tuple[Any, Any]]] = {}
+        for version, intervals in by_version.items():
+            # Widest first for the same start, so a network comes after the ones containing it
+            ordered = sorted(
+                intervals.items(), key=lambda item: (item[0][0], -item[0][1])
+            )
+            starts, ends, parents, stack = [], [], [], []
+            for position, ((start, end), _) in enumerate(ordered):
+                while stack and ends[stack[-1]] < start:
+                    stack.pop()
+                parents.append(stack[-1] if stack else -1)
+                starts.append(start)
+                ends.append(end)
+                stack.append(position)
+            self._starts[version] = starts
+            self._ends[version] = ends
+            self._parents[version] = parents
+            self._entries[version] = [entry for _, entry in ordered]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def lookup(self, ip: Any) -> Optional[Tuple[str, Any]]:
+        """
+        Find the most specific network containing an IP address.
+
+        Args:
+            ip: IPv4 or IPv6 address, as a string or an ipaddress object
+
+        Returns:
+            Tuple of the network (in CIDR notation) and its payload, or None if the address
+            is invalid or not in any network.
+        """
+        try:
+            address = ipaddress.ip_address(str(ip).strip())
+        except ValueError:
+            return None
+        value, version = int(address), address.version
+
+        position = bisect_right(self._starts[version], value) - 1
+        ends, parents = self._ends[version], self._parents[version]
+        while position >= 0 and ends[position] < value:
+            position = parents[position]
+        if position < 0:
+            return None
+        network, payload = self._entries[version][position]
+        return network.with_prefixlen, payload
+
+    def lookup_many(self, ips: Iterable[Any]) -> List[Optional[Tuple[str, Any]]]:
+        """Find the most specific network of every IP address, see `lookup`."""
+        cache: Dict[Any, Optional[Tuple[str, Any]]] = {}
+        results = []
+        for ip in ips:
+            if ip not in cache:
+                cache[ip] = self.lookup(ip)
+            results.append(cache[ip])
+        return results
@@ -8,6 +8,8 @@ for registering report types and their corresponding configurations.
 
 Key Features:
     - Dynamic report type registration
+    - Report details available without importing the report classes, which are
+      imported (with pandas, the IP Fabric SDK, ...) the first time they are used
     - Report type validation
     - Configuration mapping
     - Report class lookup functionality
@@ -16,8 +18,10 @@ Key Features:
 Available Reports:
     - Management Protocol Report: Network management protocols analysis
     - Port Capacity Report: Network port utilization analysis
+    - Port Capacity Compare Report: Port capacity growth between two snapshots
     - Overview Report: Network infrastructure overview
     - Overview Compare Report: Snapshot comparison analysis
+    - Overview Trend Report: Overview metrics trend over several snapshots
     - Discovery Report: Network discovery status
     - CVE Report: Security vulnerability analysis
     - Trunk Mismatch Report: VLAN trunking analysis
@@ -35,49 +39,76 @@ Note:
 """
 
 # Standard library imports
-from typing import Dict, Type
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
 
 # Local imports
 from .config import (
+    ConfigBase,
     CVEReportConfig,
     DiscoveryReportConfig,
     ManagementProtocolConfig,
     OverviewCompareReportConfig,
     OverviewReportConfig,
+    OverviewTrendReportConfig,
+    PortCapacityCompareReportConfig,
     PortCapacityReportConfig,
     TrunkMismatchConfig,
 )
-from .report_types import (
-    BaseReport,
-    CVEReport,
-    DiscoveryReport,
-    ManagementProtocolReport,
-    OverviewCompareReport,
-    OverviewReport,
-    PortCapacityReport,
-    TrunkMismatchReport,
-)
+
+if TYPE_CHECKING:
+    from .report_types import BaseReport
 
 
 class ReportRegistry:
-    _reports: Dict[str, Type[BaseReport]] = {}
+    _reports: Dict[str, Union[Type["BaseReport"], str]] = {}
+    _configs: Dict[str, Type[ConfigBase]] = {}
 
     @classmethod
-    def register(cls, report_type: str, report_class: Type[BaseReport]):
+    def register(
+        cls,
+        report_type: str,
+        report_class: Union[Type["BaseReport"], str],
+        config_class: Optional[Type[ConfigBase]] = None,
+    ):
+        """
+        Register a report type.
+
+        Args:
+            report_type: Type of the report, e.g. 'overview'
+            report_class: Report class, or its 'module:ClassName' path, imported the
+                first time the report is used
+            config_class: Configuration of the report, giving its details without
+                importing the report class
+        """
         cls._reports[report_type] = report_class
+        if config_class is not None:
+            cls._configs[report_type] = config_class
 
     @classmethod
-    def get_report(cls, report_type: str) -> Type[BaseReport]:
+    def get_report(cls, report_type: str) -> Type["BaseReport"]:
         if report_type not in cls._reports:
             raise ValueError(f"Unknown report type: {report_type}")
-        return cls._reports[report_type]
+        report_class = cls._reports[report_type]
+        if isinstance(report_class, str):
+            module_name, class_name = report_class.split(":")
+            module = importlib.import_module(module_name, __package__)
+            report_class = cls._reports[report_type] = getattr(module, class_name)
+        return report_class
+
+    @classmethod
+    def get_report_details(cls, report_type: str) -> Dict[str, Any]:
+        """Return the details of a report type, from its configuration when registered."""
+        if report_type in cls._configs:
+            return cls._configs[report_type].get_report_details()
+        return cls.get_report(report_type).get_report_details()
 
     @classmethod
     def list_reports(cls):
         reports = {}
-        for report_type, report_class in cls._reports.items():
+        for report_type in cls._reports:
             try:
-                description = report_class.get_report_details().get(
+                description = cls.get_report_details(report_type).get(
                     "description", "Description unavailable"
                 )
                 reports[report_type] = description
@@ -87,11 +118,47 @@ class ReportRegistry:
         return reports
 
 
-# Register all report types
-ReportRegistry.register(CVEReportConfig.REPORT_TYPE, CVEReport)
-ReportRegistry.register(DiscoveryReportConfig.REPORT_TYPE, DiscoveryReport)
-ReportRegistry.register(ManagementProtocolConfig.REPORT_TYPE, ManagementProtocolReport)
-ReportRegistry.register(OverviewReportConfig.REPORT_TYPE, OverviewReport)
-ReportRegistry.register(OverviewCompareReportConfig.REPORT_TYPE, OverviewCompareReport)
-ReportRegistry.register(PortCapacityReportConfig.REPORT_TYPE, PortCapacityReport)
-ReportRegistry.register(TrunkMismatchConfig.REPORT_TYPE, TrunkMismatchReport)
+# Register all report types, the report classes are imported when first used
+ReportRegistry.register(
+    CVEReportConfig.REPORT_TYPE, ".report_types:CVEReport", CVEReportConfig
+)
+ReportRegistry.register(
+    DiscoveryReportConfig.REPORT_TYPE,
+    ".report_types:DiscoveryReport",
+    DiscoveryReportConfig,
+)
+ReportRegistry.register(
+    ManagementProtocolConfig.REPORT_TYPE,
+    ".report_types:ManagementProtocolReport",
+    ManagementProtocolConfig,
+)
+ReportRegistry.register(
+    OverviewReportConfig.REPORT_TYPE,
+    ".report_types:OverviewReport",
+    OverviewReportConfig,
+)
+ReportRegistry.register(
+    OverviewCompareReportConfig.REPORT_TYPE,
+    ".report_types:OverviewCompareReport",
+    OverviewCompareReportConfig,
+)
+ReportRegistry.register(
+    OverviewTrendReportConfig.REPORT_TYPE,
+    ".report_types:OverviewTrendReport",
+    OverviewTrendReportConfig,
+)
+ReportRegistry.register(
+    PortCapacityReportConfig.REPORT_TYPE,
+    ".report_types:PortCapacityReport",
+    PortCapacityReportConfig,
+)
+ReportRegistry.register(
+    PortCapacityCompareReportConfig.REPORT_TYPE,
+    ".report_types:PortCapacityCompareReport",
+    PortCapacityCompareReportConfig,
+)
+ReportRegistry.register(
+    TrunkMismatchConfig.REPORT_TYPE,
+    ".report_types:TrunkMismatchReport",
+    TrunkMismatchConfig,
+)
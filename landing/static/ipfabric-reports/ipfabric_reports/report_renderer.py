@@ -3,28 +3,117 @@
 Report Renderer Module.
 
 This module contains the ReportRenderer class that is responsible for
-rendering the HTML and PDF reports using Jinja2 templates and WeasyPrint.
+rendering the HTML and PDF reports using Jinja2 templates and WeasyPrint,
+and for writing the tabular exports of the reports (XLSX, CSV or Parquet).
+
+The Jinja2 environment of a template directory is shared by every renderer of the
+process and keeps the compiled templates in a bytecode cache, so the templates
+are parsed once. It is never modified after its creation, which makes it safe to
+share between threads: per render values are passed in the render context.
+
+WeasyPrint lays out a document on a single core, so RenderPool renders several
+reports at the same time in worker processes, each loading WeasyPrint and the
+fonts once.
+
+The layout time and memory of WeasyPrint grow faster than the size of the
+document, so the reports declaring a chunked section (`pdf_chunks` in the report
+data) are rendered in chunks of that section, in parallel when pypdf is
+installed to merge them, and merged into one PDF.
+
+The stylesheet of a style is parsed once per process, with its own font
+configuration, and reused by every document rendered with that style.
+
+The reports hand view models to the templates (see the views module), a template
+context holding a pandas object is refused before rendering.
+
+The HTML files are written piece by piece as the template generates them, and
+every artifact of a report can be rendered in memory instead of the output
+directory (`render_pdf_bytes`, `render_tabular_bytes`), e.g. to be streamed by a
+web service.
 """
 
 # Standard library imports
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+import hashlib
+import io
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+import re
+import threading
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 # Third-party imports
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from loguru import logger
+import openpyxl
 import pandas as pd
-from weasyprint import HTML, urls
+from weasyprint import CSS, HTML, urls
+from weasyprint.text.fonts import FontConfiguration
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+# Local imports
+from .config import TABULAR_FORMATS
+
+# Containers the templates must not receive, they are converted by the reports
+_PANDAS_TYPES = (pd.DataFrame, pd.Series, pd.Index)
+
+# Renderer of a render worker process, set once by _init_render_worker
+_RENDER_WORKER: Dict[str, "ReportRenderer"] = {}
+
+# Jinja2 environments shared by the renderers, keyed by template directory
+_TEMPLATE_ENVIRONMENTS: Dict[str, Environment] = {}
+_TEMPLATE_ENVIRONMENTS_LOCK = threading.Lock()
+
+# Parsed stylesheets and their font configurations shared by the renderers, keyed
+# by style, least recently used first
+_STYLES: "OrderedDict[Tuple[str, str], Tuple[CSS, FontConfiguration]]" = OrderedDict()
+_STYLES_LOCK = threading.Lock()
+
+# @import rules of a stylesheet, looked for once its comments are removed
+_CSS_COMMENT = re.compile(rb"/\*.*?\*/", re.S)
+_CSS_IMPORT = re.compile(rb"""@import\s+(?:url\(\s*)?["']?([^"')\s;]+)""", re.I)
 
 
 class ReportRenderer:
+    TABULAR_FORMATS = TABULAR_FORMATS
+    # Excel sheet limit, header row included
+    EXCEL_MAX_ROWS = 1_048_576
+    # Rows converted at once when streaming a DataFrame to a workbook
+    CHUNK_ROWS = 50_000
+    # Directory of the compiled templates, None for a directory in the system temp dir
+    TEMPLATE_CACHE_DIR: Optional[str] = None
+    # Check the templates for changes on every render, only useful when editing them
+    TEMPLATE_AUTO_RELOAD = False
+    # Processes rendering the chunks of a chunked report, None for the number of CPUs
+    CHUNK_WORKERS: Optional[int] = None
+    # Directory the relative URLs of a stylesheet given as content resolve against
+    STYLES_DIR = Path(__file__).resolve().parent / "styles"
+    # Styles kept parsed by the process, uploaded stylesheets included
+    STYLE_CACHE_SIZE = 32
+
     def __init__(
         self,
         logo_path: str,
         template_dir: Path = "src/templates",
         output_dir: str = "export",
         generate_html: bool = False,
+        timestamp: Optional[str] = None,
     ):
         """
         Initialize the ReportRenderer.
@@ -33,25 +122,168 @@ class ReportRenderer:
             template_dir: Directory containing the templates
             output_dir: Directory where reports will be saved
             generate_html: Whether to generate HTML files alongside PDFs
+            timestamp: Timestamp of the file names, defaults to now
         """
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        self.template_dir = template_dir
+        self.logo_path = logo_path
+        self.env = self.template_environment(template_dir)
+        # Created when the first file is written, rendering in memory doesn't touch it
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
         self.generate_html = generate_html
         self.package_dir = Path(__file__).resolve().parent
-        self.env.globals["image_path"] = str(self.package_dir / logo_path)
-        self.timestamp = datetime.now().strftime("%Y-%m-%d_T%H-%M")
+        self.image_path = str(self.package_dir / logo_path)
+        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d_T%H-%M")
+        self.chunk_workers = self.CHUNK_WORKERS
+        # Pool rendering the chunks of the chunked reports, started by the first one
+        self._chunk_pool: Optional["RenderPool"] = None
+        self._chunk_pool_lock = threading.Lock()
 
-    def _render_html(self, template_name: str, context: Dict[str, Any]) -> str:
+    @classmethod
+    def template_environment(cls, template_dir: Union[str, Path]) -> Environment:
         """
-        Render HTML content from a template.
+        Return the Jinja2 environment of a template directory, shared by the process.
+
+        Args:
+            template_dir: Directory containing the templates
+
+        Returns:
+            The environment, created on first use with a bytecode cache.
+        """
+        key = str(Path(template_dir).resolve())
+        with _TEMPLATE_ENVIRONMENTS_LOCK:
+            env = _TEMPLATE_ENVIRONMENTS.get(key)
+            if env is None:
+                if cls.TEMPLATE_CACHE_DIR:
+                    Path(cls.TEMPLATE_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+                    bytecode_cache = FileSystemBytecodeCache(cls.TEMPLATE_CACHE_DIR)
+                else:
+                    bytecode_cache = FileSystemBytecodeCache()
+                env = Environment(
+                    loader=FileSystemLoader(key),
+                    bytecode_cache=bytecode_cache,
+                    auto_reload=cls.TEMPLATE_AUTO_RELOAD,
+                )
+                _TEMPLATE_ENVIRONMENTS[key] = env
+            return env
+
+    @classmethod
+    def style(cls, css: Union[str, Path, bytes]) -> Tuple[CSS, FontConfiguration]:
+        """
+        Return the parsed stylesheet of a style and its font configuration, shared by
+        the process.
+
+        WeasyPrint parses the stylesheet and its imports, and loads the fonts of its
+        @font-face rules, once per style instead of once per document. A style is
+        keyed by the hash of its content and of the local files it imports, so an
+        edited theme is parsed again.
+
+        Args:
+            css: Path to the CSS file, or the content of a stylesheet, whose relative
+                URLs resolve against the styles directory of the package
+
+        Returns:
+            The stylesheet, and the font configuration to render it with.
+        """
+        if isinstance(css, bytes):
+            key = ("", cls._style_digest(css, cls.STYLES_DIR))
+        else:
+            path = Path(css).resolve()
+            key = (str(path), cls._style_digest(path.read_bytes(), path.parent))
+
+        with _STYLES_LOCK:
+            style = _STYLES.get(key)
+            if style is not None:
+                _STYLES.move_to_end(key)
+                return style
+
+            font_config = FontConfiguration()
+            if isinstance(css, bytes):
+                stylesheet = CSS(
+                    string=css.decode("utf-8"),
+                    base_url=f"{cls.STYLES_DIR.as_uri()}/",
+                    font_config=font_config,
+                )
+            else:
+                stylesheet = CSS(filename=key[0], font_config=font_config)
+            style = _STYLES[key] = (stylesheet, font_config)
+            while len(_STYLES) > cls.STYLE_CACHE_SIZE:
+                _STYLES.popitem(last=False)
+            return style
+
+    @staticmethod
+    def _style_digest(content: bytes, base_dir: Path) -> str:
+        """
+        Hash a stylesheet together with the local stylesheets it imports, recursively.
+
+        Args:
+            content: Content of the stylesheet
+            base_dir: Directory its relative imports resolve against
+
+        Returns:
+            The SHA-256 hex digest.
+        """
+        digest = hashlib.sha256(content)
+        pending, seen = [(content, base_dir)], set()
+        while pending:
+            content, base_dir = pending.pop()
+            for url in _CSS_IMPORT.findall(_CSS_COMMENT.sub(b"", content)):
+                # Remote imports (http:, data:, ...) are not followed
+                if re.match(rb"^[a-z][a-z0-9+.-]*:", url, re.I):
+                    continue
+                path = (base_dir / url.decode("utf-8")).resolve()
+                if path in seen:
+                    continue
+                seen.add(path)
+                try:
+                    imported = path.read_bytes()
+                except OSError:
+                    imported = b""
+                digest.update(str(path).encode("utf-8") + b"\0" + imported)
+                pending.append((imported, path.parent))
+        return digest.hexdigest()
+
+    def worker_args(self) -> Dict[str, Any]:
+        """Return the arguments building the same renderer in a worker process."""
+        return {
+            "logo_path": self.logo_path,
+            "template_dir": str(self.template_dir),
+            "output_dir": str(self.output_dir),
+            "generate_html": self.generate_html,
+            "timestamp": self.timestamp,
+        }
+
+    @staticmethod
+    def _replace_atomically(path: Path, write) -> None:
+        """
+        Write a file next to its final location and rename it, so a reader never sees
+        a partial file.
+
+        Args:
+            path: Final path of the file
+            write: Function writing the file at the path it is given
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def stream_html(self, template_name: str, context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Render HTML content from a template, piece by piece.
+
+        The template is rendered with Jinja's `generate()`, so the whole document is
+        never held in memory when the pieces are written as they come.
 
         Args:
             template_name: Name of the template file
             context: Data to be rendered in the template
 
         Returns:
-            Rendered HTML content as a string
+            Iterator over the pieces of the rendered HTML content
         """
         # Ensure we have report_name in context for the footer
         if "report_name" not in context:
@@ -60,16 +292,67 @@ class ReportRenderer:
             )
 
         context["current_time"] = self.timestamp
+        context.setdefault("image_path", self.image_path)
+
+        # The tabular exports are written apart, they aren't rendered
+        context = {
+            key: value for key, value in context.items() if key != "tabular_exports"
+        }
+        self._check_context(template_name, context)
 
         template = self.env.get_template(template_name)
-        return template.render(context)
+        return template.generate(context)
+
+    @staticmethod
+    def _check_context(template_name: str, context: Dict[str, Any]) -> None:
+        """
+        Check that a template context holds no pandas object, at any depth.
+
+        Args:
+            template_name: Name of the template file
+            context: Data to be rendered in the template
 
-    def _save_html(self, html_content: str, filename: str) -> Optional[Path]:
+        Raises:
+            ValueError: If a value of the context is or holds a DataFrame, Series or
+                Index.
         """
-        Save HTML content to a file if HTML generation is enabled.
+        for key, value in context.items():
+            stack = [value]
+            while stack:
+                value = stack.pop()
+                if isinstance(value, _PANDAS_TYPES):
+                    raise ValueError(
+                        f"The context of {template_name} holds a pandas "
+                        f"{type(value).__name__} in '{key}', convert it to view "
+                        "models in the report"
+                    )
+                if isinstance(value, dict):
+                    stack.extend(value.values())
+                elif isinstance(value, (list, tuple, set, frozenset)):
+                    stack.extend(value)
+
+    def _render_html(self, template_name: str, context: Dict[str, Any]) -> str:
+        """
+        Render HTML content from a template.
+
+        Args:
+            template_name: Name of the template file
+            context: Data to be rendered in the template
+
+        Returns:
+            Rendered HTML content as a string
+        """
+        return "".join(self.stream_html(template_name, context))
+
+    def _save_html(
+        self, template_name: str, context: Dict[str, Any], filename: str
+    ) -> Optional[Path]:
+        """
+        Stream the HTML content of a report to a file if HTML generation is enabled.
 
         Args:
-            html_content: HTML content to save
+            template_name: Name of the template file
+            context: Data to be rendered in the template
             filename: Name of the file to save
 
         Returns:
@@ -78,53 +361,263 @@ class ReportRenderer:
         if not self.generate_html:
             return None
 
+        def _write(path: Path) -> None:
+            with open(path, "w", encoding="utf-8") as f:
+                for piece in self.stream_html(template_name, context):
+                    f.write(piece)
+
         file_path = self.output_dir / filename
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-            logger.success(f"✔ Saving HTML file to: {file_path}")
+        self._replace_atomically(file_path, _write)
+        logger.success(f"✔ Saving HTML file to: {file_path}")
+        return file_path
+
+    def base_filename(self, report_data: Dict[str, Any]) -> str:
+        """Return the file name of the artifacts of a report, without extension."""
+        report_type_str = report_data.get("report_details").get("type")
+        # Add site filter to filename if present
+        if report_data.get("site_filter"):
+            report_type_str = f"{report_type_str}-{report_data['site_filter']}"
+        return f"{report_type_str}_{self.timestamp}"
+
+    def write_pdf(
+        self,
+        template_name: str,
+        report_data: Dict[str, Any],
+        css_path: Union[str, Path, bytes],
+        target: Union[str, Path, BinaryIO],
+    ) -> None:
+        """
+        Render a report to PDF, in chunks if the report declares a chunked section.
 
-    def _save_pdf(self, html_content: str, css_path: Path, filename: str) -> None:
+        Args:
+            template_name: Name of the template file
+            report_data: Data to be rendered in the report
+            css_path: Path to the CSS file, or the content of a stylesheet
+            target: Path of the PDF file, or binary file object the PDF is written to
         """
-        Write a PDF from HTML content.
+        chunks = self._chunk_contexts(report_data)
+        if chunks is not None:
+            self._write_chunked_pdf(template_name, chunks, css_path, target)
+            return
+
+        html_content = self._render_html(template_name, report_data)
+        stylesheet, font_config = self.style(css_path)
+        HTML(string=html_content).write_pdf(
+            target, stylesheets=[stylesheet], font_config=font_config
+        )
+
+    def render_pdf_bytes(
+        self,
+        template_name: str,
+        report_data: Dict[str, Any],
+        css_path: Union[str, Path, bytes],
+    ) -> bytes:
         """
-        pdf_path = self.output_dir / filename
-        HTML(string=html_content).write_pdf(pdf_path, stylesheets=[css_path])
-        logger.success(f"✔ Saving PDF file to: {pdf_path}")
+        Render a report to PDF in memory, without writing to the output directory.
+
+        Args:
+            template_name: Name of the template file
+            report_data: Data to be rendered in the report
+            css_path: Path to the CSS file, or the content of a stylesheet
+
+        Returns:
+            Content of the PDF file.
+        """
+        buffer = io.BytesIO()
+        self.write_pdf(template_name, report_data, css_path, buffer)
+        return buffer.getvalue()
 
     def render_pdf_report(
         self,
         template_name: str,
         report_data: Dict[str, Any],
-        css_path: Path,
+        css_path: Union[str, Path, bytes],
         save_html: bool = False,
-    ) -> None:
+    ) -> Path:
         """
         Render a report to PDF (and optionally HTML).
 
         Args:
             template_name: Name of the template file
             report_data: Data to be rendered in the report
-            css_path: Path to the CSS file
+            css_path: Path to the CSS file, or the content of a stylesheet
             save_html: Whether to save the HTML file
 
         Returns:
-            nothing
+            Path of the PDF file.
         """
-        report_type_str = report_data.get("report_details").get("type")
-        # Add site filter to filename if present
-        if report_data.get("site_filter"):
-            report_type_str = f"{report_type_str}-{report_data['site_filter']}"
+        base_filename = self.base_filename(report_data)
+        pdf_path = self.output_dir / f"{base_filename}.pdf"
 
-        # Render HTML template with data
-        html_content = self._render_html(template_name, report_data)
-        base_filename = f"{report_type_str}_{self.timestamp}"
+        # Save HTML file if enabled, and lay the PDF out from it
+        html_path = (
+            self._save_html(template_name, report_data, f"{base_filename}.html")
+            if save_html
+            else None
+        )
+        if html_path is not None:
+            stylesheet, font_config = self.style(css_path)
+            self._replace_atomically(
+                pdf_path,
+                lambda path: HTML(filename=str(html_path)).write_pdf(
+                    path, stylesheets=[stylesheet], font_config=font_config
+                ),
+            )
+        else:
+            self._replace_atomically(
+                pdf_path,
+                lambda path: self.write_pdf(template_name, report_data, css_path, path),
+            )
+        logger.success(f"✔ Saving PDF file to: {pdf_path}")
+        return pdf_path
 
-        # Save HTML file if enabled
-        if save_html:
-            self._save_html(html_content, f"{base_filename}.html")
+    @staticmethod
+    def _chunk_contexts(report_data: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Split the chunked section of a report into the contexts of its chunks.
 
-        # Create PDF
-        self._save_pdf(html_content, css_path, f"{base_filename}.pdf")
+        The report declares the section in `report_data["pdf_chunks"]`: the `key` of the
+        rows in the report data, the number of `rows` per chunk, and optionally the
+        `weight` field of a row, e.g. the list of CVEs of an OS version. Every chunk gets
+        the report data with its slice of the rows, and a `pdf_chunk` dictionary
+        telling the template which chunk it renders (index, count, first, last, start,
+        total), so the sections before the chunked one are only rendered in the first
+        chunk and the ones after it in the last chunk.
+
+        Args:
+            report_data: Data of the report
+
+        Returns:
+            The contexts of the chunks, or None if the report isn't chunked or fits in
+            a single chunk.
+        """
+        spec = report_data.get("pdf_chunks")
+        if not spec or report_data.get(spec["key"]) is None:
+            return None
+        rows = report_data[spec["key"]]
+        weight = spec.get("weight")
+
+        if weight:
+            bounds, start, size = [], 0, 0
+            for position, row in enumerate(rows):
+                size += len(
+                    row[weight] if isinstance(row, dict) else getattr(row, weight)
+                )
+                if size >= spec["rows"]:
+                    bounds.append((start, position + 1))
+                    start, size = position + 1, 0
+            if start < len(rows):
+                bounds.append((start, len(rows)))
+        else:
+            bounds = [
+                (start, min(start + spec["rows"], len(rows)))
+                for start in range(0, len(rows), spec["rows"])
+            ]
+        if len(bounds) <= 1:
+            return None
+
+        context = {
+            key: value
+            for key, value in report_data.items()
+            if key not in ("tabular_exports", "pdf_chunks")
+        }
+        chunks = []
+        for index, (start, stop) in enumerate(bounds):
+            chunk = dict(context, **{spec["key"]: rows[start:stop]})
+            chunk["pdf_chunk"] = {
+                "index": index,
+                "count": len(bounds),
+                "first": index == 0,
+                "last": index == len(bounds) - 1,
+                "start": start,
+                "total": len(rows),
+            }
+            chunks.append(chunk)
+        return chunks
+
+    def _render_pdf_bytes(
+        self,
+        template_name: str,
+        context: Dict[str, Any],
+        css_path: Union[str, Path, bytes],
+    ) -> bytes:
+        """Render a report, or a chunk of a report, to PDF in memory."""
+        html_content = self._render_html(template_name, context)
+        stylesheet, font_config = self.style(css_path)
+        return HTML(string=html_content).write_pdf(
+            stylesheets=[stylesheet], font_config=font_config
+        )
+
+    def _write_chunked_pdf(
+        self,
+        template_name: str,
+        chunks: List[Dict[str, Any]],
+        css_path: Union[str, Path, bytes],
+        target: Union[str, Path, BinaryIO],
+    ) -> None:
+        """
+        Render the chunks of a report and merge them into one PDF.
+
+        With pypdf, the chunks are rendered in parallel by the pool of processes of the
+        renderer, started by the first chunked report and reused by the next ones, and
+        their PDFs are concatenated, keeping the bookmarks of every chunk in order and
+        numbering the pages of the merged document continuously. Without pypdf, or
+        with a single worker, the chunks are laid out one after the other in this
+        process and their pages written as one WeasyPrint document.
+
+        Both ways give the same pages: every chunk is laid out as its own document, so
+        it starts on a new page, and the pages are numbered 1..N.
+
+        Args:
+            template_name: Name of the template file
+            chunks: Contexts of the chunks, see `_chunk_contexts`
+            css_path: Path to the CSS file, or the content of a stylesheet
+            target: Path of the PDF file, or binary file object the PDF is written to
+        """
+        workers = min(self.chunk_workers or os.cpu_count() or 1, len(chunks))
+        logger.info(
+            f" -- Rendering {len(chunks)} chunks of {template_name} "
+            f"with {workers if PdfWriter is not None else 1} worker(s)"
+        )
+
+        if PdfWriter is not None and workers > 1:
+            pdf_chunks = self._chunk_render_pool().render_chunks(
+                template_name, chunks, css_path
+            )
+
+            writer = PdfWriter()
+            for pdf_chunk in pdf_chunks:
+                writer.append(io.BytesIO(pdf_chunk))
+            # One page label range, so viewers number the pages 1..N
+            writer.set_page_label(0, len(writer.pages) - 1, style="/D", start=1)
+            writer.write(target)
+
+        else:
+            stylesheet, font_config = self.style(css_path)
+            documents = [
+                HTML(string=self._render_html(template_name, chunk)).render(
+                    stylesheets=[stylesheet], font_config=font_config
+                )
+                for chunk in chunks
+            ]
+            pages = [page for document in documents for page in document.pages]
+            documents[0].copy(pages).write_pdf(target)
+
+    def _chunk_render_pool(self) -> "RenderPool":
+        """Return the pool rendering the chunks, starting it on first use."""
+        with self._chunk_pool_lock:
+            if self._chunk_pool is None:
+                self._chunk_pool = RenderPool(
+                    self, workers=self.chunk_workers or os.cpu_count() or 1
+                )
+            return self._chunk_pool
+
+    def close(self) -> None:
+        """Shut down the processes rendering the chunks, if they were started."""
+        with self._chunk_pool_lock:
+            if self._chunk_pool is not None:
+                self._chunk_pool.close()
+                self._chunk_pool = None
 
     def render_xlsx_report(self, report_data: Dict[str, Any]) -> None:
         """
@@ -136,19 +629,315 @@ class ReportRenderer:
         Returns:
             nothing
         """
-        report_type_str = report_data.get("report_details").get("type")
-        # Add site filter to filename if present
-        if report_data.get("site_filter"):
-            report_type_str = f"{report_type_str}-{report_data['site_filter']}"
+        self.render_tabular_report(report_data, tabular_format="xlsx")
+
+    def render_tabular_report(
+        self, report_data: Dict[str, Any], tabular_format: str = "xlsx"
+    ) -> List[Path]:
+        """
+        Write the `tabular_exports` of a report, a mapping of sheet name to DataFrame.
+
+        The XLSX workbook is streamed to disk row by row, using xlsxwriter in constant
+        memory mode when it is installed and openpyxl in write-only mode otherwise, so
+        the memory used doesn't grow with the size of the frames. Sheets longer than
+        Excel's row limit are split over several sheets.
+        With the 'csv' or 'parquet' format, one file is written per sheet instead.
+
+        Args:
+            report_data: Data of the report, with the `tabular_exports` to write
+            tabular_format: One of 'xlsx', 'csv' or 'parquet'
+
+        Returns:
+            List of the paths written.
+        """
+        file_paths = []
+        for filename, write in self._tabular_files(report_data, tabular_format).items():
+            file_path = self.output_dir / filename
+            self._replace_atomically(file_path, write)
+            logger.success(f"✔ Saving {tabular_format.upper()} file to: {file_path}")
+            file_paths.append(file_path)
+        return file_paths
+
+    def render_tabular_bytes(
+        self, report_data: Dict[str, Any], tabular_format: str = "xlsx"
+    ) -> Dict[str, bytes]:
+        """
+        Render the `tabular_exports` of a report in memory, without writing to the
+        output directory.
+
+        Args:
+            report_data: Data of the report, with the `tabular_exports` to render
+            tabular_format: One of 'xlsx', 'csv' or 'parquet'
+
+        Returns:
+            Content of the files, keyed by file name.
+        """
+        files = {}
+        for filename, write in self._tabular_files(report_data, tabular_format).items():
+            buffer = io.BytesIO()
+            write(buffer)
+            files[filename] = buffer.getvalue()
+        return files
+
+    def _tabular_files(
+        self, report_data: Dict[str, Any], tabular_format: str
+    ) -> Dict[str, Callable[[Union[Path, BinaryIO]], None]]:
+        """
+        Return the files of the `tabular_exports` of a report, each with the function
+        writing it to a path or binary file object.
 
-        xlsx_filename = f"{report_type_str}_{self.timestamp}.xlsx"
-        file_path = self.output_dir / xlsx_filename
+        Args:
+            report_data: Data of the report, with the `tabular_exports` to write
+            tabular_format: One of 'xlsx', 'csv' or 'parquet'
 
-        with pd.ExcelWriter(file_path) as writer:
-            report_data["trunk_mismatch_report"].to_excel(
-                writer, sheet_name="Summary - Trunks Mismatch", index=False
+        Returns:
+            Writing functions, keyed by file name.
+        """
+        if tabular_format not in self.TABULAR_FORMATS:
+            raise ValueError(
+                f"Invalid tabular format: {tabular_format}. "
+                f"Available formats: {', '.join(self.TABULAR_FORMATS)}"
             )
-            report_data["full_trunk_report"].to_excel(
-                writer, sheet_name="Full Report - Trunks", index=False
+
+        base_filename = self.base_filename(report_data)
+        sheets = {
+            name: df
+            for name, df in report_data.get("tabular_exports", {}).items()
+            if df is not None
+        }
+
+        if tabular_format == "xlsx":
+            return {
+                f"{base_filename}.xlsx": lambda target: self._write_xlsx(sheets, target)
+            }
+
+        write_sheet = (
+            self._write_csv if tabular_format == "csv" else self._write_parquet
+        )
+        return {
+            f"{base_filename}-{self._slugify(name)}.{tabular_format}": (
+                lambda target, df=df: write_sheet(df, target)
             )
-            logger.success(f"Saving XLSX file to: {file_path}")
+            for name, df in sheets.items()
+        }
+
+    @classmethod
+    def _write_csv(cls, df: pd.DataFrame, target: Union[Path, BinaryIO]) -> None:
+        """Write a sheet to a CSV file."""
+        df.to_csv(target, index=False, chunksize=cls.CHUNK_ROWS)
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, target: Union[Path, BinaryIO]) -> None:
+        """Write a sheet to a Parquet file."""
+        try:
+            df.to_parquet(target, index=False)
+        except ImportError:
+            raise ValueError(
+                "Parquet export requires pyarrow, install it with: pip install pyarrow"
+            )
+
+    @classmethod
+    def _write_xlsx(
+        cls, sheets: Dict[str, pd.DataFrame], target: Union[Path, BinaryIO]
+    ) -> None:
+        """Stream the sheets to an XLSX file, splitting the ones over Excel's row limit."""
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+
+        if xlsxwriter is not None:
+            workbook = xlsxwriter.Workbook(
+                str(target) if isinstance(target, Path) else target,
+                {"constant_memory": True},
+            )
+            add_sheet = workbook.add_worksheet
+        else:
+            workbook = openpyxl.Workbook(write_only=True)
+            add_sheet = workbook.create_sheet
+
+        for name, df in sheets.items():
+            max_rows = cls.EXCEL_MAX_ROWS - 1  # the header takes a row
+            parts = max(1, -(-len(df) // max_rows))
+            for part in range(parts):
+                sheet_name = name[:31] if part == 0 else f"{name[:26]} ({part + 1})"
+                worksheet = add_sheet(sheet_name)
+                rows = cls._iter_rows(df.iloc[part * max_rows : (part + 1) * max_rows])
+                if xlsxwriter is not None:
+                    worksheet.write_row(0, 0, [str(column) for column in df.columns])
+                    for row_index, row in enumerate(rows, start=1):
+                        worksheet.write_row(row_index, 0, row)
+                else:
+                    worksheet.append([str(column) for column in df.columns])
+                    for row in rows:
+                        worksheet.append(row)
+
+        if xlsxwriter is not None:
+            workbook.close()
+        else:
+            workbook.save(target)
+
+    @classmethod
+    def _iter_rows(cls, df: pd.DataFrame) -> Iterator[List[Any]]:
+        """Yield the rows of a DataFrame as lists of values both Excel writers accept."""
+        for start in range(0, len(df), cls.CHUNK_ROWS):
+            chunk = df.iloc[start : start + cls.CHUNK_ROWS].astype(object)
+            chunk = chunk.where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                yield [
+                    (
+                        value
+                        if value is None or isinstance(value, (str, bool, int, float))
+                        else str(value)
+                    )
+                    for value in row
+                ]
+
+    @staticmethod
+    def _slugify(name: str) -> str:
+        """Turn a sheet name into a file name suffix."""
+        return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+class RenderPool:
+    """
+    Pool of processes rendering PDF reports in parallel.
+
+    Every worker builds its own copy of the renderer and loads WeasyPrint and the
+    fonts once, then renders the (template, context, CSS) jobs it is sent. With a
+    single worker the reports are rendered in the calling process.
+
+    Args:
+        renderer: Renderer whose settings (templates, output directory, timestamp)
+            the workers copy
+        workers: Number of worker processes, defaults to the number of CPUs
+
+    Usage:
+        >>> with RenderPool(renderer, workers=4) as pool:
+        ...     futures = [pool.submit(template, data, css_path) for data in reports]
+        >>> pdf_paths = [future.result() for future in futures]
+    """
+
+    def __init__(self, renderer: ReportRenderer, workers: Optional[int] = None):
+        self.renderer = renderer
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_render_worker,
+                initargs=(renderer.worker_args(),),
+            )
+
+    def submit(
+        self,
+        template_name: str,
+        report_data: Dict[str, Any],
+        css_path: Union[str, Path, bytes],
+        save_html: bool = False,
+    ) -> Future:
+        """
+        Queue a report for rendering.
+
+        Args:
+            template_name: Name of the template file
+            report_data: Data to be rendered in the report
+            css_path: Path to the CSS file, or the content of a stylesheet
+            save_html: Whether to save the HTML file
+
+        Returns:
+            Future of the path of the PDF file.
+        """
+        # The tabular exports aren't rendered, don't send them to the workers
+        context = {
+            key: value for key, value in report_data.items() if key != "tabular_exports"
+        }
+        if self._executor is not None:
+            return self._executor.submit(
+                _render_pdf_job, template_name, context, css_path, save_html
+            )
+
+        future = Future()
+        try:
+            future.set_result(
+                self.renderer.render_pdf_report(
+                    template_name, context, css_path, save_html
+                )
+            )
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def render_chunks(
+        self,
+        template_name: str,
+        chunks: List[Dict[str, Any]],
+        css_path: Union[str, Path, bytes],
+    ) -> List[bytes]:
+        """
+        Render the chunks of a report to PDF, in parallel when the pool has workers.
+
+        Args:
+            template_name: Name of the template file
+            chunks: Contexts of the chunks, see `ReportRenderer._chunk_contexts`
+            css_path: Path to the CSS file, or the content of a stylesheet
+
+        Returns:
+            Content of the PDF of every chunk, in order.
+        """
+        if self._executor is None:
+            return [
+                self.renderer._render_pdf_bytes(template_name, chunk, css_path)
+                for chunk in chunks
+            ]
+        return list(
+            self._executor.map(
+                _render_pdf_bytes_job,
+                [template_name] * len(chunks),
+                chunks,
+                [css_path] * len(chunks),
+            )
+        )
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the worker processes down, waiting for the queued reports by default."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _init_render_worker(renderer_args: Dict[str, Any]) -> None:
+    """Build the renderer of a worker process, loading WeasyPrint and the fonts once."""
+    renderer = ReportRenderer(**renderer_args)
+    # The workers already run in parallel, their chunked reports are rendered serially
+    renderer.chunk_workers = 1
+    # Lay out an empty document so the first report doesn't pay for the font setup
+    HTML(string="<p></p>").render()
+    _RENDER_WORKER["renderer"] = renderer
+
+
+def _render_pdf_job(
+    template_name: str,
+    report_data: Dict[str, Any],
+    css_path: Union[str, Path, bytes],
+    save_html: bool,
+) -> Path:
+    """Render one report in a worker process."""
+    return _RENDER_WORKER["renderer"].render_pdf_report(
+        template_name, report_data, css_path, save_html
+    )
+
+
+def _render_pdf_bytes_job(
+    template_name: str, context: Dict[str, Any], css_path: Union[str, Path, bytes]
+) -> bytes:
+    """Render one chunk of a report in a worker process."""
+    return _RENDER_WORKER["renderer"]._render_pdf_bytes(
+        template_name, context, css_path
+    )
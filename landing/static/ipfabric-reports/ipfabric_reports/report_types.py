@@ -12,7 +12,9 @@ Available Report Types:
     - ManagementProtocolReport: Management protocols distribution analysis
     - OverviewReport: General network overview and statistics
     - OverviewCompareReport: Comparison between snapshots
+    - OverviewTrendReport: Overview metrics trend over several snapshots
     - PortCapacityReport: Port capacity and utilization analysis
+    - PortCapacityCompareReport: Port capacity comparison between snapshots
     - TrunkMismatchReport: Trunk configuration mismatch analysis
 
 Each report type:
@@ -30,15 +32,39 @@ Dependencies:
 
 # Standard library imports
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, List, Tuple, Type, Union
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 # Local imports
-from .config import TrunkMismatchConfig
+from .cache import SnapshotCache, resolve_cache_dir
+from .charts import pie_chart, sparkline
+from .config import (
+    CVEReportConfig,
+    DiscoveryReportConfig,
+    OverviewTrendReportConfig,
+    PortCapacityCompareReportConfig,
+    PortCapacityReportConfig,
+    TrunkMismatchConfig,
+)
 from .data_collectors import (
     BaseDataCollector,
     CVECollector,
@@ -46,18 +72,34 @@ from .data_collectors import (
     ManagementProtocolCollector,
     OverviewCollector,
     OverviewCompareCollector,
+    OverviewTrendCollector,
     PerSiteSummaryCollector,
     PortCapacityCollector,
+    PortCapacityCompareCollector,
     SnapshotSummaryCollector,
     TrunkMismatchCollector,
 )
+from .history import MetricsHistory
 from .modules import (
     get_distribution_ratio,
-    plot_pie_chart,
     cleanup_connectivity_matrix,
+    component_labels,
+    connected_components,
+    pack_shards,
     parse_vlans,
+    resolve_snapshot_id,
+    row_fingerprints,
+    vlan_mask,
+    MAX_VLANS,
     format_vlans,
 )
+from .views import (
+    CVEView,
+    DeviceCVEs,
+    OSVulnerabilities,
+    TableView,
+    table_rows,
+)
 
 
 class BaseReport(ABC):
@@ -72,6 +114,15 @@ class BaseReport(ABC):
         inventory_filter: str = None,
         snapshot_id: str = "$last",
         snapshot_id_prev: str = "$prev",
+        workers: int = 1,
+        shard_by: Optional[str] = None,
+        incremental: bool = False,
+        cache_dir: Optional[str] = None,
+        trend_snapshots: Optional[Union[int, List[str]]] = None,
+        trend_days: Optional[int] = None,
+        history_db: Optional[str] = None,
+        render_budget: bool = False,
+        save_files: bool = True,
     ):
         self.ipf = ipf
         self.site_filter = site_filter
@@ -80,6 +131,22 @@ class BaseReport(ABC):
         self.snapshot_id = snapshot_id
         self.snapshot_id_prev = snapshot_id_prev
         self.export_dir = export_dir
+        self.workers = max(1, int(workers or 1))
+        self.shard_by = shard_by
+        self.incremental = incremental
+        # Without saving files, nothing is cached unless a cache directory is given
+        if cache_dir is None and save_files:
+            cache_dir = resolve_cache_dir(export_dir=export_dir)
+        self.cache = SnapshotCache(cache_dir)
+        self.trend_snapshots = trend_snapshots
+        self.trend_days = trend_days
+        self.history = MetricsHistory(history_db) if history_db else None
+        # Render budget mode: the long detail sections of the PDF are cut to the
+        # budgets of the report configuration, the full data is in the exports
+        self.render_budget = render_budget
+        # Without saving files, the CSV exports are kept in memory, keyed by file name
+        self.save_files = save_files
+        self.csv_exports: Dict[str, pd.DataFrame] = {}
 
         if self.collector_class is None:
             raise ValueError("collector_class must be set in subclasses")
@@ -88,28 +155,50 @@ class BaseReport(ABC):
         self, data: Union[List[Dict[str, Any]], pd.DataFrame], file_name: str
     ) -> None:
         """
-        Save data to a CSV file in the export directory.
+        Save data to a CSV file in the export directory, or keep it in `csv_exports`
+        when the report doesn't save files.
 
         Args:
             data: List of dictionaries or pandas DataFrame to save
             file_name: Base name for the CSV file (without extension)
         """
-        if not data:
-            logger.info(" -- No data to save to CSV")
-            return
-
         # Convert to DataFrame if necessary
         df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+        if df.empty:
+            logger.info(" -- No data to save to CSV")
+            return
 
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d_T%H-%M")
         site_suffix = f"-{self.site_filter}" if self.site_filter else ""
-        csv_filepath = f"{self.export_dir}/{file_name}{site_suffix}-{timestamp}.csv"
+        csv_filename = f"{file_name}{site_suffix}-{timestamp}.csv"
+        if not self.save_files:
+            self.csv_exports[csv_filename] = df
+            return
 
         # Save to CSV
+        Path(self.export_dir).mkdir(parents=True, exist_ok=True)
+        csv_filepath = f"{self.export_dir}/{csv_filename}"
         df.to_csv(csv_filepath, index=False)
         logger.success(f"✔ Saving CSV file to: {csv_filepath}")
 
+    def budget_rows(
+        self, df: Optional[pd.DataFrame], max_rows: int
+    ) -> Tuple[Optional[pd.DataFrame], int]:
+        """
+        Cut a table of the PDF to its render budget, in render budget mode.
+
+        Args:
+            df: Rows of the table
+            max_rows: Budget of the table
+
+        Returns:
+            The rows to render, and the number of rows left out of the PDF.
+        """
+        if not self.render_budget or df is None or len(df) <= max_rows:
+            return df, 0
+        return df.iloc[:max_rows], len(df) - max_rows
+
     @classmethod
     def get_report_details(cls) -> Dict[str, str]:
         """
@@ -123,6 +212,46 @@ class BaseReport(ABC):
     def collect_data(self) -> Dict[str, Any]:
         pass
 
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Get the key metrics of the report, kept in the metrics history.
+
+        Args:
+            report_data: Data returned by `collect_data`
+
+        Returns:
+            Dictionary of the metric values keyed by metric name, empty when the report
+            has no metric worth keeping.
+        """
+        return {}
+
+    def record_metrics(self, report_data: Dict[str, Any]) -> None:
+        """
+        Append the key metrics of the report to the metrics history, if enabled.
+
+        A failure is logged and doesn't stop the report generation.
+
+        Args:
+            report_data: Data returned by `collect_data`
+        """
+        if self.history is None:
+            return
+        try:
+            metrics = self.key_metrics(report_data)
+            if not metrics:
+                return
+            snapshot_id = resolve_snapshot_id(self.ipf, self.snapshot_id)
+            snapshot = self.ipf.snapshots.get(snapshot_id)
+            self.history.record(
+                self.get_report_details().get("type"),
+                snapshot_id,
+                metrics,
+                site=self.site_filter,
+                timestamp=snapshot.start if snapshot is not None else None,
+            )
+        except Exception as e:
+            logger.warning(f"Unable to record the metrics history: {str(e)}")
+
     def get_summary(self) -> Dict[str, Any]:
         """
         Get the summary data for the report.
@@ -161,9 +290,7 @@ class ManagementProtocolReport(BaseReport):
                 name = item["name"]
                 key = item["key"]
                 distribution = get_distribution_ratio(proto_data, key)
-                plot = plot_pie_chart(
-                    {k: v["percentage"] for k, v in distribution.items()}
-                )
+                plot = pie_chart({k: v["percentage"] for k, v in distribution.items()})
                 mgmt_protocols.append(
                     {
                         "name": name,
@@ -182,13 +309,24 @@ class ManagementProtocolReport(BaseReport):
             "site_summary": self.get_site_summary(),
         }
 
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            f"{protocol['name']}: {server}": stats["count"]
+            for protocol in report_data["mgmt_protocols"]
+            for server, stats in protocol["distribution"].items()
+        }
+
 
 class PortCapacityReport(BaseReport):
     collector_class = PortCapacityCollector
 
     def collect_data(self) -> Dict[str, Any]:
         port_capacity_data = self.collector_class(
-            self.ipf, self.site_filter, self.snapshot_id
+            self.ipf,
+            site_filter=self.site_filter,
+            snapshot_id=self.snapshot_id,
+            keep_raw=PortCapacityReportConfig.EXPORT_RAW_INTERFACES,
+            cube_cache=self.cache,
         )
         data = port_capacity_data.get_data()
         interfaces_report = data["interfaces_report"]
@@ -199,6 +337,11 @@ class PortCapacityReport(BaseReport):
         site_report.sort(key=lambda x: x["siteName"])
 
         self.save_csv_report(interfaces_report, self.get_report_details().get("type"))
+        if "interfaces_raw" in data:
+            self.save_csv_report(
+                data["interfaces_raw"],
+                f"{self.get_report_details().get('type')}-interfaces",
+            )
 
         return {
             "report_details": self.get_report_details(),
@@ -210,6 +353,9 @@ class PortCapacityReport(BaseReport):
             "site_summary": self.get_site_summary(),
         }
 
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        return dict(report_data["port_summary"])
+
     @staticmethod
     def _get_port_summary(port_data) -> Dict[str, Any]:
         total_ports = sum(device["total"] for device in port_data)
@@ -231,12 +377,194 @@ class PortCapacityReport(BaseReport):
         }
 
 
+class PortCapacityCompareReport(BaseReport):
+    collector_class = PortCapacityCompareCollector
+
+    def collect_data(self) -> Dict[str, Any]:
+        # Both snapshots are collected at the same time, the cached cubes are reused
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            last_future = executor.submit(self._collect_snapshot_data, self.snapshot_id)
+            prev_future = executor.submit(
+                self._collect_snapshot_data, self.snapshot_id_prev
+            )
+            last_data, prev_data = last_future.result(), prev_future.result()
+
+        device_df = self.compare_capacity(
+            last_data["interfaces_report"],
+            prev_data["interfaces_report"],
+            PortCapacityCompareReportConfig.DEVICE_KEYS,
+        )
+        site_df = self.compare_capacity(
+            last_data["site_report"],
+            prev_data["site_report"],
+            PortCapacityCompareReportConfig.SITE_KEYS,
+        ).sort_values("siteName", kind="stable")
+        crossings_df = self.threshold_crossings(
+            device_df, PortCapacityCompareReportConfig.UTILISATION_THRESHOLDS
+        )
+
+        added_df = device_df[device_df["change"] == "added"]
+        removed_df = device_df[device_df["change"] == "removed"]
+        return {
+            "report_details": self.get_report_details(),
+            "network_summary": self.get_summary(),
+            "site_filter": self.site_filter,
+            "site_summary": self.get_site_summary(),
+            "last_snapshot": self.snapshot_id,
+            "prev_snapshot": self.snapshot_id_prev,
+            "capacity_summary": self._compare_summary(
+                last_data["site_report"], prev_data["site_report"]
+            ),
+            "site_comparison": self._records(site_df),
+            "threshold_crossings": self._records(crossings_df),
+            "devices_added": self._records(added_df),
+            "devices_removed": self._records(removed_df),
+            "tabular_exports": {
+                "Site Comparison": site_df,
+                "Device Comparison": device_df,
+                "Threshold Crossings": crossings_df,
+            },
+        }
+
+    def _collect_snapshot_data(self, snapshot_id: str) -> Dict[str, Any]:
+        return PortCapacityCollector(
+            self.ipf,
+            site_filter=self.site_filter,
+            snapshot_id=snapshot_id,
+            cube_cache=self.cache,
+        ).get_data()
+
+    @staticmethod
+    def compare_capacity(
+        last_records: List[Dict[str, Any]],
+        prev_records: List[Dict[str, Any]],
+        keys: List[str],
+    ) -> pd.DataFrame:
+        """
+        Join the port capacity of two snapshots and compute the deltas.
+
+        Args:
+            last_records: Per device or per site records of the last snapshot
+            prev_records: Same records for the previous snapshot
+            keys: Columns the records are matched on
+
+        Returns:
+            DataFrame with one row per device or site of either snapshot, with the
+            COMPARE_COLUMNS of both snapshots, their delta, the growth of the total
+            number of ports and the change ('added', 'removed' or '').
+        """
+        compare_columns = PortCapacityCompareReportConfig.COMPARE_COLUMNS
+        columns = list(dict.fromkeys(keys + ["siteName"] + compare_columns))
+        last_df = pd.DataFrame(last_records).reindex(columns=columns)
+        prev_df = pd.DataFrame(prev_records).reindex(columns=columns)
+
+        merged = last_df.merge(
+            prev_df, on=keys, how="outer", suffixes=("", " prev"), indicator=True
+        )
+        if "siteName prev" in merged.columns:
+            merged["siteName"] = merged["siteName"].fillna(merged["siteName prev"])
+
+        result = merged[keys + ([] if "siteName" in keys else ["siteName"])].copy()
+        for column in compare_columns:
+            last, prev = merged[column], merged[f"{column} prev"]
+            if "(%)" not in column:
+                # A device or site missing from a snapshot has no ports in it
+                last = last.fillna(0).astype("int64")
+                prev = prev.fillna(0).astype("int64")
+            result[column] = last
+            result[f"{column} prev"] = prev
+            result[f"{column} delta"] = (last - prev).round(2)
+
+        prev_total = result["total prev"].astype(float)
+        result["total growth (%)"] = (
+            (result["total delta"] / prev_total * 100).round(2).where(prev_total > 0)
+        )
+        result["change"] = (
+            merged["_merge"]
+            .map({"left_only": "added", "right_only": "removed", "both": ""})
+            .astype(object)
+        )
+        return result.reset_index(drop=True)
+
+    @staticmethod
+    def threshold_crossings(
+        device_df: pd.DataFrame, thresholds: List[float]
+    ) -> pd.DataFrame:
+        """
+        Find the devices whose port utilisation crossed a threshold.
+
+        Args:
+            device_df: Device comparison, as returned by `compare_capacity`
+            thresholds: Port utilisation thresholds (%)
+
+        Returns:
+            DataFrame with the devices and the threshold crossed, 'up' or 'down'.
+        """
+        last = device_df["port utilisation (%)"]
+        prev = device_df["port utilisation (%) prev"]
+        columns = [
+            "hostname",
+            "sn",
+            "siteName",
+            "port utilisation (%) prev",
+            "port utilisation (%)",
+            "port utilisation (%) delta",
+        ]
+
+        crossings = []
+        for threshold in thresholds:
+            for direction, crossed in [
+                ("up", (prev < threshold) & (last >= threshold)),
+                ("down", (prev >= threshold) & (last < threshold)),
+            ]:
+                crossings.append(
+                    device_df.loc[crossed, columns].assign(
+                        threshold=threshold, direction=direction
+                    )
+                )
+        return pd.concat(crossings, ignore_index=True).reindex(
+            columns=columns + ["threshold", "direction"]
+        )
+
+    @staticmethod
+    def _compare_summary(
+        last_sites: List[Dict[str, Any]], prev_sites: List[Dict[str, Any]]
+    ) -> List[Tuple[str, Any, Any, Any]]:
+        """Network wide totals of both snapshots, as (item, last, prev, delta) tuples."""
+
+        def _totals(sites: List[Dict[str, Any]]) -> Dict[str, Any]:
+            total = sum(site["total"] for site in sites)
+            used = sum(
+                site["l1&l2 up"] + site["l1 up & l2 down"] + site["L1 and l2 unknown"]
+                for site in sites
+            )
+            return {
+                "Total Ports": total,
+                "Ports up": sum(site["l1&l2 up"] for site in sites),
+                "Ports down": sum(site["l1&l2 down"] for site in sites),
+                "Overall Util (%)": (
+                    round((used / total) * 100, 2) if total > 0 else 0
+                ),
+            }
+
+        last, prev = _totals(last_sites), _totals(prev_sites)
+        return [
+            (item, last[item], prev[item], round(last[item] - prev[item], 2))
+            for item in last
+        ]
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Convert a DataFrame to records, with None instead of NaN."""
+        return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
 class OverviewReport(BaseReport):
     collector_class = OverviewCollector
 
     def collect_data(self) -> Dict[str, Any]:
         overview_data = self.collector_class(
-            self.ipf, self.site_filter, self.snapshot_id
+            self.ipf, site_filter=self.site_filter, snapshot_id=self.snapshot_id
         )
         overview_data.get_data()
         data = overview_data.return_data()
@@ -249,20 +577,34 @@ class OverviewReport(BaseReport):
             "site_summary": self.get_site_summary(),
         }
 
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            f"{section}: {metric}": value
+            for (section, metric), value in OverviewTrendReport.flatten_metrics(
+                report_data["sections"]
+            ).items()
+        }
+
 
 class OverviewCompareReport(BaseReport):
     collector_class = OverviewCompareCollector
 
     def collect_data(self) -> Dict[str, Any]:
-        last_data = self._collect_snapshot_data(self.snapshot_id)
-        prev_data = self._collect_snapshot_data(self.snapshot_id_prev)
+        last_id = resolve_snapshot_id(self.ipf, self.snapshot_id)
+        prev_id = resolve_snapshot_id(self.ipf, self.snapshot_id_prev)
 
-        comparison_data = self._compare_data(last_data, prev_data)
+        # Each snapshot is collected once, both at the same time
+        snapshot_ids = list(dict.fromkeys([last_id, prev_id]))
+        with ThreadPoolExecutor(max_workers=len(snapshot_ids)) as executor:
+            snapshots_data = dict(
+                zip(
+                    snapshot_ids,
+                    executor.map(self._collect_snapshot_data, snapshot_ids),
+                )
+            )
+        last_data, prev_data = snapshots_data[last_id], snapshots_data[prev_id]
 
-        last_summary = self._collect_snapshot_data(self.snapshot_id)["Overview Summary"]
-        prev_summary = self._collect_snapshot_data(self.snapshot_id_prev)[
-            "Overview Summary"
-        ]
+        comparison_data = self._compare_data(last_data, prev_data)
 
         return {
             "report_details": self.get_report_details(),
@@ -272,13 +614,16 @@ class OverviewCompareReport(BaseReport):
             "site_summary": self.get_site_summary(),
             "last_snapshot": self.snapshot_id,
             "prev_snapshot": self.snapshot_id_prev,
-            "last_snapshot_summary": dict(last_summary),
-            "prev_snapshot_summary": dict(prev_summary),
+            "last_snapshot_summary": dict(last_data.get("Overview Summary", [])),
+            "prev_snapshot_summary": dict(prev_data.get("Overview Summary", [])),
         }
 
     def _collect_snapshot_data(self, snapshot_id: str) -> Dict[str, Any]:
-        overview_report = OverviewReport(self.ipf, self.site_filter, snapshot_id)
-        return overview_report.collect_data()["sections"]
+        overview_data = OverviewCollector(
+            self.ipf, site_filter=self.site_filter, snapshot_id=snapshot_id
+        )
+        overview_data.get_data()
+        return overview_data.return_data()
 
     @staticmethod
     def _compare_data(
@@ -287,10 +632,12 @@ class OverviewCompareReport(BaseReport):
         comparison = {}
         for section, items in last_data.items():
             comparison[section] = []
+            prev_values = {}
+            for item_name, prev_value in prev_data.get(section, []):
+                prev_values.setdefault(item_name, prev_value)
+
             for item_name, last_value in items:
-                prev_value = next(
-                    (v for n, v in prev_data[section] if n == item_name), None
-                )
+                prev_value = prev_values.get(item_name)
                 if (
                     prev_value is not None
                     and isinstance(last_value, (int, float))
@@ -311,19 +658,436 @@ class OverviewCompareReport(BaseReport):
         return comparison
 
 
+class OverviewTrendReport(BaseReport):
+    collector_class = OverviewTrendCollector
+
+    def collect_data(self) -> Dict[str, Any]:
+        snapshots = self._select_snapshots()
+        snapshots_metrics = self._collect_metrics(snapshots)
+
+        columns = [
+            f"{snapshot.start:%Y-%m-%d %H:%M} ({snapshot.snapshot_id})"
+            for snapshot in snapshots
+        ]
+        trend_df = self.build_trend_table(snapshots_metrics, columns)
+
+        return {
+            "report_details": self.get_report_details(),
+            "network_summary": self.get_summary(),
+            "site_filter": self.site_filter,
+            "site_summary": self.get_site_summary(),
+            "snapshots": [
+                {
+                    "id": snapshot.snapshot_id,
+                    "name": snapshot.name,
+                    "date": f"{snapshot.start:%Y-%m-%d %H:%M}",
+                }
+                for snapshot in snapshots
+            ],
+            "max_columns": OverviewTrendReportConfig.MAX_TABLE_SNAPSHOTS,
+            "sections": self._trend_sections(trend_df, columns),
+            "tabular_exports": {"Overview Trend": trend_df.reset_index()},
+        }
+
+    def _select_snapshots(self) -> List[Any]:
+        """
+        Select the loaded snapshots of the report, oldest first.
+
+        The snapshots are the given snapshot IDs, the snapshots taken in the last
+        `trend_days` days, or the `trend_snapshots` (default DEFAULT_SNAPSHOTS) most
+        recent snapshots.
+
+        Returns:
+            List of ipfabric Snapshot objects.
+        """
+        loaded = {}
+        for snapshot in self.ipf.loaded_snapshots.values():
+            # '$last', '$prev' and '$lastLocked' are aliases of other snapshots
+            loaded.setdefault(snapshot.snapshot_id, snapshot)
+
+        if isinstance(self.trend_snapshots, (list, tuple)):
+            snapshot_ids = dict.fromkeys(
+                resolve_snapshot_id(self.ipf, snapshot_id)
+                for snapshot_id in self.trend_snapshots
+            )
+            missing = [sid for sid in snapshot_ids if sid not in loaded]
+            if missing:
+                raise ValueError(f"Snapshots not loaded: {', '.join(missing)}")
+            selected = [loaded[sid] for sid in snapshot_ids]
+        elif self.trend_days:
+            since = datetime.now(timezone.utc) - timedelta(days=self.trend_days)
+            selected = []
+            for snapshot in loaded.values():
+                start = snapshot.start
+                if start.tzinfo is None:
+                    start = start.replace(tzinfo=timezone.utc)
+                if start >= since:
+                    selected.append(snapshot)
+        else:
+            count = self.trend_snapshots or OverviewTrendReportConfig.DEFAULT_SNAPSHOTS
+            selected = sorted(
+                loaded.values(), key=lambda snapshot: snapshot.start, reverse=True
+            )[:count]
+
+        if not selected:
+            raise ValueError("No loaded snapshot to report on")
+        return sorted(selected, key=lambda snapshot: snapshot.start)
+
+    def _collect_metrics(
+        self, snapshots: List[Any]
+    ) -> List[Dict[Tuple[str, str], float]]:
+        """
+        Collect the overview metrics of every snapshot.
+
+        The metrics of a snapshot are kept in the cache, and only the snapshots not in
+        the cache, or changed since (e.g. rediscovered devices), are collected, at the
+        same time.
+
+        Args:
+            snapshots: Snapshots to collect
+
+        Returns:
+            List of the metrics of every snapshot, see `flatten_metrics`.
+        """
+        version = OverviewTrendReportConfig.CACHE_VERSION
+        metrics, missing = {}, []
+        for snapshot in snapshots:
+            entry = self.cache.load(
+                OverviewTrendReportConfig.REPORT_TYPE,
+                scope=self._cache_scope(snapshot.snapshot_id),
+                version=version,
+            )
+            if entry and entry["data"]["change"] == snapshot.change:
+                metrics[snapshot.snapshot_id] = entry["data"]["metrics"]
+            else:
+                missing.append(snapshot)
+        logger.info(
+            f" -- {len(snapshots) - len(missing)} snapshot(s) in cache, "
+            f"collecting {len(missing)} snapshot(s)"
+        )
+
+        if missing:
+            workers = min(OverviewTrendReportConfig.MAX_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                collected = executor.map(
+                    self._collect_snapshot_metrics,
+                    [snapshot.snapshot_id for snapshot in missing],
+                )
+                for snapshot, snapshot_metrics in zip(missing, collected):
+                    metrics[snapshot.snapshot_id] = snapshot_metrics
+                    self.cache.save(
+                        OverviewTrendReportConfig.REPORT_TYPE,
+                        snapshot.snapshot_id,
+                        {"change": snapshot.change, "metrics": snapshot_metrics},
+                        scope=self._cache_scope(snapshot.snapshot_id),
+                        version=version,
+                    )
+
+        return [metrics[snapshot.snapshot_id] for snapshot in snapshots]
+
+    def _collect_snapshot_metrics(
+        self, snapshot_id: str
+    ) -> Dict[Tuple[str, str], float]:
+        overview_data = OverviewCollector(
+            self.ipf, site_filter=self.site_filter, snapshot_id=snapshot_id
+        )
+        overview_data.get_data()
+        return self.flatten_metrics(overview_data.return_data())
+
+    def _cache_scope(self, snapshot_id: str) -> str:
+        return f"{snapshot_id}:{self.site_filter or ''}"
+
+    @staticmethod
+    def flatten_metrics(sections: Dict[str, Any]) -> Dict[Tuple[str, str], float]:
+        """
+        Extract the numeric metrics of the overview sections.
+
+        Args:
+            sections: Overview sections, as returned by OverviewCollector
+
+        Returns:
+            Dictionary of the metric values keyed by (section, metric name). The
+            distributions (vendors, device types) are reduced to their count.
+        """
+        metrics = {}
+        for section, items in sections.items():
+            for name, value in items:
+                if isinstance(value, dict):
+                    value = value.get("count")
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    metrics.setdefault((section, name), value)
+        return metrics
+
+    @staticmethod
+    def build_trend_table(
+        snapshots_metrics: List[Dict[Tuple[str, str], float]], columns: List[str]
+    ) -> pd.DataFrame:
+        """
+        Build the metrics x snapshots table.
+
+        Args:
+            snapshots_metrics: Metrics of every snapshot, oldest first
+            columns: Column name of every snapshot
+
+        Returns:
+            DataFrame indexed by (section, metric) with one column per snapshot, NaN
+            when a metric is missing from a snapshot, and the change of every metric
+            between its first and last known values.
+        """
+        # Metrics of the most recent snapshot first, then the ones that disappeared
+        keys = list(
+            dict.fromkeys(
+                key for metrics in reversed(snapshots_metrics) for key in metrics
+            )
+        )
+        trend_df = pd.DataFrame(
+            [
+                [metrics.get(key, np.nan) for metrics in snapshots_metrics]
+                for key in keys
+            ],
+            index=pd.MultiIndex.from_tuples(keys, names=["section", "metric"]),
+            columns=columns,
+            dtype=float,
+        )
+        first = trend_df.bfill(axis=1).iloc[:, 0] if columns else pd.Series(dtype=float)
+        last = trend_df.ffill(axis=1).iloc[:, -1] if columns else pd.Series(dtype=float)
+        trend_df["change"] = last - first
+        trend_df["change (%)"] = (
+            (trend_df["change"] / first * 100).round(2).where(first != 0)
+        )
+        return trend_df
+
+    @staticmethod
+    def _trend_sections(
+        trend_df: pd.DataFrame, columns: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Group the rows of the trend table by section for the template."""
+        config = OverviewTrendReportConfig
+        sections = defaultdict(list)
+        for (section, metric), row in zip(
+            trend_df.index, trend_df.astype(object).where(trend_df.notna(), None).values
+        ):
+            values = list(row[: len(columns)])
+            sections[section].append(
+                {
+                    "metric": metric,
+                    "values": [
+                        (
+                            int(value)
+                            if value is not None and float(value).is_integer()
+                            else value
+                        )
+                        for value in values
+                    ],
+                    "change": row[len(columns)],
+                    "change_pct": row[len(columns) + 1],
+                    "sparkline": sparkline(
+                        [np.nan if value is None else value for value in values],
+                        width=config.SPARKLINE_WIDTH,
+                        height=config.SPARKLINE_HEIGHT,
+                        color=config.SPARKLINE_COLOR,
+                    ),
+                }
+            )
+        return dict(sections)
+
+
 class DiscoveryReport(BaseReport):
     collector_class = DiscoveryReportCollector
 
     def collect_data(self) -> Dict[str, Any]:
-        collector = self.collector_class(self.ipf)
+        collector = self.collector_class(self.ipf, snapshot_id=self.snapshot_id)
         data = collector.get_data()
 
+        if self.incremental:
+            return self._collect_delta_data(data)
+
         self.save_csv_report(data, self.get_report_details().get("type"))
 
         return {
             "network_summary": self.get_summary(),
             "report_details": self.get_report_details(),
             "sections": self._discovery_details(data),
+            "discovery_totals": self._discovery_totals(data),
+        }
+
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        # The same totals in both modes, plus the change counts in delta mode
+        return {
+            **report_data["discovery_totals"],
+            **report_data.get("discovery_delta_counts", {}),
+        }
+
+    @staticmethod
+    def _discovery_totals(data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Count the undiscovered IPs of a snapshot, overall and per discovery source."""
+        df = pd.DataFrame(
+            data, columns=["IP Address", "MAC Address", "Discovery Source"]
+        )
+        return {
+            "Total Unique IPs": df["IP Address"].nunique(),
+            "Total Devices": len(df),
+            "Total Unique MAC Addresses": df["MAC Address"].nunique(),
+            **{
+                f"Undiscovered IPs by source: {source}": count
+                for source, count in df["Discovery Source"].value_counts().items()
+            },
+        }
+
+    def _collect_delta_data(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the report from the changes since the previous snapshot.
+
+        The results of the current snapshot are cached, and the previous snapshot is
+        read from the cache when it was already collected, otherwise from IP Fabric.
+
+        Args:
+            data: Undiscovered IPs of the current snapshot, as returned by the collector
+
+        Returns:
+            Report data with the change sections and the new/resolved IPs.
+        """
+        report_type = DiscoveryReportConfig.REPORT_TYPE
+        version = DiscoveryReportConfig.DELTA_STATE_VERSION
+        snapshot_id = resolve_snapshot_id(self.ipf, self.snapshot_id)
+        prev_snapshot_id = resolve_snapshot_id(self.ipf, self.snapshot_id_prev)
+        self._cache_snapshot_data(snapshot_id, data)
+
+        previous = self.cache.load(report_type, scope=prev_snapshot_id, version=version)
+        if previous is not None:
+            logger.info(f" -- Using the cached results of snapshot {prev_snapshot_id}")
+            prev_data = previous["data"]
+        else:
+            logger.info(f" -- Collecting the results of snapshot {prev_snapshot_id}")
+            prev_data = self.collector_class(
+                self.ipf, snapshot_id=prev_snapshot_id
+            ).get_data()
+            self._cache_snapshot_data(prev_snapshot_id, prev_data)
+
+        new_df, resolved_df, persisting_df = self.compare_discovery_results(
+            data, prev_data
+        )
+
+        changes_df = pd.concat(
+            [new_df.assign(Change="new"), resolved_df.assign(Change="resolved")],
+            ignore_index=True,
+        )
+        changes_df = changes_df[
+            ["Change"] + [col for col in changes_df.columns if col != "Change"]
+        ]
+        self.save_csv_report(changes_df, f"{report_type}-delta")
+        if DiscoveryReportConfig.DELTA_FULL_CSV:
+            self.save_csv_report(data, report_type)
+
+        return {
+            "network_summary": self.get_summary(),
+            "report_details": self.get_report_details(),
+            "previous_snapshot": prev_snapshot_id,
+            "sections": self._delta_details(
+                new_df, resolved_df, persisting_df, prev_snapshot_id
+            ),
+            "discovery_totals": self._discovery_totals(data),
+            "discovery_delta_counts": {
+                "New undiscovered IPs": len(new_df),
+                "Resolved IPs": len(resolved_df),
+                "Persisting undiscovered IPs": len(persisting_df),
+            },
+            "discovery_changes": {
+                name: TableView.from_frame(
+                    df.reindex(columns=DiscoveryReportConfig.DELTA_DETAIL_COLUMNS),
+                    fill_value="",
+                )
+                for name, df in [
+                    ("New undiscovered IPs", new_df),
+                    ("Resolved IPs", resolved_df),
+                ]
+            },
+        }
+
+    def _cache_snapshot_data(
+        self, snapshot_id: Optional[str], data: List[Dict[str, Any]]
+    ) -> None:
+        """Cache the results of a snapshot, unless its ID couldn't be resolved."""
+        if not snapshot_id or snapshot_id.startswith("$"):
+            return
+        self.cache.save(
+            DiscoveryReportConfig.REPORT_TYPE,
+            snapshot_id=snapshot_id,
+            data=data,
+            scope=snapshot_id,
+            version=DiscoveryReportConfig.DELTA_STATE_VERSION,
+        )
+
+    @staticmethod
+    def compare_discovery_results(
+        data: List[Dict[str, Any]], prev_data: List[Dict[str, Any]]
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Compare the undiscovered IPs of two snapshots on IP + source.
+
+        Both sides are hash-joined on the keys, so the comparison is linear in the
+        number of rows.
+
+        Args:
+            data: Undiscovered IPs of the current snapshot
+            prev_data: Undiscovered IPs of the previous snapshot
+
+        Returns:
+            Tuple of the new rows and the persisting rows of the current snapshot, and
+            the resolved rows of the previous snapshot, as DataFrames.
+        """
+        keys = DiscoveryReportConfig.DELTA_KEYS
+
+        def _frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+            df = pd.DataFrame(records)
+            return df.reindex(columns=df.columns.union(keys, sort=False))
+
+        def _found_in(df: pd.DataFrame, other: pd.DataFrame) -> np.ndarray:
+            joined = df[keys].merge(
+                other[keys].drop_duplicates(), on=keys, how="left", indicator=True
+            )
+            return (joined["_merge"] == "both").to_numpy()
+
+        current, previous = _frame(data), _frame(prev_data)
+        in_previous = _found_in(current, previous)
+        in_current = _found_in(previous, current)
+
+        return (
+            current[~in_previous].reset_index(drop=True),
+            previous[~in_current].reset_index(drop=True),
+            current[in_previous].reset_index(drop=True),
+        )
+
+    @staticmethod
+    def _delta_details(
+        new_df: pd.DataFrame,
+        resolved_df: pd.DataFrame,
+        persisting_df: pd.DataFrame,
+        prev_snapshot_id: str,
+    ) -> Dict[str, List[Tuple[str, Any]]]:
+        def _by_site(df: pd.DataFrame) -> List[Tuple[str, Any]]:
+            if "Network Site" not in df.columns:
+                return []
+            sites = df["Network Site"].fillna(DiscoveryReportConfig.NO_NETWORK_LABEL)
+            return list(sites.value_counts().items())
+
+        return {
+            f"Changes since snapshot {prev_snapshot_id}": [
+                ("New undiscovered IPs", len(new_df)),
+                ("Resolved IPs", len(resolved_df)),
+                ("Persisting undiscovered IPs", len(persisting_df)),
+                ("Total undiscovered IPs", len(new_df) + len(persisting_df)),
+            ],
+            "New undiscovered IPs by source": list(
+                new_df["Discovery Source"].value_counts().items()
+            ),
+            "New undiscovered IPs by site": _by_site(new_df),
+            "Resolved IPs by source": list(
+                resolved_df["Discovery Source"].value_counts().items()
+            ),
+            "Persisting undiscovered IPs by source": list(
+                persisting_df["Discovery Source"].value_counts().items()
+            ),
         }
 
     @staticmethod
@@ -331,6 +1095,18 @@ class DiscoveryReport(BaseReport):
         data: List[Dict[str, Any]],
     ) -> Dict[str, List[Tuple[str, Any]]]:
         df = pd.DataFrame(data)
+        networks = df[["Managed Network", "Network VLAN", "Network Site"]].astype(
+            object
+        )
+        # VLAN IDs come back as floats when some networks have none
+        networks["Network VLAN"] = (
+            pd.to_numeric(networks["Network VLAN"], errors="coerce")
+            .astype("Int64")
+            .astype(object)
+        )
+        networks = networks.fillna(
+            {"Managed Network": DiscoveryReportConfig.NO_NETWORK_LABEL}
+        ).fillna("-")
 
         sections = {
             "(un) Discovery Overview": [
@@ -367,6 +1143,26 @@ class DiscoveryReport(BaseReport):
                 )
                 for protocol in ["Matrix BGP", "Matrix OSPF", "Matrix EIGRP"]
             ],
+            "Undiscovered IPs by site": [
+                (site, count)
+                for site, count in df["Network Site"]
+                .fillna(DiscoveryReportConfig.NO_NETWORK_LABEL)
+                .value_counts()
+                .items()
+            ],
+            f"Top {DiscoveryReportConfig.TOP_NETWORKS} managed networks with undiscovered IPs": [
+                (
+                    (
+                        network
+                        if network == DiscoveryReportConfig.NO_NETWORK_LABEL
+                        else f"{network} (VLAN {vlan}, {site})"
+                    ),
+                    count,
+                )
+                for (network, vlan, site), count in networks.value_counts()
+                .head(DiscoveryReportConfig.TOP_NETWORKS)
+                .items()
+            ],
         }
 
         return sections
@@ -377,9 +1173,12 @@ class CVEReport(BaseReport):
 
     def collect_data(self) -> Dict[str, Any]:
 
-        def _create_cve_details(cve_data):
+        def _create_cve_details(cve_data, max_cves=None):
             """
             Transform detailed CVE data to group by OS version with a list of CVEs under each OS.
+
+            With a budget, only the first `max_cves` CVEs of an OS version are kept
+            for the PDF, the others are counted in `cves_more`.
             """
             # Handle empty data case
             if not cve_data:
@@ -388,36 +1187,26 @@ class CVEReport(BaseReport):
             # Convert to DataFrame
             df = pd.DataFrame(cve_data)
 
-            # First, get unique OS versions and their hostnames
-            os_groups = (
-                df.groupby(["vendor", "family", "version"])["hostname"]
-                .agg(list)
-                .reset_index()
-            )
-
-            # Create the transformed data
+            # Create the transformed data, one entry per OS version
             transformed_data = []
 
-            for _, os_group in os_groups.iterrows():
+            for (vendor, family, version), os_df in df.groupby(
+                ["vendor", "family", "version"]
+            ):
                 # Get all CVEs for this OS version
-                os_cves = df[
-                    (df["vendor"] == os_group["vendor"])
-                    & (df["family"] == os_group["family"])
-                    & (df["version"] == os_group["version"])
-                ].drop_duplicates(subset=["cve_id"])
+                os_cves = os_df.drop_duplicates(subset=["cve_id"])
+                rendered_cves = os_cves if max_cves is None else os_cves.iloc[:max_cves]
 
                 # Create OS entry with hostname list and CVEs
-                os_entry = {
-                    "vendor": os_group["vendor"],
-                    "family": os_group["family"],
-                    "version": os_group["version"],
-                    "hostname_list": list(
-                        set(os_group["hostname"])
-                    ),  # removes duplicates
-                    "cves": os_cves.drop(
-                        ["hostname", "vendor", "family", "version"], axis=1
-                    ).to_dict("records"),
-                }
+                os_entry = OSVulnerabilities(
+                    vendor=vendor,
+                    family=family,
+                    version=version,
+                    hostnames=", ".join(sorted(map(str, set(os_df["hostname"])))),
+                    cve_ids=", ".join(map(str, os_cves["cve_id"])),
+                    cves=table_rows(rendered_cves, CVEView),
+                    cves_more=len(os_cves) - len(rendered_cves),
+                )
 
                 transformed_data.append(os_entry)
 
@@ -475,11 +1264,39 @@ class CVEReport(BaseReport):
         return {
             "report_details": self.get_report_details(),
             "network_summary": self.get_summary(),
-            "cve_summary": cve_summary,
-            "cve_details": _create_cve_details(cve_details),
+            "cve_summary": [
+                DeviceCVEs(
+                    device["hostname"],
+                    device["vendor"],
+                    device["family"],
+                    device["version"],
+                    device["cve_count"],
+                )
+                for device in cve_summary
+            ],
+            "cve_details": _create_cve_details(
+                cve_details,
+                CVEReportConfig.MAX_CVES_PER_OS if self.render_budget else None,
+            ),
             "site_filter": self.site_filter,
             "site_summary": self.get_site_summary(),
             **_create_stats(cve_details),
+            "pdf_chunks": {
+                "key": "cve_details",
+                "rows": CVEReportConfig.PDF_CHUNK_ROWS,
+                "weight": "cves",
+            },
+        }
+
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            "Total CVEs": report_data["total_cves"],
+            "Critical and High CVEs": report_data["critical_high_cves"],
+            "Average CVSS Score": report_data["avg_cvss_score"],
+            **{
+                f"{stats['level'].capitalize()} CVEs": stats["count"]
+                for stats in report_data["severity_stats"]
+            },
         }
 
 
@@ -503,22 +1320,572 @@ class TrunkMismatchReport(BaseReport):
         inconsistencies_df = data_dict["inconsistent_trunk_links"]["value"]
 
         logger.info("Analysing data for Trunk Mismatch Report...")
-        
+
         # Remove duplicate from connectivity_matrix_l2_df:
         connectivity_matrix_l2_df = cleanup_connectivity_matrix(connectivity_matrix_l2_df)
         # DO NOT USE the drop_duplicates() BELOW, IT DOESN'T RETURN the EXPECTED RESULTs, use the cleanup_connectivity_matrix function
         # conn_matrix_dedup_df = connectivity_matrix_l2_df.drop_duplicates(subset=["localHost", "localInt", "remoteHost", "remoteInt"])
 
+        trunk_map = self.build_trunk_map(trunk_switchport_df)
+        stp_ports_map = self.build_stp_ports_map(stp_virtual_ports_df)
+
+        trunk_changes_summary, trunk_changes_df = None, None
+        if self.incremental:
+            full_df, summary_df, trunk_changes_summary, trunk_changes_df = (
+                self.analyse_trunk_links_incremental(
+                    connectivity_matrix_l2_df, trunk_map, stp_ports_map
+                )
+            )
+        else:
+            full_df, summary_df = self._combine_trunk_results(
+                *self._enrich_links(connectivity_matrix_l2_df, trunk_map, stp_ports_map)
+            )
+
+        # VLAN REACHABILITY - Find the VLANs split into islands across the trunk links
+        host_sites = (
+            dict(zip(trunk_switchport_df["hostname"], trunk_switchport_df["siteName"]))
+            if "siteName" in trunk_switchport_df.columns
+            else {}
+        )
+        vlan_islands_df, vlan_isolated_hosts_df = self.analyse_vlan_reachability(
+            connectivity_matrix_l2_df, trunk_map, host_sites
+        )
+
+        # Render budget: the PDF tables are cut, the full tables are in the exports
+        details_pdf_df, details_more = self.budget_rows(
+            inconsistencies_df, TrunkMismatchConfig.MAX_DETAIL_ROWS
+        )
+        changes_pdf_df, changes_more = self.budget_rows(
+            trunk_changes_df, TrunkMismatchConfig.MAX_CHANGES_ROWS
+        )
+        tabular_exports = {
+            "Summary - Trunks Mismatch": self._reorder_columns_perdev(summary_df),
+            "Full Report - Trunks": self._reorder_columns_full(full_df),
+            "VLAN Islands": vlan_islands_df,
+            "VLAN Isolated Hosts": vlan_isolated_hosts_df,
+            "Changes since previous": trunk_changes_df,
+        }
+        if details_more:
+            tabular_exports["Mismatched Trunk Links"] = inconsistencies_df
+
+        return {
+            "report_details": self.get_report_details(),
+            "network_summary": self.get_summary(),
+            "site_filter": self.site_filter,
+            "site_summary": self.get_site_summary(),
+            "trunk_links_total": len(full_df),
+            "trunk_mismatch_links_total": len(summary_df),
+            "trunk_mismatch_summary_pdf": table_rows(
+                self._reorder_columns_summary_pdf(summary_df),
+                TrunkMismatchConfig.SUMMARY_PDF_COLUMNS,
+                fill_value="",
+            ),
+            "trunk_mismatch_details_pdf": table_rows(
+                details_pdf_df, TrunkMismatchConfig.DETAILS_PDF_COLUMNS, fill_value=""
+            ),
+            "trunk_mismatch_details_total": len(inconsistencies_df),
+            "trunk_mismatch_details_more": details_more,
+            "trunk_changes_summary": trunk_changes_summary,
+            "trunk_changes": table_rows(
+                changes_pdf_df,
+                TrunkMismatchConfig.CHANGES_REPORT_COLUMNS,
+                fill_value="",
+            ),
+            "trunk_changes_more": changes_more,
+            "vlan_islands": table_rows(
+                vlan_islands_df, TrunkMismatchConfig.VLAN_ISLANDS_COLUMNS, fill_value=""
+            ),
+            "vlan_isolated_hosts_total": len(vlan_isolated_hosts_df),
+            "tabular_exports": tabular_exports,
+            "pdf_chunks": {
+                "key": "trunk_mismatch_details_pdf",
+                "rows": TrunkMismatchConfig.PDF_CHUNK_ROWS,
+            },
+        }
+
+    def key_metrics(self, report_data: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            "Trunk links": report_data["trunk_links_total"],
+            "Mismatched trunk links": report_data["trunk_mismatch_links_total"],
+            "Inconsistent trunk links": report_data["trunk_mismatch_details_total"],
+            "VLAN islands": len(report_data["vlan_islands"]),
+            "VLAN isolated hosts": report_data["vlan_isolated_hosts_total"],
+        }
+
+    def _enrich_links(
+        self,
+        connectivity_matrix_df: pd.DataFrame,
+        trunk_map: Dict[Tuple[str, str], str],
+        stp_ports_map: Dict[Tuple[str, str], Set[int]],
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Enrich the links, in a process pool when sharding is enabled."""
+        if self.shard_by:
+            return self._enrich_trunk_links_sharded(
+                connectivity_matrix_df,
+                trunk_map,
+                stp_ports_map,
+                shard_by=self.shard_by,
+                workers=self.workers,
+            )
+        return self._enrich_trunk_links(
+            connectivity_matrix_df, trunk_map, stp_ports_map
+        )
+
+    def analyse_trunk_links_incremental(
+        self,
+        connectivity_matrix_df: pd.DataFrame,
+        trunk_map: Dict[Tuple[str, str], str],
+        stp_ports_map: Dict[Tuple[str, str], Set[int]],
+    ) -> Tuple[
+        pd.DataFrame, pd.DataFrame, Optional[Dict[str, Any]], Optional[pd.DataFrame]
+    ]:
+        """
+        Analyse only the links that changed since the previous run.
+
+        The per-link results, the row hashes of the Connectivity Matrix and the trunk/STP
+        maps of the previous run are kept in the cache. A link is analysed again when it
+        is new, when its Connectivity Matrix row changed, or when the switchport or STP
+        VLANs of either end changed. The results of the other links are reused, so the
+        report is the same as the one of a full analysis.
+
+        The changes are only reported when the previous run is of an older snapshot: a
+        run of the same snapshot, or of a snapshot older than the one of the previous
+        run, reuses the results without reporting the differences.
+
+        Returns:
+            Tuple of the full trunk DataFrame, the summary DataFrame, the changes summary
+            and the changes DataFrame. The changes are None when there is no previous run
+            of an older snapshot.
+        """
+        merge_keys = TrunkMismatchConfig.MERGE_KEYS
+        version = TrunkMismatchConfig.INCREMENTAL_STATE_VERSION
+        report_type = TrunkMismatchConfig.REPORT_TYPE
+
+        link_keys = list(zip(*(connectivity_matrix_df[key] for key in merge_keys)))
+        if len(set(link_keys)) != len(link_keys):
+            logger.warning(
+                " -- Duplicate links in the Connectivity Matrix, running a full analysis"
+            )
+            return (
+                *self._combine_trunk_results(
+                    *self._enrich_links(
+                        connectivity_matrix_df, trunk_map, stp_ports_map
+                    )
+                ),
+                None,
+                None,
+            )
+
+        fingerprint_columns = [
+            column
+            for column in TrunkMismatchConfig.FINGERPRINT_COLUMNS
+            if column in connectivity_matrix_df.columns
+        ]
+        link_hashes = dict(
+            zip(
+                link_keys,
+                row_fingerprints(
+                    connectivity_matrix_df, columns=fingerprint_columns
+                ).tolist(),
+            )
+        )
+        link_sites = dict(zip(link_keys, connectivity_matrix_df["siteName"]))
+
+        snapshot_id = resolve_snapshot_id(self.ipf, self.snapshot_id)
+        previous = self.cache.load(report_type, scope=self.site_filter, version=version)
+        report_changes = previous is not None and self._is_older_snapshot(
+            previous["snapshot_id"], snapshot_id
+        )
+        if previous is not None and not report_changes:
+            logger.info(
+                f" -- The previous results are of snapshot {previous['snapshot_id']}, "
+                f"not older than snapshot {snapshot_id}: the changes are not reported"
+            )
+        if previous is None:
+            logger.info(" -- No previous results found, analysing all the links")
+            allowed_df, stp_df = self._enrich_links(
+                connectivity_matrix_df, trunk_map, stp_ports_map
+            )
+        else:
+            state = previous["data"]
+            changed_ports = self._changed_ports(
+                state["trunk_map"], trunk_map
+            ) | self._changed_ports(state["stp_ports_map"], stp_ports_map)
+
+            changes = {}
+            for link in link_keys:
+                if link not in state["link_hashes"]:
+                    changes[link] = "added"
+                elif (
+                    state["link_hashes"][link] != link_hashes[link]
+                    or link[:2] in changed_ports
+                    or link[2:] in changed_ports
+                ):
+                    changes[link] = "changed"
+            removed = [link for link in state["link_hashes"] if link not in link_sites]
+
+            reanalyse = pd.Series(
+                [link in changes for link in link_keys],
+                index=connectivity_matrix_df.index,
+            )
+            logger.info(
+                f" -- {len(changes)} of {len(link_keys)} link(s) to analyse since snapshot "
+                f"{previous['snapshot_id']} ({len(changed_ports)} switchport(s) changed)"
+            )
+            # Reuse the previous results of the unchanged links, under their current index label
+            labels = dict(zip(link_keys, connectivity_matrix_df.index))
+            allowed_parts = [
+                self._reuse_link_results(state["allowed"], labels, changes)
+            ]
+            stp_parts = [self._reuse_link_results(state["stp"], labels, changes)]
+            if changes:
+                allowed_df, stp_df = self._enrich_links(
+                    connectivity_matrix_df[reanalyse], trunk_map, stp_ports_map
+                )
+                allowed_parts.append(allowed_df)
+                stp_parts.append(stp_df)
+            allowed_df = pd.concat(allowed_parts).sort_index()
+            stp_df = pd.concat(stp_parts).sort_index()
+
+        full_df, summary_df = self._combine_trunk_results(allowed_df, stp_df)
+        mismatched = set(zip(*(summary_df[key] for key in merge_keys)))
+
+        if report_changes:
+            changes_df = pd.DataFrame(
+                [
+                    {
+                        "change": change,
+                        "siteName": link_sites[link],
+                        **dict(zip(merge_keys, link)),
+                        "mismatchBefore": (
+                            ""
+                            if change == "added"
+                            else self._yes_no(link in state["mismatched"])
+                        ),
+                        "mismatchNow": self._yes_no(link in mismatched),
+                    }
+                    for link, change in changes.items()
+                ]
+                + [
+                    {
+                        "change": "removed",
+                        "siteName": state["link_sites"].get(link),
+                        **dict(zip(merge_keys, link)),
+                        "mismatchBefore": self._yes_no(link in state["mismatched"]),
+                        "mismatchNow": "",
+                    }
+                    for link in removed
+                ],
+                columns=TrunkMismatchConfig.CHANGES_REPORT_COLUMNS,
+            )
+            changes_summary = {
+                "previous_snapshot": previous["snapshot_id"],
+                "links_added": sum(
+                    1 for change in changes.values() if change == "added"
+                ),
+                "links_removed": len(removed),
+                "links_changed": sum(
+                    1 for change in changes.values() if change == "changed"
+                ),
+                "switchports_changed": len(changed_ports),
+                "new_mismatches": len(mismatched - state["mismatched"]),
+                "resolved_mismatches": len(state["mismatched"] - mismatched),
+            }
+
+        else:
+            changes_summary, changes_df = None, None
+
+        self.cache.save(
+            report_type,
+            snapshot_id=snapshot_id,
+            data={
+                "link_hashes": link_hashes,
+                "link_sites": link_sites,
+                "trunk_map": trunk_map,
+                "stp_ports_map": stp_ports_map,
+                "allowed": allowed_df.reset_index(drop=True),
+                "stp": stp_df.reset_index(drop=True),
+                "mismatched": mismatched,
+            },
+            scope=self.site_filter,
+            version=version,
+        )
+        return full_df, summary_df, changes_summary, changes_df
+
+    def _is_older_snapshot(self, previous_id: str, snapshot_id: str) -> bool:
+        """
+        Check that a snapshot is older than another one.
+
+        Args:
+            previous_id: ID of the snapshot of the previous run
+            snapshot_id: ID of the current snapshot
+
+        Returns:
+            False when the snapshots are the same or the previous one is more recent,
+            True otherwise, including when the start of a snapshot is unknown.
+        """
+        if previous_id == snapshot_id:
+            return False
+        try:
+            previous = self.ipf.snapshots.get(previous_id)
+            current = self.ipf.snapshots.get(snapshot_id)
+        except Exception as e:
+            logger.warning(f"Unable to compare the snapshot dates: {str(e)}")
+            return True
+        if previous is None or current is None:
+            return True
+        return previous.start < current.start
+
+    @staticmethod
+    def _changed_ports(
+        previous_map: Dict[Tuple[str, str], Any],
+        current_map: Dict[Tuple[str, str], Any],
+    ) -> Set[Tuple[str, str]]:
+        """Return the (hostname, intName) whose value was added, removed or modified."""
+        return {
+            port
+            for port in previous_map.keys() | current_map.keys()
+            if previous_map.get(port) != current_map.get(port)
+        }
+
+    @staticmethod
+    def _reuse_link_results(
+        previous_df: pd.DataFrame,
+        labels: Dict[Tuple[str, str, str, str], Hashable],
+        changes: Dict[Tuple[str, str, str, str], str],
+    ) -> pd.DataFrame:
+        """Keep the previous rows of the links still present and unchanged, relabelled with their current index."""
+        previous_keys = list(
+            zip(*(previous_df[key] for key in TrunkMismatchConfig.MERGE_KEYS))
+        )
+        keep = [link in labels and link not in changes for link in previous_keys]
+        reused_df = previous_df[keep].copy()
+        reused_df.index = [
+            labels[link] for link, kept in zip(previous_keys, keep) if kept
+        ]
+        return reused_df
+
+    @staticmethod
+    def _yes_no(value: bool) -> str:
+        return "Yes" if value else "No"
+
+    @staticmethod
+    def analyse_vlan_reachability(
+        connectivity_matrix_df: pd.DataFrame,
+        trunk_map: Dict[Tuple[str, str], str],
+        host_sites: Dict[str, str] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Compute, for every VLAN, its connected components across the trunk links.
+
+        A device carries a VLAN when the VLAN is allowed on one of its trunk links, and a
+        trunk link carries a VLAN when it is allowed on both ends. A VLAN is split into
+        islands when the devices carrying it are not all connected by links carrying it.
+
+        VLANs are handled as bitmasks. VLANs carried by exactly the same links have the
+        same components, so the components are computed once per group of such VLANs
+        (usually a few dozen groups even with all the 4094 VLANs in use).
+
+        Args:
+            connectivity_matrix_df: The deduplicated Connectivity Matrix DataFrame.
+            trunk_map: Mapping of (hostname, intName) to the trunk VLANs.
+            host_sites: Mapping of hostname to siteName.
+
+        Returns:
+            Tuple of the DataFrame of VLANs split into islands and the DataFrame of the devices
+            isolated from the main component of their VLAN.
+        """
+        host_sites = host_sites or {}
+        vlan_masks: Dict[str, int] = {}
+        hosts: Dict[str, int] = {}
+        host_masks: List[int] = []
+        sources, targets, link_masks = [], [], []
+
+        def port_mask(port: Tuple[str, str]) -> Optional[int]:
+            vlans = trunk_map.get(port)
+            if not isinstance(vlans, str) or not vlans:
+                return None
+            if vlans not in vlan_masks:
+                vlan_masks[vlans] = vlan_mask(vlans)
+            return vlan_masks[vlans]
+
+        for local_host, local_int, remote_host, remote_int in zip(
+            connectivity_matrix_df["localHost"].tolist(),
+            connectivity_matrix_df["localInt"].tolist(),
+            connectivity_matrix_df["remoteHost"].tolist(),
+            connectivity_matrix_df["remoteInt"].tolist(),
+        ):
+            local_mask = port_mask((local_host, local_int))
+            remote_mask = port_mask((remote_host, remote_int))
+            # Only the trunk links, as in the mismatch analysis
+            if local_mask is None or remote_mask is None:
+                continue
+            for host, mask in ((local_host, local_mask), (remote_host, remote_mask)):
+                if host not in hosts:
+                    hosts[host] = len(hosts)
+                    host_masks.append(0)
+                host_masks[hosts[host]] |= mask
+            sources.append(hosts[local_host])
+            targets.append(hosts[remote_host])
+            link_masks.append(local_mask & remote_mask)
+
+        islands = []
+        isolated_columns: Dict[str, List[np.ndarray]] = defaultdict(list)
+        if hosts:
+            host_names = np.array(list(hosts), dtype=object)
+            site_names = pd.Series(host_names).map(host_sites).to_numpy(dtype=object)
+            sources, targets = np.array(sources), np.array(targets)
+            # Distinct bitmasks as boolean matrices, one row per mask and one column per VLAN
+            link_mask_ids, link_bits = TrunkMismatchReport._mask_matrix(link_masks)
+            host_mask_ids, host_bits = TrunkMismatchReport._mask_matrix(host_masks)
+
+            # Group the VLANs carried by the same links
+            vlans = np.flatnonzero(host_bits.any(axis=0))
+            signatures = np.packbits(link_bits[:, vlans], axis=0)
+            vlan_groups: Dict[bytes, List[int]] = defaultdict(list)
+            for column, vlan in enumerate(vlans.tolist()):
+                vlan_groups[signatures[:, column].tobytes()].append(vlan)
+
+            # Replace the links of every distinct mask by a spanning forest of the same
+            # components, which is much smaller on meshed or redundant topologies
+            all_hosts = np.arange(len(hosts))
+            order = np.argsort(link_mask_ids, kind="stable")
+            bounds = np.searchsorted(
+                link_mask_ids[order], np.arange(len(link_bits) + 1)
+            )
+            forests = []
+            for mask_id in range(len(link_bits)):
+                links = order[bounds[mask_id] : bounds[mask_id + 1]]
+                labels = component_labels(len(hosts), sources[links], targets[links])
+                linked = np.flatnonzero(labels != all_hosts)
+                forests.append((linked, labels[linked]))
+
+            for vlan_group in vlan_groups.values():
+                carried = [
+                    forests[mask_id]
+                    for mask_id in np.flatnonzero(link_bits[:, vlan_group[0]])
+                ]
+                labels = component_labels(
+                    len(hosts),
+                    np.concatenate([nodes for nodes, _ in carried] or [all_hosts[:0]]),
+                    np.concatenate([roots for _, roots in carried] or [all_hosts[:0]]),
+                )
+                for vlan in vlan_group:
+                    members = np.flatnonzero(host_bits[host_mask_ids, vlan])
+                    member_labels = labels[members]
+                    components, sizes = np.unique(member_labels, return_counts=True)
+                    if len(components) <= 1:
+                        continue
+                    main_size = int(sizes.max())
+                    is_isolated = member_labels != components[np.argmax(sizes)]
+                    isolated = members[is_isolated]
+                    isolated_columns["vlanId"].append(np.full(len(isolated), vlan))
+                    isolated_columns["siteName"].append(site_names[isolated])
+                    isolated_columns["hostname"].append(host_names[isolated])
+                    isolated_columns["componentSize"].append(
+                        sizes[np.searchsorted(components, member_labels[is_isolated])]
+                    )
+                    isolated_columns["mainComponentSize"].append(
+                        np.full(len(isolated), main_size)
+                    )
+                    islands.append(
+                        {
+                            "vlanId": vlan,
+                            "hosts": len(members),
+                            "components": len(components),
+                            "mainComponentHosts": main_size,
+                            "isolatedHosts": len(isolated),
+                            "isolatedSites": ", ".join(
+                                sorted({str(site) for site in site_names[isolated]})
+                            ),
+                        }
+                    )
+
+        islands_df = pd.DataFrame(
+            islands, columns=TrunkMismatchConfig.VLAN_ISLANDS_COLUMNS
+        )
+        isolated_hosts_df = pd.DataFrame(
+            (
+                {
+                    column: np.concatenate(isolated_columns[column])
+                    for column in TrunkMismatchConfig.VLAN_ISOLATED_HOSTS_COLUMNS
+                }
+                if islands
+                else {}
+            ),
+            columns=TrunkMismatchConfig.VLAN_ISOLATED_HOSTS_COLUMNS,
+        )
+        return (
+            islands_df.sort_values("vlanId", ignore_index=True),
+            isolated_hosts_df.sort_values(
+                ["vlanId", "siteName", "hostname"], ignore_index=True
+            ),
+        )
+
+    @staticmethod
+    def _mask_matrix(masks: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Deduplicate VLAN bitmasks and expand them into a boolean matrix.
+
+        Returns:
+            Tuple of the index of every mask in the matrix and the matrix itself,
+            with one row per distinct mask and one column per VLAN ID.
+        """
+        distinct: Dict[int, int] = {}
+        mask_ids = np.array(
+            [distinct.setdefault(mask, len(distinct)) for mask in masks]
+        )
+        size = (MAX_VLANS + 2 + 7) // 8
+        matrix = np.zeros((len(distinct), size * 8), dtype=bool)
+        for mask, row in distinct.items():
+            matrix[row] = np.unpackbits(
+                np.frombuffer(mask.to_bytes(size, "little"), dtype=np.uint8),
+                bitorder="little",
+            ).astype(bool)
+        return mask_ids, matrix
+
+    @classmethod
+    def _enrich_trunk_links(
+        cls,
+        connectivity_matrix_df: pd.DataFrame,
+        trunk_map: Dict[Tuple[str, str], str],
+        stp_ports_map: Dict[Tuple[str, str], Set[int]],
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Row-wise part of the analysis: trunk VLANs, missing STP VLANs and missing allowed VLANs.
+
+        Every row is processed independently of the others and keeps its index label,
+        which is what allows the Connectivity Matrix to be analysed in shards.
+
+        Returns:
+            Tuple of the allowed VLANs DataFrame and the STP VLANs DataFrame.
+        """
         # Add the trunk information to connecitvity matrix, and remove the non trunk entries
-        trunk_vlans_full_df = self.merge_connectivity_matrix_trunk_info(connectivity_matrix_l2_df, trunk_switchport_df)
+        trunk_vlans_full_df = cls._apply_trunk_map(connectivity_matrix_df, trunk_map)
 
         # STP VIRTUAL PORTS - Find which VLANS are missing on either side of the trunk
         # this will also highlight any missing VLANs on the device, and not just on the switchport configuration
-        # --> merge_full_trunk_stp_virtual_ports
-        trunk_vlans_stp_full_df = self.merge_full_trunk_stp_virtual_ports(
-            trunk_vlans_full_df=trunk_vlans_full_df,
-            stp_virtual_ports_df=stp_virtual_ports_df,
+        trunk_vlans_stp_full_df = cls._apply_stp_ports_map(
+            trunk_vlans_full_df, stp_ports_map
+        )
+
+        # SWITCHPORT CONFIGURATION - Find which VLANS are missing on either side of the trunk
+        trunk_vlans_allowed_full_df = cls.check_vlan_remote_local(
+            connectivity_matrix_df=trunk_vlans_full_df
         )
+        return trunk_vlans_allowed_full_df, trunk_vlans_stp_full_df
+
+    @staticmethod
+    def _combine_trunk_results(
+        trunk_vlans_allowed_full_df: pd.DataFrame,
+        trunk_vlans_stp_full_df: pd.DataFrame,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Keep the mismatched links and combine the allowed VLANs and STP VLANs results.
+
+        Returns:
+            Tuple of the full trunk DataFrame and the summary DataFrame with mismatched links only.
+        """
         trunk_vlans_stp_summary_df = trunk_vlans_stp_full_df[
             (
                 trunk_vlans_stp_full_df["missingStpVlansLocal"].notna()
@@ -529,11 +1896,6 @@ class TrunkMismatchReport(BaseReport):
                 & (trunk_vlans_stp_full_df["missingStpVlansRemote"] != "")
             )
         ]
-
-        # SWITCHPORT CONFIGURATION - Find which VLANS are missing on either side of the trunk
-        trunk_vlans_allowed_full_df = self.check_vlan_remote_local(
-            connectivity_matrix_df=trunk_vlans_full_df
-        )
         trunk_vlans_allowed_summary_df = trunk_vlans_allowed_full_df[
             (
                 trunk_vlans_allowed_full_df["missingAllowedVlansLocal"].notna()
@@ -546,7 +1908,7 @@ class TrunkMismatchReport(BaseReport):
         ]
 
         # Generate the report
-        merge_keys = ["localHost", "localInt", "remoteHost", "remoteInt"]
+        merge_keys = TrunkMismatchConfig.MERGE_KEYS
 
         full_df = (
             trunk_vlans_allowed_full_df.set_index(merge_keys)
@@ -558,35 +1920,109 @@ class TrunkMismatchReport(BaseReport):
             .combine_first(trunk_vlans_stp_summary_df.set_index(merge_keys))
             .reset_index()
         )
+        return full_df, summary_df
 
-        return {
-            "report_details": self.get_report_details(),
-            "network_summary": self.get_summary(),
-            "site_filter": self.site_filter,
-            "site_summary": self.get_site_summary(),
-            "trunk_mismatch_report": self._reorder_columns_perdev(summary_df),
-            "full_trunk_report": self._reorder_columns_full(full_df),
-            "trunk_mismatch_summary_pdf": self._reorder_columns_summary_pdf(summary_df),
-            "trunk_mismatch_details_pdf": inconsistencies_df,
-        }
+    @classmethod
+    def _enrich_trunk_links_sharded(
+        cls,
+        connectivity_matrix_df: pd.DataFrame,
+        trunk_map: Dict[Tuple[str, str], str],
+        stp_ports_map: Dict[Tuple[str, str], Set[int]],
+        shard_by: str,
+        workers: int,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Run `_enrich_trunk_links` on shards of the Connectivity Matrix in a process pool.
+
+        The trunk and STP maps are handed to every worker once, when the worker starts,
+        and only the shards travel with each task. The shard results are put back in the
+        order of the Connectivity Matrix, so the output is identical to the one of
+        `_enrich_trunk_links` whatever the number of workers.
+
+        Args:
+            connectivity_matrix_df: The deduplicated Connectivity Matrix DataFrame.
+            trunk_map: Mapping of (hostname, intName) to the trunk VLANs.
+            stp_ports_map: Mapping of (hostname, intName) to the STP VLANs.
+            shard_by: Either 'site' or 'component' (L2 connected component).
+            workers: Number of worker processes.
+
+        Returns:
+            Tuple of the allowed VLANs DataFrame and the STP VLANs DataFrame.
+        """
+        if shard_by not in TrunkMismatchConfig.SHARD_BY_OPTIONS:
+            raise ValueError(
+                f"Invalid shard option: {shard_by}. "
+                f"Available options: {', '.join(TrunkMismatchConfig.SHARD_BY_OPTIONS)}"
+            )
+
+        shard_keys = cls._get_shard_keys(connectivity_matrix_df, shard_by)
+        shard_sizes = shard_keys.value_counts(dropna=False).to_dict()
+        bins = pack_shards(shard_sizes, workers * TrunkMismatchConfig.SHARDS_PER_WORKER)
+
+        if workers <= 1 or len(bins) <= 1:
+            return cls._enrich_trunk_links(
+                connectivity_matrix_df, trunk_map, stp_ports_map
+            )
+
+        shards = [connectivity_matrix_df[shard_keys.isin(keys)] for keys in bins]
+        logger.info(
+            f" -- Analysing {len(shard_sizes)} {shard_by} shard(s) in {len(shards)} batch(es) "
+            f"with {workers} worker(s)"
+        )
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_trunk_shard_worker,
+            initargs=(trunk_map, stp_ports_map),
+        ) as executor:
+            results = list(executor.map(_analyse_trunk_shard, shards))
+
+        # Index labels come from the Connectivity Matrix, sorting on them restores its order
+        trunk_vlans_allowed_full_df = pd.concat(
+            [allowed for allowed, _ in results]
+        ).sort_index()
+        trunk_vlans_stp_full_df = pd.concat([stp for _, stp in results]).sort_index()
+        return trunk_vlans_allowed_full_df, trunk_vlans_stp_full_df
 
     @staticmethod
-    def merge_connectivity_matrix_trunk_info(
-        connectivity_matrix_df: pd.DataFrame, trunk_switchport_df: pd.DataFrame
-    ) -> pd.DataFrame:
+    def _get_shard_keys(
+        connectivity_matrix_df: pd.DataFrame, shard_by: str
+    ) -> pd.Series:
         """
-        Merges the trunk information to the deduplicated Connectivity Matrix.
+        Compute the shard key of every link of the Connectivity Matrix.
 
         Args:
-            connectivity_matrix_df: The Connectivity Matrix DataFrame.
-            trunk_switchport_df: The Dataframe of trunk ports, from the switchport table of IP Fabric
+            connectivity_matrix_df: The deduplicated Connectivity Matrix DataFrame.
+            shard_by: Either 'site' or 'component'.
 
         Returns:
-            df: The Connectivity Matrix DataFrame with the trunk information.
+            Series aligned with the DataFrame, holding the shard key of each row.
+        """
+        if shard_by == "site":
+            return connectivity_matrix_df["siteName"].fillna("")
+
+        # Both ends of a link always land in the same component
+        components = connected_components(
+            zip(
+                connectivity_matrix_df["localHost"],
+                connectivity_matrix_df["remoteHost"],
+            )
+        )
+        return connectivity_matrix_df["localHost"].map(components)
+
+    @staticmethod
+    def build_trunk_map(
+        trunk_switchport_df: pd.DataFrame,
+    ) -> Dict[Tuple[str, str], str]:
         """
+        Create a mapping between (device, interface) and their trunkVlan.
 
-        # Create a mapping between device,interface and their trunkVlan
-        trunk_map = dict(
+        Args:
+            trunk_switchport_df: The Dataframe of trunk ports, from the switchport table of IP Fabric
+
+        Returns:
+            Dictionary mapping (hostname, intName) to the trunk VLAN string.
+        """
+        return dict(
             zip(
                 zip(
                     trunk_switchport_df["hostname"],
@@ -596,16 +2032,47 @@ class TrunkMismatchReport(BaseReport):
             )
         )
 
-        # Add local trunk VLAN columns
-        connectivity_matrix_df["localTrunkVlan"] = connectivity_matrix_df.apply(
-            lambda row: trunk_map.get((row["localHost"], row["localInt"])),
-            axis=1,
+    @staticmethod
+    def build_stp_ports_map(
+        stp_virtual_ports_df: pd.DataFrame,
+    ) -> Dict[Tuple[str, str], Set[int]]:
+        """
+        Create a mapping between (device, interface) and the set of their STP VLANs.
+
+        Args:
+            stp_virtual_ports_df: The STP Virtual Ports DataFrame.
+
+        Returns:
+            Dictionary mapping (hostname, intName) to the set of STP VLAN IDs.
+        """
+        return (
+            stp_virtual_ports_df.groupby(["hostname", "intName"])["vlanId"]
+            .apply(set)
+            .to_dict()
         )
 
-        # Add remote trunk VLAN columns
-        connectivity_matrix_df["remoteTrunkVlan"] = connectivity_matrix_df.apply(
-            lambda row: trunk_map.get((row["remoteHost"], row["remoteInt"])),
-            axis=1,
+    @staticmethod
+    def _apply_trunk_map(
+        connectivity_matrix_df: pd.DataFrame, trunk_map: Dict[Tuple[str, str], str]
+    ) -> pd.DataFrame:
+        """
+        Add the local/remote trunk VLANs to the Connectivity Matrix and keep trunk links only.
+
+        Args:
+            connectivity_matrix_df: The Connectivity Matrix DataFrame.
+            trunk_map: Mapping of (hostname, intName) to the trunk VLANs.
+
+        Returns:
+            df: The Connectivity Matrix DataFrame with the trunk information.
+        """
+        connectivity_matrix_df = connectivity_matrix_df.copy()
+
+        # Add the local and remote trunk VLAN columns
+        connectivity_matrix_df["localTrunkVlan"] = TrunkMismatchReport._lookup_ports(
+            connectivity_matrix_df, "local", trunk_map
+        )
+        connectivity_matrix_df["remoteTrunkVlan"] = TrunkMismatchReport._lookup_ports(
+            connectivity_matrix_df, "remote", trunk_map
         )
 
         # Filter out rows where EITHER local or remote trunk VLAN is None or empty
@@ -621,54 +2088,48 @@ class TrunkMismatchReport(BaseReport):
         ]
 
     @staticmethod
-    def merge_full_trunk_stp_virtual_ports(
+    def _apply_stp_ports_map(
         trunk_vlans_full_df: pd.DataFrame,
-        stp_virtual_ports_df: pd.DataFrame,
+        stp_ports_map: Dict[Tuple[str, str], Set[int]],
     ) -> pd.DataFrame:
         """
-        Efficiently merges STP Virtual Ports information to the full trunk DataFrame.
+        Add the STP VLANs missing on either side of each trunk link.
 
         Args:
             trunk_vlans_full_df: The full trunk DataFrame.
-            stp_virtual_ports_df: The STP Virtual Ports DataFrame.
+            stp_ports_map: Mapping of (hostname, intName) to the STP VLANs.
 
         Returns:
             DataFrame with STP Virtual Ports missing VLANs information.
         """
-        # Precompute STP port mappings
-        stp_ports_map = (
-            stp_virtual_ports_df.groupby(["hostname", "intName"])["vlanId"]
-            .apply(set)
-            .to_dict()
-        )
-
         df = trunk_vlans_full_df.copy()
-
-        def calculate_missing_vlans(row):
-            local_stp_vlans = stp_ports_map.get(
-                (row["localHost"], row["localInt"]), set()
-            )
-            remote_stp_vlans = stp_ports_map.get(
-                (row["remoteHost"], row["remoteInt"]), set()
-            )
-
-            # Only calculate if both local and remote hosts are known
-            if local_stp_vlans or remote_stp_vlans:
+        no_vlans: Set[int] = set()
+        # Most links share the same pair of VLAN sets, each pair is formatted once
+        missing: Dict[Tuple[FrozenSet[int], FrozenSet[int]], Tuple[str, str]] = {}
+
+        def missing_vlans(local_stp_vlans, remote_stp_vlans):
+            # Only calculate if the STP VLANs of either side are known
+            if not local_stp_vlans and not remote_stp_vlans:
+                return None, None
+            key = (frozenset(local_stp_vlans), frozenset(remote_stp_vlans))
+            if key not in missing:
                 missing_local = list(remote_stp_vlans - local_stp_vlans)
                 missing_remote = list(local_stp_vlans - remote_stp_vlans)
-
-                return (
+                missing[key] = (
                     format_vlans(missing_local) if missing_local else None,
                     format_vlans(missing_remote) if missing_remote else None,
                 )
+            return missing[key]
 
-            return None, None
-
-        # Apply the calculation
-        df[["missingStpVlansLocal", "missingStpVlansRemote"]] = df.apply(
-            calculate_missing_vlans, axis=1, result_type="expand"
-        )
-
+        results = [
+            missing_vlans(local or no_vlans, remote or no_vlans)
+            for local, remote in zip(
+                TrunkMismatchReport._lookup_ports(df, "local", stp_ports_map),
+                TrunkMismatchReport._lookup_ports(df, "remote", stp_ports_map),
+            )
+        ]
+        df["missingStpVlansLocal"] = [local for local, _ in results]
+        df["missingStpVlansRemote"] = [remote for _, remote in results]
         return df
 
     @staticmethod
@@ -683,47 +2144,64 @@ class TrunkMismatchReport(BaseReport):
             DataFrame with missing/matching VLANs information.
         """
 
-        def process_trunk_vlans(row):
+        # Most links share the same pair of trunk VLAN strings, each pair is parsed once
+        vlans: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+
+        def compare_trunk_vlans(local_trunk_vlan, remote_trunk_vlan):
             # Skip if either trunk VLAN is missing
-            if pd.isna(row["localTrunkVlan"]) or pd.isna(row["remoteTrunkVlan"]):
-                return pd.Series(
-                    {
-                        "missingAllowedVlansLocal": None,
-                        "missingAllowedVlansRemote": None,
-                        "nonMissingVlans": None,
-                    }
+            if pd.isna(local_trunk_vlan) or pd.isna(remote_trunk_vlan):
+                return None, None, None
+            key = (local_trunk_vlan, remote_trunk_vlan)
+            if key not in vlans:
+                local_vlans = set(parse_vlans(local_trunk_vlan))
+                remote_vlans = set(parse_vlans(remote_trunk_vlan))
+                vlans[key] = (
+                    format_vlans(list(remote_vlans - local_vlans)),
+                    format_vlans(list(local_vlans - remote_vlans)),
+                    format_vlans(list(local_vlans & remote_vlans)),
                 )
+            return vlans[key]
 
-            # Parse VLANs
-            local_vlans = set(parse_vlans(row["localTrunkVlan"]))
-            remote_vlans = set(parse_vlans(row["remoteTrunkVlan"]))
-
-            # Calculate missing and matching VLANs
-            missing_vlans_local = list(remote_vlans - local_vlans)
-            missing_vlans_remote = list(local_vlans - remote_vlans)
-            matching_vlans = list(local_vlans & remote_vlans)
-
-            return pd.Series(
-                {
-                    "missingAllowedVlansLocal": format_vlans(missing_vlans_local),
-                    "missingAllowedVlansRemote": format_vlans(missing_vlans_remote),
-                    "nonMissingVlans": format_vlans(matching_vlans),
-                }
+        df = connectivity_matrix_df.copy()
+        results = [
+            compare_trunk_vlans(local, remote)
+            for local, remote in zip(
+                df["localTrunkVlan"].tolist(), df["remoteTrunkVlan"].tolist()
             )
+        ]
+        for position, column in enumerate(
+            ["missingAllowedVlansLocal", "missingAllowedVlansRemote", "nonMissingVlans"]
+        ):
+            df[column] = [result[position] for result in results]
+        return df
 
-        # Create a copy of the DataFrame
-        df = connectivity_matrix_df.copy()
+    @staticmethod
+    def _lookup_ports(
+        df: pd.DataFrame, side: str, port_map: Dict[Tuple[str, str], Any]
+    ) -> np.ndarray:
+        """
+        Look up the (hostname, intName) of one side of every link in a port mapping.
 
-        # Apply the VLAN processing
-        df[
-            [
-                "missingAllowedVlansLocal",
-                "missingAllowedVlansRemote",
-                "nonMissingVlans",
-            ]
-        ] = df.apply(process_trunk_vlans, axis=1)
+        Args:
+            df: DataFrame of links
+            side: 'local' or 'remote'
+            port_map: Mapping of (hostname, intName) to a value
 
-        return df
+        Returns:
+            The values aligned with the links, None for the ports not in the mapping.
+        """
+        if not port_map or df.empty:
+            return np.full(len(df), None, dtype=object)
+        values = pd.Series(
+            list(port_map.values()),
+            index=pd.MultiIndex.from_tuples(list(port_map)),
+            dtype=object,
+        )
+        found = values.reindex(
+            pd.MultiIndex.from_arrays([df[f"{side}Host"], df[f"{side}Int"]])
+        ).to_numpy(dtype=object, copy=True)
+        found[pd.isna(found)] = None
+        return found
 
     @staticmethod
     def _reorder_columns_full(df: pd.DataFrame) -> pd.DataFrame:
@@ -789,3 +2267,27 @@ class TrunkMismatchReport(BaseReport):
         df = df.fillna("None")
 
         return df
+
+
+# Read-only inputs of the trunk analysis, set once per worker process
+_TRUNK_SHARD_INPUTS: Dict[str, Any] = {}
+
+
+def _init_trunk_shard_worker(
+    trunk_map: Dict[Tuple[str, str], str],
+    stp_ports_map: Dict[Tuple[str, str], Set[int]],
+) -> None:
+    """Store the shared trunk analysis inputs in the worker process."""
+    _TRUNK_SHARD_INPUTS["trunk_map"] = trunk_map
+    _TRUNK_SHARD_INPUTS["stp_ports_map"] = stp_ports_map
+
+
+def _analyse_trunk_shard(
+    connectivity_matrix_df: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Enrich one shard of the Connectivity Matrix in a worker process."""
+    return TrunkMismatchReport._enrich_trunk_links(
+        connectivity_matrix_df,
+        _TRUNK_SHARD_INPUTS["trunk_map"],
+        _TRUNK_SHARD_INPUTS["stp_ports_map"],
+    )
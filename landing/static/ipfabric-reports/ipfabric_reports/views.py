@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+IP Fabric Report Generator - View Models Module.
+
+This module holds the view models the reports hand to the templates: compact rows
+with the exact columns a template shows, built once when the data of a report is
+collected. The templates only loop over them and never convert data, and the rows
+are cheap to send to the render worker processes. The renderer refuses template
+contexts holding pandas objects.
+
+Main Components:
+    - table_rows: Convert the columns of a DataFrame to a list of named tuples
+    - TableView: Table rendered with all its columns, e.g. column names with spaces
+    - DeviceCVEs, CVEView, OSVulnerabilities: View models of the CVE report
+
+Usage:
+    >>> rows = table_rows(df, ["siteName", "localHost"], fill_value="")
+    >>> rows[0].localHost
+"""
+
+# Standard library imports
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+# Third-party imports
+import pandas as pd
+
+
+@lru_cache(maxsize=None)
+def _row_type(columns: Tuple[str, ...]) -> Type[tuple]:
+    """Return the named tuple type of a set of columns, created once."""
+    return namedtuple("Row", columns)
+
+
+def table_rows(
+    df: Optional[pd.DataFrame],
+    columns: Union[Sequence[str], Type[tuple]],
+    fill_value: Any = None,
+) -> Optional[List[tuple]]:
+    """
+    Convert the columns of a DataFrame to a list of named tuples, for a template.
+
+    Args:
+        df: Rows of the table, None is returned as is
+        columns: Columns of the rows, valid Python identifiers, or a NamedTuple class
+            whose fields are the columns. Missing columns are filled.
+        fill_value: Value of the missing values (NaN or None)
+
+    Returns:
+        One named tuple per row, holding the columns in order.
+    """
+    if df is None:
+        return None
+    row_type = columns if isinstance(columns, type) else _row_type(tuple(columns))
+    frame = df.reindex(columns=list(row_type._fields)).astype(object)
+    frame = frame.where(frame.notna(), fill_value)
+    return [row_type._make(row) for row in frame.itertuples(index=False, name=None)]
+
+
+class TableView(NamedTuple):
+    """Table rendered with all its columns, whose names can be any string."""
+
+    columns: Tuple[str, ...]
+    rows: List[Tuple[Any, ...]]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fill_value: Any = None) -> "TableView":
+        """
+        Build the view of a DataFrame.
+
+        Args:
+            df: Rows of the table
+            fill_value: Value of the missing values (NaN or None)
+
+        Returns:
+            The column names and the rows of the table, as tuples.
+        """
+        frame = df.astype(object)
+        frame = frame.where(frame.notna(), fill_value)
+        return cls(
+            tuple(str(column) for column in frame.columns),
+            list(frame.itertuples(index=False, name=None)),
+        )
+
+
+class DeviceCVEs(NamedTuple):
+    """Device of the CVE report, with its number of CVEs."""
+
+    hostname: str
+    vendor: str
+    family: str
+    version: str
+    cve_count: int
+
+
+class CVEView(NamedTuple):
+    """CVE detailed in the CVE report, missing values are None."""
+
+    cve_id: str
+    v3_baseSeverity: Optional[str]
+    v2_baseSeverity: Optional[str]
+    v3_impactScore: Optional[float]
+    v2_impactScore: Optional[float]
+    url: Optional[str]
+    description: Optional[str]
+
+
+class OSVulnerabilities(NamedTuple):
+    """CVEs of an OS version, with the devices running it."""
+
+    vendor: str
+    family: str
+    version: str
+    # Comma separated hostnames and CVE IDs, joined once
+    hostnames: str
+    cve_ids: str
+    # CVEs detailed in the PDF, and the number of CVEs left out by the render budget
+    cves: List[CVEView]
+    cves_more: int
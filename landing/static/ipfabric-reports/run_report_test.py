@@ -32,7 +32,7 @@ SITE_NAME = "L36"  # Static site name for testing
 IPF_URL = os.getenv("IPF_URL")  # Still using env for sensitive data
 IPF_TOKEN = os.getenv("IPF_TOKEN")
 NVD_API_KEY = os.getenv("NVD_API_KEY")  # For CVE reports
-SKIP_REPORTS = ["overview-compare"]  # Reports to skip
+SKIP_REPORTS = ["overview-compare", "port-capacity-compare"]  # Reports to skip
 
 
 # Color definitions
@@ -26,7 +26,6 @@ setup(
         "python-dotenv",
         "jinja2",
         "weasyprint",
-        "matplotlib",
         "pandas",
         "openpyxl",
         "setuptools",
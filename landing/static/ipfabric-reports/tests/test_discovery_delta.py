@@ -0,0 +1,77 @@
+"""Tests of the comparison of the undiscovered IPs of two snapshots."""
+
+# Third-party imports
+import pytest
+
+# Local imports
+from ipfabric_reports.report_types import DiscoveryReport
+
+
+def _undiscovered(ip, source, status="timeout"):
+    return {"IP Address": ip, "Discovery Source": source, "Discovery Status": status}
+
+
+@pytest.mark.parametrize(
+    "data, prev_data, new, resolved, persisting",
+    [
+        pytest.param([], [], [], [], [], id="empty"),
+        pytest.param(
+            [_undiscovered("10.0.0.1", "arp")],
+            [],
+            [("10.0.0.1", "arp")],
+            [],
+            [],
+            id="added",
+        ),
+        pytest.param(
+            [],
+            [_undiscovered("10.0.0.1", "arp")],
+            [],
+            [("10.0.0.1", "arp")],
+            [],
+            id="removed",
+        ),
+        pytest.param(
+            [_undiscovered("10.0.0.1", "arp", "auth failed")],
+            [_undiscovered("10.0.0.1", "arp", "timeout")],
+            [],
+            [],
+            [("10.0.0.1", "arp")],
+            id="changed-status",
+        ),
+        pytest.param(
+            [_undiscovered("10.0.0.1", "cdp")],
+            [_undiscovered("10.0.0.1", "arp")],
+            [("10.0.0.1", "cdp")],
+            [("10.0.0.1", "arp")],
+            [],
+            id="changed-source",
+        ),
+        pytest.param(
+            [_undiscovered("10.0.0.1", "arp"), _undiscovered("10.0.0.2", "arp")],
+            [_undiscovered("10.0.0.2", "arp"), _undiscovered("10.0.0.3", "arp")],
+            [("10.0.0.1", "arp")],
+            [("10.0.0.3", "arp")],
+            [("10.0.0.2", "arp")],
+            id="mixed",
+        ),
+    ],
+)
+def test_compare_discovery_results(data, prev_data, new, resolved, persisting):
+    results = DiscoveryReport.compare_discovery_results(data, prev_data)
+
+    keys = ["IP Address", "Discovery Source"]
+    assert [list(map(tuple, df[keys].values.tolist())) for df in results] == [
+        new,
+        resolved,
+        persisting,
+    ]
+
+
+def test_compare_discovery_results_keep_the_current_rows():
+    *_, persisting_df = DiscoveryReport.compare_discovery_results(
+        [_undiscovered("10.0.0.1", "arp", "auth failed")],
+        [_undiscovered("10.0.0.1", "arp", "timeout")],
+    )
+
+    assert persisting_df["Discovery Status"].tolist() == ["auth failed"]
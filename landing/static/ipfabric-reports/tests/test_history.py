@@ -0,0 +1,104 @@
+"""Tests of the SQLite store of the report metrics."""
+
+# Standard library imports
+from datetime import datetime, timedelta, timezone
+
+# Third-party imports
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.history import MetricsHistory, _isoformat
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2026-01-02T03:04:05Z",
+        "2026-01-02T03:04:05+00:00",
+        "2026-01-02T04:04:05+01:00",
+        "2026-01-02T03:04:05.123Z",
+        "2026-01-02 03:04:05",
+        datetime(2026, 1, 2, 3, 4, 5),
+        datetime(2026, 1, 2, 5, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+    ],
+)
+def test_isoformat(value):
+    assert _isoformat(value) == "2026-01-02T03:04:05+00:00"
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = MetricsHistory(tmp_path / "history" / "metrics.db")
+    for day, snapshot_id, utilisation in [
+        (1, "snapshot-1", 40.0),
+        (2, "snapshot-2", 45.5),
+        (3, "snapshot-3", 52.0),
+    ]:
+        history.record(
+            "port-capacity",
+            snapshot_id,
+            {"Overall Util (%)": utilisation, "Total Ports": 100 * day},
+            timestamp=datetime(2026, 1, day, tzinfo=timezone.utc),
+        )
+    history.record(
+        "port-capacity",
+        "snapshot-3",
+        {"Overall Util (%)": 90.0, "Total Ports": 10},
+        site="HQ",
+        timestamp=datetime(2026, 1, 3, tzinfo=timezone.utc),
+    )
+    return history
+
+
+def test_record_ignores_non_numeric_values(tmp_path):
+    history = MetricsHistory(tmp_path / "metrics.db")
+
+    recorded = history.record(
+        "cve", "snapshot-1", {"Critical CVEs": 3, "Vendor": "cisco", "Checked": True}
+    )
+
+    assert recorded == 1
+    assert history.query(report_type="cve")["metric"].tolist() == ["Critical CVEs"]
+
+
+def test_record_replaces_the_same_snapshot(history):
+    history.record(
+        "port-capacity",
+        "snapshot-2",
+        {"Overall Util (%)": 47.0},
+        timestamp="2026-01-02T00:00:00Z",
+    )
+
+    df = history.query(metrics="Overall Util (%)", site="")
+    assert df["value"].tolist() == [40.0, 47.0, 52.0]
+
+
+def test_query(history):
+    df = history.query(
+        report_type="port-capacity",
+        metrics=["Total Ports"],
+        site="",
+        since="2026-01-02T00:00:00Z",
+        until="2026-01-03T00:00:00Z",
+    )
+
+    assert df[["snapshot_id", "metric", "value"]].values.tolist() == [
+        ["snapshot-2", "Total Ports", 200.0]
+    ]
+    assert df["timestamp"].tolist() == [pd.Timestamp("2026-01-02", tz="UTC")]
+    assert len(history.query(snapshot_id="snapshot-3")) == 4
+    assert set(history.query(site="HQ")["value"]) == {90.0, 10.0}
+
+
+def test_trend(history):
+    trend_df = history.trend(
+        "port-capacity", metrics="Overall Util (%)", since="2026-01-02"
+    )
+
+    assert trend_df.index.get_level_values("snapshot_id").tolist() == [
+        "snapshot-2",
+        "snapshot-3",
+    ]
+    assert trend_df["Overall Util (%)"].tolist() == [45.5, 52.0]
+    assert history.trend("port-capacity", site="HQ")["Total Ports"].tolist() == [10.0]
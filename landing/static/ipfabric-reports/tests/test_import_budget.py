@@ -0,0 +1,38 @@
+"""Tests of the import budget of the CLI: heavy dependencies load on first use only."""
+
+# Standard library imports
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Dependencies the CLI must not import until a report runs
+HEAVY_MODULES = ["pandas", "weasyprint", "ipfabric", "matplotlib"]
+
+# Generous limit, the import takes about 0.1 s without the heavy dependencies
+IMPORT_TIME_LIMIT = 10.0
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_import_skips_heavy_dependencies():
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import ipfabric_reports.cli\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'loaded': loaded}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PACKAGE_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    measures = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert measures["loaded"] == []
+    assert measures["elapsed"] < IMPORT_TIME_LIMIT
@@ -0,0 +1,105 @@
+"""Tests of the device inventory index and of the collector calls it answers."""
+
+# Standard library imports
+from types import SimpleNamespace
+
+# Third-party imports
+import pytest
+
+# Local imports
+from ipfabric_reports.data_collectors import BaseDataCollector
+from ipfabric_reports.inventory import DeviceInventoryIndex
+
+DEVICES = [
+    {"hostname": "sw1", "sn": "SN1", "siteName": "HQ", "vendor": "cisco"},
+    {"hostname": "sw2", "sn": "SN2", "siteName": "HQ", "vendor": "arista"},
+    {"hostname": "rt1", "sn": "SN3", "siteName": "Branch", "vendor": "cisco"},
+]
+
+
+class _Client:
+    """IP Fabric client serving the device inventory and recording the API calls."""
+
+    def __init__(self):
+        self.base_url = "https://ipfabric.test"
+        self.calls = []
+        self.inventory = SimpleNamespace(
+            devices=SimpleNamespace(all=self._all, count=self._count)
+        )
+
+    def get_snapshot_id(self, snapshot_id: str) -> str:
+        return "snapshot-1"
+
+    def _all(self, **kwargs):
+        self.calls.append(("all", kwargs))
+        return DEVICES
+
+    def _count(self, **kwargs):
+        self.calls.append(("count", kwargs))
+        return -1
+
+
+@pytest.fixture
+def client():
+    DeviceInventoryIndex.clear()
+    yield _Client()
+    DeviceInventoryIndex.clear()
+
+
+@pytest.mark.parametrize(
+    "method, filters, columns, expected",
+    [
+        ("inventory.devices.count", {}, None, 3),
+        ("inventory.devices.count", {"siteName": ["eq", "HQ"]}, None, 2),
+        ("inventory.devices.count", {"siteName": ["eq", "Lab"]}, None, 0),
+        (
+            "inventory.devices.all",
+            {"siteName": ["eq", "Branch"]},
+            ["hostname", "sn"],
+            [{"hostname": "rt1", "sn": "SN3"}],
+        ),
+    ],
+)
+def test_inventory_calls_served_from_the_index(
+    client, method, filters, columns, expected
+):
+    collector = BaseDataCollector(ipf=client)
+    assert collector._inventory_data(method, filters, columns) == expected
+    # Only the inventory itself is fetched
+    assert [call for call, _ in client.calls] == ["all"]
+
+
+@pytest.mark.parametrize(
+    "method, filters, columns",
+    [
+        ("inventory.devices.all", {}, None),
+        ("inventory.devices.all", {}, ["hostname", "uptime"]),
+        ("inventory.devices.count", {"siteName": ["like", "hq"]}, None),
+        ("inventory.devices.count", {"vendor": ["eq", "cisco"]}, None),
+        (
+            "inventory.devices.count",
+            {"siteName": ["eq", "HQ"], "vendor": ["eq", "cisco"]},
+            None,
+        ),
+        ("inventory.interfaces.count", {}, None),
+    ],
+)
+def test_other_inventory_calls_fall_back_to_the_api(client, method, filters, columns):
+    collector = BaseDataCollector(ipf=client)
+    assert collector._inventory_data(method, filters, columns) is None
+    assert client.calls == []
+
+
+def test_only_the_last_snapshots_are_kept(client, monkeypatch):
+    monkeypatch.setattr(DeviceInventoryIndex, "MAX_SNAPSHOTS", 2)
+    client.get_snapshot_id = lambda snapshot_id: snapshot_id
+    snapshots = {}
+    for snapshot_id in ["s1", "s2", "s1", "s3"]:
+        snapshots.setdefault(
+            snapshot_id, DeviceInventoryIndex.load(client, snapshot_id)
+        )
+
+    # s1 was used again after s2, so s2 is the one forgotten
+    assert [key[2] for key in DeviceInventoryIndex._loaded] == ["s1", "s3"]
+    assert [call for call, _ in client.calls] == ["all"] * 3
+    assert DeviceInventoryIndex.load(client, "s1") is snapshots["s1"]
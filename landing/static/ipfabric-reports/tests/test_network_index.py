@@ -0,0 +1,71 @@
+"""Tests of the longest-prefix match index of the networks."""
+
+# Standard library imports
+import ipaddress
+
+# Third-party imports
+import pytest
+
+# Local imports
+from ipfabric_reports.network_index import NetworkIntervalIndex
+
+NETWORKS = [
+    ("10.0.0.0/8", "wide"),
+    ("10.1.0.0/16", "nested"),
+    ("10.1.2.0/24", "nested-twice"),
+    # Siblings after the nested networks, still in the wide parent
+    ("10.2.0.0/16", "sibling"),
+    ("10.200.0.0/24", "last-sibling"),
+    ("192.168.1.0/24", "lan"),
+    ("192.168.1.0/24", "duplicate"),
+    ("2001:db8::/32", "v6-wide"),
+    ("2001:db8:1::/48", "v6-nested"),
+    ("not-a-network", "invalid"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NetworkIntervalIndex(NETWORKS)
+
+
+@pytest.mark.parametrize(
+    "ip, expected",
+    [
+        ("10.1.2.3", ("10.1.2.0/24", "nested-twice")),
+        ("10.1.3.1", ("10.1.0.0/16", "nested")),
+        ("10.0.0.1", ("10.0.0.0/8", "wide")),
+        ("10.2.255.255", ("10.2.0.0/16", "sibling")),
+        ("10.3.0.1", ("10.0.0.0/8", "wide")),
+        ("10.200.0.9", ("10.200.0.0/24", "last-sibling")),
+        ("10.255.255.255", ("10.0.0.0/8", "wide")),
+        ("192.168.1.10", ("192.168.1.0/24", "lan")),
+        (ipaddress.ip_address("192.168.1.1"), ("192.168.1.0/24", "lan")),
+        ("2001:db8:1::1", ("2001:db8:1::/48", "v6-nested")),
+        ("2001:db8:2::1", ("2001:db8::/32", "v6-wide")),
+    ],
+)
+def test_lookup_most_specific_network(index, ip, expected):
+    assert index.lookup(ip) == expected
+
+
+@pytest.mark.parametrize(
+    "ip",
+    ["9.255.255.255", "11.0.0.0", "192.168.2.1", "2001:db9::1", "::ffff:10.1.2.3"],
+)
+def test_lookup_outside_every_network(index, ip):
+    assert index.lookup(ip) is None
+
+
+def test_lookup_invalid_address(index):
+    assert index.lookup("10.1.2.256") is None
+    assert index.lookup(None) is None
+
+
+def test_lookup_many(index):
+    assert len(index) == 8
+    assert index.lookup_many(["10.1.2.3", "11.0.0.0", "10.1.2.3"]) == [
+        ("10.1.2.0/24", "nested-twice"),
+        None,
+        ("10.1.2.0/24", "nested-twice"),
+    ]
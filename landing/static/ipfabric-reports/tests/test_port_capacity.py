@@ -0,0 +1,181 @@
+"""Tests of the port capacity cube and of its per host and per site roll-ups."""
+
+# Standard library imports
+import random
+from collections import defaultdict
+from types import SimpleNamespace
+
+# Third-party imports
+import pytest
+
+# Local imports
+from ipfabric_reports.config import PortCapacityReportConfig
+from ipfabric_reports.data_collectors import PortCapacityCollector
+from ipfabric_reports.inventory import DeviceInventoryIndex
+
+STATES = ["up", "down", "unknown", None]
+REASONS = [None, "admin", "disabled", "err-disabled", "errDisabled", "other"]
+
+
+def _interfaces(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    interfaces = []
+    for position in range(count):
+        site = rng.choice(["HQ", "DC", "Branch"])
+        hostname = f"{site.lower()}-sw{rng.randrange(4)}"
+        interfaces.append(
+            {
+                "id": str(position),
+                "hostname": hostname,
+                "sn": f"SN-{hostname}",
+                "siteName": site,
+                "intName": f"Eth1/{position}",
+                "l1": rng.choice(STATES),
+                "l2": rng.choice(STATES),
+                "reason": rng.choice(REASONS),
+                "speedValue": rng.choice([1e9, 10e9, None]),
+                "media": rng.choice(["copper", "fiber"]),
+                "hasTransceiver": rng.choice([True, False]),
+            }
+        )
+    return interfaces
+
+
+class _Interfaces:
+    """Interfaces table answering paged and sorted fetches."""
+
+    def __init__(self, interfaces):
+        self.interfaces = interfaces
+        self.sorts = []
+
+    def fetch(self, columns, filters, sort, snapshot_id, limit, start):
+        self.sorts.append(sort)
+        rows = self.interfaces
+        site = filters.get("siteName")
+        if site:
+            rows = [intf for intf in rows if intf["siteName"] == site[1]]
+        rows = sorted(
+            rows,
+            key=lambda intf: int(intf[sort["column"]]),
+            reverse=sort["order"] == "desc",
+        )
+        return [
+            {column: intf.get(column) for column in columns}
+            for intf in rows[start : start + limit]
+        ]
+
+
+class _Client:
+    def __init__(self, interfaces):
+        self.base_url = "https://ipfabric.test"
+        devices = list({intf["hostname"]: intf for intf in interfaces}.values())
+        self.inventory = SimpleNamespace(
+            interfaces=_Interfaces(interfaces),
+            devices=SimpleNamespace(
+                all=lambda columns, snapshot_id: [
+                    {column: device.get(column) for column in columns}
+                    for device in devices
+                ]
+            ),
+        )
+
+    def get_snapshot_id(self, snapshot_id: str) -> str:
+        return "snapshot-1"
+
+
+def _reference_counts(interfaces):
+    """Per host and per site counts, one interface at a time."""
+    hosts = {}
+    for intf in interfaces:
+        host = hosts.setdefault(
+            intf["hostname"],
+            defaultdict(int, hostname=intf["hostname"], siteName=intf["siteName"]),
+        )
+        known = intf["l1"] in ("up", "down") and intf["l2"] in ("up", "down")
+        host["total"] += 1
+        host["l1&l2 up"] += intf["l1"] == "up" and intf["l2"] == "up"
+        host["l1&l2 down"] += intf["l1"] == "down" and intf["l2"] == "down"
+        host["l1 up & l2 down"] += intf["l1"] == "up" and intf["l2"] == "down"
+        host["L1 and l2 unknown"] += not known
+        host["admin-down"] += (
+            intf["reason"] in PortCapacityReportConfig.INTERFACE_ADMIN_DOWN_REASON
+        )
+        host["err-disabled"] += intf["reason"] is not None and "err" in intf["reason"]
+
+    sites = {}
+    for host in hosts.values():
+        site = sites.setdefault(host["siteName"], defaultdict(int))
+        for column in PortCapacityReportConfig.COUNT_COLUMNS:
+            site[column] += host[column]
+    return hosts, sites
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    # Several pages and several batches
+    monkeypatch.setattr(PortCapacityReportConfig, "PAGE_SIZE", 7)
+    monkeypatch.setattr(PortCapacityReportConfig, "BATCH_ROWS", 20)
+    DeviceInventoryIndex.clear()
+    yield
+    DeviceInventoryIndex.clear()
+
+
+@pytest.mark.parametrize("site_filter", [None, "DC"])
+def test_rollups_match_the_per_interface_counts(site_filter):
+    interfaces = _interfaces(200)
+    # The table returns the interfaces in no particular order
+    random.Random(1).shuffle(interfaces)
+    selected = sorted(
+        (
+            intf
+            for intf in interfaces
+            if site_filter is None or intf["siteName"] == site_filter
+        ),
+        key=lambda intf: int(intf["id"]),
+    )
+    client = _Client(interfaces)
+
+    data = PortCapacityCollector(client, site_filter=site_filter).get_data()
+
+    hosts, sites = _reference_counts(selected)
+    count_columns = PortCapacityReportConfig.COUNT_COLUMNS
+    assert [
+        (record["hostname"], record["sn"], record["siteName"])
+        for record in data["interfaces_report"]
+    ] == [
+        (hostname, f"SN-{hostname}", host["siteName"])
+        for hostname, host in hosts.items()
+    ]
+    for record in data["interfaces_report"]:
+        host = hosts[record["hostname"]]
+        assert {column: record[column] for column in count_columns} == {
+            column: host[column] for column in count_columns
+        }
+    assert [record["siteName"] for record in data["site_report"]] == list(sites)
+    for record in data["site_report"]:
+        site = sites[record["siteName"]]
+        assert {column: record[column] for column in count_columns} == {
+            column: site[column] for column in count_columns
+        }
+        used = site["l1&l2 up"] + site["l1 up & l2 down"] + site["L1 and l2 unknown"]
+        assert record["port utilisation (%)"] == round(used / site["total"] * 100, 2)
+
+    # Every page of the table is fetched with the same sort
+    assert client.inventory.interfaces.sorts == [PortCapacityReportConfig.PAGE_SORT] * (
+        len(selected) // PortCapacityReportConfig.PAGE_SIZE + 1
+    )
+
+
+def test_rollup_cube_slices():
+    interfaces = _interfaces(200)
+    data = PortCapacityCollector(_Client(interfaces)).get_data()
+
+    free_10g = PortCapacityCollector.rollup_cube(
+        data["cube"], ["siteName"], {"speedValue": 10e9, "hasTransceiver": True}
+    )
+
+    expected = defaultdict(int)
+    for intf in interfaces:
+        if intf["speedValue"] == 10e9 and intf["hasTransceiver"]:
+            expected[intf["siteName"]] += intf["l1"] == "down" and intf["l2"] == "down"
+    assert dict(zip(free_10g["siteName"], free_10g["l1&l2 down"])) == expected
@@ -0,0 +1,109 @@
+"""Tests of the comparison of the port capacity of two snapshots."""
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.report_types import PortCapacityCompareReport
+
+
+def _device(hostname, total, up, down, utilisation):
+    return {
+        "hostname": hostname,
+        "sn": f"SN-{hostname}",
+        "siteName": "HQ",
+        "total": total,
+        "l1&l2 up": up,
+        "l1&l2 down": down,
+        "port utilisation (%)": utilisation,
+        "port availability (%)": round(100 - utilisation, 2),
+    }
+
+
+@pytest.mark.parametrize(
+    "last, prev, expected",
+    [
+        pytest.param(
+            [_device("sw1", 48, 30, 18, 62.5)],
+            [_device("sw1", 24, 12, 12, 50.0)],
+            {"change": "", "total delta": 24, "total growth (%)": 100.0},
+            id="changed",
+        ),
+        pytest.param(
+            [_device("sw1", 24, 12, 12, 50.0)],
+            [_device("sw1", 24, 12, 12, 50.0)],
+            {"change": "", "total delta": 0, "total growth (%)": 0.0},
+            id="unchanged",
+        ),
+        pytest.param(
+            [_device("sw1", 24, 12, 12, 50.0)],
+            [],
+            {"change": "added", "total prev": 0, "total delta": 24},
+            id="added",
+        ),
+        pytest.param(
+            [],
+            [_device("sw1", 24, 12, 12, 50.0)],
+            {"change": "removed", "total": 0, "total delta": -24},
+            id="removed",
+        ),
+    ],
+)
+def test_compare_capacity(last, prev, expected):
+    result = PortCapacityCompareReport.compare_capacity(last, prev, ["hostname", "sn"])
+
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row["hostname"] == "sw1"
+    assert row["siteName"] == "HQ"
+    for column, value in expected.items():
+        assert row[column] == value, column
+
+
+def test_compare_capacity_deltas():
+    result = PortCapacityCompareReport.compare_capacity(
+        [_device("sw1", 48, 30, 18, 62.5), _device("sw2", 24, 12, 12, 50.0)],
+        [_device("sw1", 24, 12, 12, 50.0), _device("sw3", 8, 8, 0, 100.0)],
+        ["hostname", "sn"],
+    )
+
+    result = result.set_index("hostname")
+    assert result["change"].to_dict() == {"sw1": "", "sw2": "added", "sw3": "removed"}
+    assert result["l1&l2 up delta"].to_dict() == {"sw1": 18, "sw2": 12, "sw3": -8}
+    assert result.loc["sw1", "port utilisation (%) delta"] == 12.5
+    # No growth without ports in the previous snapshot
+    assert np.isnan(result.loc["sw2", "total growth (%)"])
+
+
+@pytest.mark.parametrize(
+    "prev, last, expected",
+    [
+        pytest.param(40.0, 60.0, [(50, "up")], id="up"),
+        pytest.param(49.99, 50.0, [(50, "up")], id="up-to-threshold"),
+        pytest.param(20.0, 95.0, [(50, "up"), (75, "up"), (90, "up")], id="up-many"),
+        pytest.param(80.0, 45.0, [(50, "down"), (75, "down")], id="down-many"),
+        pytest.param(50.0, 49.99, [(50, "down")], id="down-below-threshold"),
+        pytest.param(60.0, 70.0, [], id="no-crossing"),
+        pytest.param(90.0, 90.0, [], id="at-threshold"),
+    ],
+)
+def test_threshold_crossings(prev, last, expected):
+    device_df = pd.DataFrame(
+        [
+            {
+                "hostname": "sw1",
+                "sn": "SN-sw1",
+                "siteName": "HQ",
+                "port utilisation (%) prev": prev,
+                "port utilisation (%)": last,
+                "port utilisation (%) delta": round(last - prev, 2),
+            }
+        ]
+    )
+
+    crossings = PortCapacityCompareReport.threshold_crossings(device_df, [50, 75, 90])
+
+    assert sorted(zip(crossings["threshold"], crossings["direction"])) == expected
+    assert set(crossings["hostname"]) <= {"sw1"}
@@ -0,0 +1,191 @@
+"""Tests of the report renderer."""
+
+# Standard library imports
+from collections import namedtuple
+import sys
+
+# Third-party imports
+import openpyxl
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.report_renderer import RenderPool, ReportRenderer
+from ipfabric_reports.views import CVEView, OSVulnerabilities, TableView, table_rows
+
+OsVersion = namedtuple("OsVersion", ["version", "cves"])
+
+
+def _chunk_bounds(chunks):
+    return [
+        (chunk["pdf_chunk"]["start"], chunk["pdf_chunk"]["start"] + len(chunk["rows"]))
+        for chunk in chunks
+    ]
+
+
+@pytest.mark.parametrize(
+    "rows, spec, expected",
+    [
+        pytest.param(
+            list(range(10)), {"rows": 4}, [(0, 4), (4, 8), (8, 10)], id="rows"
+        ),
+        pytest.param(list(range(8)), {"rows": 4}, [(0, 4), (4, 8)], id="rows-exact"),
+        pytest.param(
+            [{"cves": [0] * size} for size in (3, 1, 5, 1, 1, 2)],
+            {"rows": 4, "weight": "cves"},
+            [(0, 2), (2, 3), (3, 6)],
+            id="weight-dict",
+        ),
+        pytest.param(
+            [OsVersion(str(size), [0] * size) for size in (2, 2, 2, 1)],
+            {"rows": 4, "weight": "cves"},
+            [(0, 2), (2, 4)],
+            id="weight-view-model",
+        ),
+    ],
+)
+def test_chunk_contexts(rows, spec, expected):
+    report_data = {
+        "report_details": {"type": "cve"},
+        "rows": rows,
+        "tabular_exports": {"Details": None},
+        "pdf_chunks": {"key": "rows", **spec},
+    }
+
+    chunks = ReportRenderer._chunk_contexts(report_data)
+
+    assert _chunk_bounds(chunks) == expected
+    assert [row for chunk in chunks for row in chunk["rows"]] == rows
+    for index, chunk in enumerate(chunks):
+        assert chunk["pdf_chunk"] == {
+            "index": index,
+            "count": len(expected),
+            "first": index == 0,
+            "last": index == len(expected) - 1,
+            "start": expected[index][0],
+            "total": len(rows),
+        }
+        # The tabular exports and the chunk spec aren't rendered
+        assert set(chunk) == {"report_details", "rows", "pdf_chunk"}
+
+
+@pytest.mark.parametrize(
+    "report_data",
+    [
+        pytest.param({"rows": list(range(10))}, id="not-chunked"),
+        pytest.param({"pdf_chunks": {"key": "rows", "rows": 4}}, id="no-rows"),
+        pytest.param(
+            {"rows": list(range(4)), "pdf_chunks": {"key": "rows", "rows": 4}},
+            id="single-chunk",
+        ),
+        pytest.param(
+            {
+                "rows": [{"cves": [0] * 3}, {"cves": [0]}],
+                "pdf_chunks": {"key": "rows", "rows": 10, "weight": "cves"},
+            },
+            id="single-weighted-chunk",
+        ),
+    ],
+)
+def test_chunk_contexts_not_split(report_data):
+    assert ReportRenderer._chunk_contexts(report_data) is None
+
+
+def test_chunk_render_pool_is_reused(tmp_path):
+    renderer = ReportRenderer(
+        "logo.png", template_dir=str(tmp_path), output_dir=str(tmp_path)
+    )
+    renderer.chunk_workers = 1
+
+    pool = renderer._chunk_render_pool()
+
+    assert isinstance(pool, RenderPool)
+    assert renderer._chunk_render_pool() is pool
+    renderer.close()
+    assert renderer._chunk_render_pool() is not pool
+
+
+@pytest.mark.parametrize("writer", ["xlsxwriter", "openpyxl"])
+def test_xlsx_split_over_the_row_limit(tmp_path, monkeypatch, writer):
+    if writer == "openpyxl":
+        # Without xlsxwriter the workbook is written with openpyxl
+        monkeypatch.setitem(sys.modules, "xlsxwriter", None)
+    else:
+        pytest.importorskip("xlsxwriter")
+    monkeypatch.setattr(ReportRenderer, "EXCEL_MAX_ROWS", 5)
+    monkeypatch.setattr(ReportRenderer, "CHUNK_ROWS", 3)
+    long_name = "Mismatched Trunk Links Details"
+    sheets = {
+        long_name: pd.DataFrame(
+            {"id": range(10), "name": [f"sw{i}" for i in range(10)]}
+        ),
+        "Summary": pd.DataFrame({"id": [None, 1, 2, 3], "name": list("abcd")}),
+        "Empty": pd.DataFrame(columns=["id"]),
+    }
+    path = tmp_path / "report.xlsx"
+
+    ReportRenderer._write_xlsx(sheets, path)
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    # 4 data rows per sheet, the header takes a row
+    assert workbook.sheetnames == [
+        long_name[:31],
+        f"{long_name[:26]} (2)",
+        f"{long_name[:26]} (3)",
+        "Summary",
+        "Empty",
+    ]
+    rows = {name: list(workbook[name].values) for name in workbook.sheetnames}
+    workbook.close()
+    assert [rows[name][0] for name in workbook.sheetnames] == [("id", "name")] * 4 + [
+        ("id",)
+    ]
+    split_rows = [row for name in workbook.sheetnames[:3] for row in rows[name][1:]]
+    assert split_rows == [(i, f"sw{i}") for i in range(10)]
+    assert [len(rows[name]) - 1 for name in workbook.sheetnames] == [4, 4, 2, 4, 0]
+    # Missing values are written as empty cells
+    assert rows["Summary"][1] == (None, "a")
+
+
+def _frame():
+    return pd.DataFrame({"hostname": ["sw1", "sw2"], "cves": [1, 2]})
+
+
+@pytest.mark.parametrize(
+    "context, key, pandas_type",
+    [
+        pytest.param({"summary": _frame()}, "summary", "DataFrame", id="frame"),
+        pytest.param(
+            {"sections": {"Devices": [("sw1", _frame()["cves"])]}},
+            "sections",
+            "Series",
+            id="nested-series",
+        ),
+        pytest.param(
+            {"view": TableView(("a",), [(1,)]), "tables": ([{"df": _frame()}],)},
+            "tables",
+            "DataFrame",
+            id="nested-frame",
+        ),
+        pytest.param({"columns": [_frame().columns]}, "columns", "Index", id="index"),
+    ],
+)
+def test_check_context_refuses_pandas_objects(context, key, pandas_type):
+    with pytest.raises(ValueError, match=rf"pandas {pandas_type} in '{key}'"):
+        ReportRenderer._check_context("report.html", context)
+
+
+def test_check_context_accepts_view_models():
+    cves = [CVEView("CVE-1", "HIGH", None, 3.9, None, None, "description")]
+    context = {
+        "report_details": {"type": "cve", "sites": ["HQ"]},
+        "devices": table_rows(_frame(), ["hostname", "cves"]),
+        "table": TableView.from_frame(_frame()),
+        "os_versions": [
+            OSVulnerabilities("cisco", "ios", "15.1", "sw1", "CVE-1", cves, 0)
+        ],
+        "total": 2,
+        "site_filter": None,
+    }
+
+    ReportRenderer._check_context("report.html", context)
@@ -0,0 +1,73 @@
+"""Tests of the metrics x snapshots table of the trend report."""
+
+# Third-party imports
+import numpy as np
+import pytest
+
+# Local imports
+from ipfabric_reports.report_types import OverviewTrendReport
+
+
+@pytest.mark.parametrize(
+    "snapshots_metrics, values, change, change_pct",
+    [
+        pytest.param(
+            [{("Inventory", "Devices"): 10}, {("Inventory", "Devices"): 15}],
+            [10, 15],
+            5,
+            50.0,
+            id="changed",
+        ),
+        pytest.param(
+            [{("Inventory", "Devices"): 10}, {("Inventory", "Devices"): 10}],
+            [10, 10],
+            0,
+            0.0,
+            id="unchanged",
+        ),
+        pytest.param(
+            [{}, {("Inventory", "Devices"): 10}, {("Inventory", "Devices"): 12}],
+            [np.nan, 10, 12],
+            2,
+            20.0,
+            id="added",
+        ),
+        pytest.param(
+            [{("Inventory", "Devices"): 8}, {("Inventory", "Devices"): 4}, {}],
+            [8, 4, np.nan],
+            -4,
+            -50.0,
+            id="removed",
+        ),
+        pytest.param(
+            [{("Inventory", "Devices"): 0}, {("Inventory", "Devices"): 3}],
+            [0, 3],
+            3,
+            np.nan,
+            id="from-zero",
+        ),
+    ],
+)
+def test_build_trend_table(snapshots_metrics, values, change, change_pct):
+    columns = [f"snapshot-{index}" for index in range(len(snapshots_metrics))]
+
+    trend_df = OverviewTrendReport.build_trend_table(snapshots_metrics, columns)
+
+    row = trend_df.loc[("Inventory", "Devices")]
+    np.testing.assert_array_equal(row[columns].to_numpy(dtype=float), values)
+    assert row["change"] == change
+    np.testing.assert_equal(row["change (%)"], change_pct)
+
+
+def test_build_trend_table_row_order():
+    trend_df = OverviewTrendReport.build_trend_table(
+        [{("A", "removed"): 1, ("A", "kept"): 1}, {("A", "kept"): 2, ("A", "new"): 3}],
+        ["first", "last"],
+    )
+
+    # The metrics of the last snapshot first, then the ones that disappeared
+    assert trend_df.index.get_level_values("metric").tolist() == [
+        "kept",
+        "new",
+        "removed",
+    ]
@@ -0,0 +1,128 @@
+"""Tests of the incremental analysis of the Trunk Mismatch report."""
+
+# Standard library imports
+from datetime import datetime
+from types import SimpleNamespace
+
+# Third-party imports
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.report_types import TrunkMismatchReport
+
+SNAPSHOTS = {
+    f"snapshot-{day}": SimpleNamespace(start=datetime(2026, 1, day))
+    for day in range(1, 4)
+}
+TRUNK_MAP = {
+    ("sw1", "Gi0/1"): "10,20",
+    ("sw2", "Gi0/1"): "10",
+    ("sw2", "Gi0/2"): "10,20",
+    ("sw3", "Gi0/1"): "10,20",
+}
+STP_PORTS_MAP = {port: {10} for port in TRUNK_MAP}
+
+
+class _Client:
+    """IP Fabric client answering the snapshot lookups only."""
+
+    def __init__(self, snapshot_id: str):
+        self.snapshot_id = snapshot_id
+        self.snapshots = SNAPSHOTS
+
+    def get_snapshot_id(self, snapshot_id: str) -> str:
+        return self.snapshot_id
+
+
+def _connectivity_matrix(snapshot_id: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "id": f"{snapshot_id}-1",
+                "siteName": "HQ",
+                "localHost": "sw1",
+                "localInt": "Gi0/1",
+                "localSn": "SN1",
+                "remoteHost": "sw2",
+                "remoteInt": "Gi0/1",
+                "remoteSn": "SN2",
+                "protocol": "stp",
+                "localMedia": "Ethernet",
+                "remoteMedia": "Ethernet",
+            },
+            {
+                "id": f"{snapshot_id}-2",
+                "siteName": "HQ",
+                "localHost": "sw2",
+                "localInt": "Gi0/2",
+                "localSn": "SN2",
+                "remoteHost": "sw3",
+                "remoteInt": "Gi0/1",
+                "remoteSn": "SN3",
+                "protocol": "stp",
+                "localMedia": "Ethernet",
+                "remoteMedia": "Ethernet",
+            },
+        ]
+    )
+
+
+def _run_snapshots(tmp_path, snapshot_ids, trunk_maps=None):
+    """Analyse the snapshots in turn, returning the changes of every run."""
+    changes = []
+    for position, snapshot_id in enumerate(snapshot_ids):
+        report = TrunkMismatchReport(
+            _Client(snapshot_id),
+            export_dir=str(tmp_path),
+            snapshot_id=snapshot_id,
+            incremental=True,
+            cache_dir=str(tmp_path / "cache"),
+        )
+        trunk_map = trunk_maps[position] if trunk_maps else TRUNK_MAP
+        *_, changes_summary, changes_df = report.analyse_trunk_links_incremental(
+            _connectivity_matrix(snapshot_id), trunk_map, STP_PORTS_MAP
+        )
+        changes.append((changes_summary, changes_df))
+    return changes
+
+
+def test_snapshots_differing_only_in_id_have_no_changes(tmp_path):
+    changes = _run_snapshots(tmp_path, ["snapshot-1", "snapshot-2"])
+
+    assert changes[0] == (None, None)
+    changes_summary, changes_df = changes[1]
+    assert changes_summary["previous_snapshot"] == "snapshot-1"
+    assert changes_df.empty
+    assert changes_summary["links_added"] == 0
+    assert changes_summary["links_removed"] == 0
+    assert changes_summary["links_changed"] == 0
+
+
+@pytest.mark.parametrize(
+    "snapshot_ids",
+    [
+        ["snapshot-2", "snapshot-2"],
+        ["snapshot-3", "snapshot-1"],
+    ],
+    ids=["same-snapshot", "older-snapshot"],
+)
+def test_changes_not_reported_against_a_newer_run(tmp_path, snapshot_ids):
+    # The switchport of sw2 Gi0/1 differs between the runs
+    trunk_maps = [TRUNK_MAP, {**TRUNK_MAP, ("sw2", "Gi0/1"): "10,20"}]
+    changes = _run_snapshots(tmp_path, snapshot_ids, trunk_maps)
+
+    assert changes == [(None, None), (None, None)]
+
+
+def test_changes_reported_against_an_older_run(tmp_path):
+    trunk_maps = [TRUNK_MAP, {**TRUNK_MAP, ("sw2", "Gi0/1"): "10,20"}]
+    changes = _run_snapshots(tmp_path, ["snapshot-1", "snapshot-3"], trunk_maps)
+
+    changes_summary, changes_df = changes[1]
+    assert changes_summary["previous_snapshot"] == "snapshot-1"
+    assert changes_summary["links_changed"] == 1
+    assert changes_summary["resolved_mismatches"] == 1
+    assert changes_df[["change", "mismatchBefore", "mismatchNow"]].values.tolist() == [
+        ["changed", "Yes", "No"]
+    ]
@@ -0,0 +1,73 @@
+"""Tests of the sharded analysis of the Trunk Mismatch report."""
+
+# Third-party imports
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.report_types import TrunkMismatchReport
+
+
+@pytest.fixture
+def trunk_links():
+    """Links of three sites, two L2 components each, with mismatched VLANs."""
+    rows = []
+    trunk_map, stp_ports_map = {}, {}
+    for site in ("A", "B", "C"):
+        for component in range(2):
+            hosts = [f"{site}-{component}-sw{i}" for i in range(4)]
+            for i, (local, remote) in enumerate(zip(hosts, hosts[1:])):
+                rows.append(
+                    {
+                        "siteName": site,
+                        "localHost": local,
+                        "localInt": "Gi0/1",
+                        "remoteHost": remote,
+                        "remoteInt": "Gi0/2",
+                    }
+                )
+                trunk_map[(local, "Gi0/1")] = "1-10" if i % 2 else "1-5,7"
+                trunk_map[(remote, "Gi0/2")] = "1-10"
+                stp_ports_map[(local, "Gi0/1")] = {1, 2, 3}
+                stp_ports_map[(remote, "Gi0/2")] = {1, 2} if i % 2 else {1, 2, 3}
+    # A link without trunk on one side is left out of the analysis
+    rows.append(
+        {
+            "siteName": "C",
+            "localHost": "C-0-sw0",
+            "localInt": "Gi0/9",
+            "remoteHost": "C-1-sw0",
+            "remoteInt": "Gi0/9",
+        }
+    )
+    trunk_map[("C-0-sw0", "Gi0/9")] = "1-10"
+    connectivity_matrix_df = pd.DataFrame(rows)
+    # Index labels that are not positions, as after the deduplication
+    connectivity_matrix_df.index = connectivity_matrix_df.index * 2 + 5
+    return connectivity_matrix_df, trunk_map, stp_ports_map
+
+
+@pytest.mark.parametrize("shard_by", ["site", "component"])
+def test_sharded_analysis_matches_sequential(trunk_links, shard_by):
+    connectivity_matrix_df, trunk_map, stp_ports_map = trunk_links
+
+    sequential = TrunkMismatchReport._enrich_trunk_links(
+        connectivity_matrix_df, trunk_map, stp_ports_map
+    )
+    sharded = TrunkMismatchReport._enrich_trunk_links_sharded(
+        connectivity_matrix_df, trunk_map, stp_ports_map, shard_by, workers=2
+    )
+
+    for expected, actual in zip(sequential, sharded):
+        pd.testing.assert_frame_equal(actual, expected)
+    for expected, actual in zip(
+        TrunkMismatchReport._combine_trunk_results(*sequential),
+        TrunkMismatchReport._combine_trunk_results(*sharded),
+    ):
+        assert not expected.empty
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_invalid_shard_option(trunk_links):
+    with pytest.raises(ValueError):
+        TrunkMismatchReport._enrich_trunk_links_sharded(*trunk_links, "vlan", workers=2)
@@ -0,0 +1,119 @@
+"""Tests of the VLAN reachability analysis across the trunk links."""
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from ipfabric_reports.modules import component_labels, connected_components, vlan_mask
+from ipfabric_reports.report_types import TrunkMismatchReport
+
+# sw1 - sw2 - sw3 - sw4 - sw5 - sw6, sw6 - sw7 isn't a trunk link
+LINKS = [
+    ("sw1", "Gi1", "10,20", "sw2", "Gi1", "10,20"),
+    # VLAN 20 is missing on the sw3 side
+    ("sw2", "Gi2", "10,20", "sw3", "Gi1", "10"),
+    ("sw3", "Gi2", "10,30", "sw4", "Gi1", "10,30"),
+    ("sw4", "Gi2", "20", "sw5", "Gi1", "20"),
+    ("sw5", "Gi2", "20", "sw6", "Gi1", "20"),
+    ("sw6", "Gi2", "20", "sw7", "Gi1", None),
+]
+HOST_SITES = {"sw1": "HQ", "sw2": "HQ", "sw3": "DC", "sw4": "DC", "sw5": "DC"}
+
+
+@pytest.fixture
+def trunk_links():
+    connectivity_matrix_df = pd.DataFrame(
+        [link[:2] + link[3:5] for link in LINKS],
+        columns=["localHost", "localInt", "remoteHost", "remoteInt"],
+    )
+    trunk_map = {}
+    for link in LINKS:
+        trunk_map[link[:2]] = link[2]
+        if link[5] is not None:
+            trunk_map[link[3:5]] = link[5]
+    return connectivity_matrix_df, trunk_map
+
+
+def test_vlan_islands(trunk_links):
+    islands_df, isolated_hosts_df = TrunkMismatchReport.analyse_vlan_reachability(
+        *trunk_links, HOST_SITES
+    )
+
+    # VLAN 10 and 30 are connected, VLAN 20 is cut at sw3
+    assert islands_df.to_dict("records") == [
+        {
+            "vlanId": 20,
+            "hosts": 5,
+            "components": 2,
+            "mainComponentHosts": 3,
+            "isolatedHosts": 2,
+            "isolatedSites": "HQ",
+        }
+    ]
+    assert isolated_hosts_df.to_dict("records") == [
+        {
+            "vlanId": 20,
+            "siteName": "HQ",
+            "hostname": hostname,
+            "componentSize": 2,
+            "mainComponentSize": 3,
+        }
+        for hostname in ("sw1", "sw2")
+    ]
+
+
+def test_no_vlan_islands_without_trunk_links():
+    connectivity_matrix_df = pd.DataFrame(
+        [("sw1", "Gi1", "sw2", "Gi1")],
+        columns=["localHost", "localInt", "remoteHost", "remoteInt"],
+    )
+    islands_df, isolated_hosts_df = TrunkMismatchReport.analyse_vlan_reachability(
+        connectivity_matrix_df, {("sw1", "Gi1"): "10"}
+    )
+
+    assert islands_df.empty
+    assert isolated_hosts_df.empty
+
+
+def test_connected_components():
+    components = connected_components(
+        [("a", "b"), ("c", "d"), ("b", "c"), ("x", "y"), ("z", "z")]
+    )
+
+    assert len({components[node] for node in "abcd"}) == 1
+    assert components["x"] == components["y"]
+    assert len({components["a"], components["x"], components["z"]}) == 3
+
+
+def test_component_labels_match_connected_components():
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, 200, size=150)
+    targets = rng.integers(0, 200, size=150)
+
+    labels = component_labels(200, sources, targets)
+
+    components = connected_components(zip(sources.tolist(), targets.tolist()))
+    for node in range(200):
+        expected = {
+            other
+            for other in components
+            if components[other] == components.get(node, node)
+        } or {node}
+        assert set(np.flatnonzero(labels == labels[node]).tolist()) == expected
+        # The label of a node is the smallest node of its component
+        assert labels[node] == min(expected)
+
+
+@pytest.mark.parametrize(
+    "vlans, expected",
+    [
+        ("10", 1 << 10),
+        ("1,3-5", (1 << 1) | (1 << 3) | (1 << 4) | (1 << 5)),
+        ("10,10", 1 << 10),
+        ("", 0),
+    ],
+)
+def test_vlan_mask(vlans, expected):
+    assert vlan_mask(vlans) == expected